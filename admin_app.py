@@ -3,6 +3,7 @@ Allows admins to upload CSV files with LinkedIn URLs and process them."""
 import os
 import csv
 import json
+import time
 import uuid
 import threading
 from datetime import datetime
@@ -13,8 +14,9 @@ from werkzeug.utils import secure_filename
 import pandas as pd
 from database import Database, Profile, LLMSettings
 from enricher_with_db import LinkedInEnricherWithDB
+from enricher.step1_browser import shutdown_playwright
 from message_generator import MessageGenerator
-from llm_service import LLMService
+from llm_service import get_llm_service
 
 app = Flask(__name__)
 # Enable CORS for React frontend
@@ -233,10 +235,8 @@ def process_job_background(job_id: str, config: Dict):
                     # Check for cancellation during processing
                     if job_cancellation_flags.get(job_id, False):
                         return
-                    # Store progress in database
-                    if step in ['step1', 'step2', 'step3', 'step4', 'step5', 'step6']:
-                        db.update_profile_step(profile.id, step, data)
-                    # Notify SSE clients
+                    # Step data is stored by the enricher itself (one transaction
+                    # per profile); only notify SSE clients here
                     notify_progress(job_id, profile.id, step, data)
                 
                 # Initialize enricher with database
@@ -277,9 +277,8 @@ def process_job_background(job_id: str, config: Dict):
                     db.update_profile_status(profile.id, 'cancelled', 'Job was cancelled by user')
                     break
                 
-                # Save final result
-                db.update_profile_step(profile.id, 'step6', result.model_dump())
-                db.update_profile_status(profile.id, 'completed')
+                # The final result (step6, status 'completed') was written with
+                # the enricher's step data
                 
                 # Disconnect
                 enricher.disconnect()
@@ -322,6 +321,9 @@ def process_job_background(job_id: str, config: Dict):
             del job_cancellation_flags[job_id]
         if job_id in active_job_threads:
             del active_job_threads[job_id]
+    finally:
+        # Stop this job thread's Playwright driver (kept alive across profiles)
+        shutdown_playwright()
 
 
 def notify_progress(job_id: str, profile_id: int, step: str, data: dict):
@@ -612,7 +614,6 @@ def stream_progress(job_id: str):
                 else:
                     # Send heartbeat
                     yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
-                    import time
                     time.sleep(1)
         finally:
             # Cleanup
@@ -678,14 +679,15 @@ def generate_messages(profile_id: int):
             return jsonify({'error': 'OpenAI API key not configured. Set OPENAI_API_KEY environment variable.'}), 500
         
         # Initialize message generator
-        generator = MessageGenerator(api_key=api_key)
+        generator = MessageGenerator(api_key=api_key, db=db)
         
         # Generate messages
         messages = generator.generate_messages(
             client_name=profile.step3_name,
             company_name=profile.step3_company_name,
             company_description=profile.step5_company_description,
-            website=profile.step4_website_url
+            website=profile.step4_website_url,
+            use_cache=False
         )
         
         # Save messages to database
@@ -924,7 +926,7 @@ def generate_column_message(profile_id: int):
         if not api_key:
             return jsonify({'error': 'OpenAI API key not configured'}), 500
         
-        generator = MessageGenerator(api_key=api_key)
+        generator = MessageGenerator(api_key=api_key, db=db)
         
         if column_type == '1st_connect':
             # Generate 300 character connection request
@@ -932,7 +934,8 @@ def generate_column_message(profile_id: int):
                 client_name=profile.step3_name,
                 company_name=profile.step3_company_name,
                 company_description=profile.step5_company_description,
-                website=profile.step4_website_url
+                website=profile.step4_website_url,
+                use_cache=False
             )
             message = messages.get('linkedin_connection', '')
             # Ensure it's exactly 300 characters or less
@@ -960,9 +963,9 @@ They accepted your connection request. Now generate a professional follow-up mes
 Generate only the message text, no additional formatting."""
             
             try:
-                from openai import OpenAI
-                client = OpenAI(api_key=api_key)
-                response = client.chat.completions.create(
+                # Same shared client (and connection pool) as the generator; this
+                # call has no retry loop of its own, so let the SDK retry it
+                response = generator.client.with_options(max_retries=2).chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
                         {"role": "system", "content": "You are a professional sales outreach specialist. Generate concise, professional follow-up messages."},
@@ -1031,7 +1034,6 @@ def save_column_value(profile_id: int):
             return jsonify({'error': 'Profile not found'}), 404
         
         # Update custom_columns_data
-        import json
         custom_data = profile.custom_columns_data or {}
         if isinstance(custom_data, str):
             custom_data = json.loads(custom_data) if custom_data else {}
@@ -1075,7 +1077,6 @@ def get_llm_settings(section: str):
         variables = settings.variables
         if isinstance(variables, str):
             try:
-                import json
                 variables = json.loads(variables) if variables else {}
             except:
                 variables = {}
@@ -1153,7 +1154,7 @@ def generate_lead_response(profile_id: int):
             }), 400
         
         # Initialize LLM service
-        llm_service = LLMService(
+        llm_service = get_llm_service(
             provider=settings.provider,
             api_key=settings.api_key,
             model=settings.model,
@@ -1181,11 +1182,11 @@ def generate_lead_response(profile_id: int):
                 about_section=about_section,  # Now includes company description
                 company_name=company_name,
                 system_prompt=settings.system_prompt or '',
-                variables=settings.variables or {}
+                variables=settings.variables or {},
+                use_cache=False
             )
             
             # Try to parse and return as JSON if possible
-            import json
             parsed_response = None
             try:
                 # If response is already a dict/JSON, return as-is
@@ -1258,7 +1259,8 @@ def generate_lead_response(profile_id: int):
                 company_name=company_name,
                 company_description=company_description,
                 system_prompt=settings.system_prompt or '',
-                variables=settings.variables or {}
+                variables=settings.variables or {},
+                use_cache=False
             )
             
             # Save to profile
@@ -1306,7 +1308,7 @@ def test_llm_settings(section: str):
             return jsonify({'error': 'API key is required'}), 400
         
         # Initialize LLM service with provided settings
-        llm_service = LLMService(
+        llm_service = get_llm_service(
             provider=provider,
             api_key=api_key,
             model=model or None,
@@ -1327,7 +1329,8 @@ def test_llm_settings(section: str):
                 about_section=dummy_about_section,
                 company_name=dummy_company_name,
                 system_prompt=system_prompt or '',
-                variables=variables
+                variables=variables,
+                use_cache=False
             )
             
             return jsonify({
@@ -1355,7 +1358,8 @@ def test_llm_settings(section: str):
                 company_name=dummy_company_name,
                 company_description=dummy_company_description,
                 system_prompt=system_prompt or '',
-                variables=variables
+                variables=variables,
+                use_cache=False
             )
             
             return jsonify({
@@ -1,13 +1,43 @@
 """Database models and operations for storing enrichment data."""
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.schema import CreateTable, CreateIndex
+from sqlalchemy.dialects import sqlite
 from typing import Optional, Dict, List
 
 Base = declarative_base()
 
+# Columns added to profiles after its first release, in the order they were
+# introduced: (name, column definition). Existing databases get the missing
+# ones on startup (Database._migrate_database, migrate_database.py)
+PROFILE_COLUMN_MIGRATIONS = (
+    ('step3_valid_experience', "TEXT DEFAULT 'true'"),
+    ('step3_experience_reason', 'TEXT'),
+    # Message generation
+    ('generated_email', 'TEXT'),
+    ('generated_linkedin_connection', 'TEXT'),
+    ('generated_linkedin_followup', 'TEXT'),
+    ('messages_generated_at', 'DATETIME'),
+    ('custom_columns_data', 'TEXT'),
+    # CSV import
+    ('csv_firstname', 'TEXT'),
+    ('csv_lastname', 'TEXT'),
+    ('csv_website', 'TEXT'),
+    ('csv_columns_data', 'TEXT'),
+    ('csv_row_index', 'INTEGER'),
+    # Lead management
+    ('lead_status', "VARCHAR DEFAULT 'raw_lead'"),
+    ('contacted_date', 'DATETIME'),
+    # LLM analysis
+    ('llm_analysis_what_they_do', 'TEXT'),
+    ('llm_analysis_can_we_pitch', 'TEXT'),
+    ('llm_analysis_raw_response', 'TEXT'),
+    ('llm_analysis_generated_at', 'DATETIME'),
+)
+
 
 class Job(Base):
     """Job table for tracking enrichment jobs."""
@@ -90,6 +120,17 @@ class Profile(Base):
     job = relationship("Job", back_populates="profiles")
 
 
+class MessageCache(Base):
+    """Generated outreach messages keyed by a hash of the request that produced them."""
+    __tablename__ = 'message_cache'
+    
+    key = Column(String, primary_key=True)  # sha256 hex of model, system and user prompt
+    email = Column(Text, nullable=True)
+    linkedin_connection = Column(Text, nullable=True)
+    linkedin_followup = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class LLMSettings(Base):
     """LLM Settings table for storing configuration for pending and reached sections."""
     __tablename__ = 'llm_settings'
@@ -118,6 +159,33 @@ class Database:
         self._migrate_database()
         self.Session = sessionmaker(bind=self.engine)
     
+    @staticmethod
+    def create_schema(conn):
+        """
+        Create every table and index on an empty database in one transaction.
+        
+        Used by reset_database.py on a freshly created file: one commit (and
+        fsync) instead of one per statement, and a failure leaves no tables.
+        
+        Args:
+            conn: sqlite3 connection to the new database
+        """
+        dialect = sqlite.dialect()
+        statements = []
+        for table in Base.metadata.sorted_tables:
+            statements.append(str(CreateTable(table).compile(dialect=dialect)))
+            statements.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes)
+        
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for statement in statements:
+                cursor.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
     def _migrate_database(self):
         """Migrate database schema if needed."""
         import sqlite3
@@ -126,95 +194,23 @@ class Database:
         if not os.path.exists(self.db_path):
             return  # New database, no migration needed
         
+        conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            
-            # Check existing columns
-            cursor.execute("PRAGMA table_info(profiles)")
-            columns = [row[1] for row in cursor.fetchall()]
+            # All changes in one write transaction: one commit (and fsync) for
+            # the whole migration, and a failure leaves no half-migrated schema
+            cursor.execute("BEGIN IMMEDIATE")
             
             # Add missing columns
-            if 'step3_valid_experience' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN step3_valid_experience TEXT DEFAULT 'true'")
-                conn.commit()
-            
-            if 'step3_experience_reason' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN step3_experience_reason TEXT")
-                conn.commit()
-            
-            # Add message generation columns
-            if 'generated_email' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN generated_email TEXT")
-                conn.commit()
-            
-            if 'generated_linkedin_connection' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN generated_linkedin_connection TEXT")
-                conn.commit()
-            
-            if 'generated_linkedin_followup' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN generated_linkedin_followup TEXT")
-                conn.commit()
-            
-            if 'messages_generated_at' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN messages_generated_at DATETIME")
-                conn.commit()
-            
-            if 'custom_columns_data' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN custom_columns_data TEXT")
-                conn.commit()
-            
-            if 'csv_firstname' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN csv_firstname TEXT")
-                conn.commit()
-            
-            if 'csv_lastname' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN csv_lastname TEXT")
-                conn.commit()
-            
-            if 'csv_website' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN csv_website TEXT")
-                conn.commit()
-            
-            if 'csv_columns_data' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN csv_columns_data TEXT")
-                conn.commit()
-            
-            if 'csv_row_index' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN csv_row_index INTEGER")
-                conn.commit()
-            
-            if 'lead_status' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN lead_status VARCHAR DEFAULT 'raw_lead'")
-                conn.commit()
-            
-            # Add contacted_date column
-            if 'contacted_date' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN contacted_date DATETIME")
-                conn.commit()
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(profiles)")}
+            for name, ddl in PROFILE_COLUMN_MIGRATIONS:
+                if name not in columns:
+                    cursor.execute(f"ALTER TABLE profiles ADD COLUMN {name} {ddl}")
             
             # Migrate existing lead_status values to new system
             # pending -> raw_lead, reached -> qualified, left_swiped stays as is (or can be removed)
             cursor.execute("UPDATE profiles SET lead_status = 'raw_lead' WHERE lead_status = 'pending' OR lead_status IS NULL")
             cursor.execute("UPDATE profiles SET lead_status = 'qualified' WHERE lead_status = 'reached'")
-            conn.commit()
-            
-            # Add LLM analysis columns
-            if 'llm_analysis_what_they_do' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN llm_analysis_what_they_do TEXT")
-                conn.commit()
-            
-            if 'llm_analysis_can_we_pitch' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN llm_analysis_can_we_pitch TEXT")
-                conn.commit()
-            
-            if 'llm_analysis_raw_response' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN llm_analysis_raw_response TEXT")
-                conn.commit()
-            
-            if 'llm_analysis_generated_at' not in columns:
-                cursor.execute("ALTER TABLE profiles ADD COLUMN llm_analysis_generated_at DATETIME")
-                conn.commit()
             
             # Check if llm_settings table exists
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='llm_settings'")
@@ -235,12 +231,14 @@ class Database:
                         updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
-                conn.commit()
             
-            conn.close()
+            conn.commit()
         except Exception as e:
+            conn.rollback()
             print(f"Warning: Database migration failed: {e}")
             # Continue anyway - might be a new database
+        finally:
+            conn.close()
     
     def get_session(self):
         """Get a database session."""
@@ -288,38 +286,28 @@ class Database:
     
     def update_profile_step(self, profile_id: int, step: str, data: Dict) -> Profile:
         """Update profile with step data."""
+        return self.update_profile_steps(profile_id, {step: data})
+    
+    def update_profile_steps(self, profile_id: int, steps: Dict[str, Dict]) -> Profile:
+        """
+        Update profile with the data of several steps in one transaction.
+        
+        Args:
+            profile_id: Profile ID
+            steps: Step data keyed by step name ('step1'...'step6'), applied in
+                order; the last one becomes the profile's current_step
+        
+        Returns:
+            Updated profile, or None if it doesn't exist
+        """
         session = self.get_session()
         try:
             profile = session.query(Profile).filter_by(id=profile_id).first()
             if not profile:
                 return None
             
-            profile.current_step = step
-            profile.updated_at = datetime.utcnow()
-            
-            # Update step-specific fields
-            if step == 'step1':
-                profile.step1_browser_connected = datetime.utcnow()
-            elif step == 'step2':
-                profile.step2_profile_opened = datetime.utcnow()
-            elif step == 'step3':
-                profile.step3_name = data.get('name')
-                profile.step3_company_name = data.get('company_name')
-                profile.step3_company_linkedin_url = data.get('company_linkedin_url')
-                profile.step3_valid_experience = 'true' if data.get('valid_experience', True) else 'false'
-                profile.step3_experience_reason = data.get('experience_reason')
-                profile.step3_extracted_at = datetime.utcnow()
-            elif step == 'step4':
-                profile.step4_company_page_navigated = datetime.utcnow()
-                profile.step4_website_url = data.get('website')
-                profile.step4_extracted_at = datetime.utcnow()
-            elif step == 'step5':
-                profile.step5_website_scraped = datetime.utcnow()
-                profile.step5_company_description = data.get('company_description')
-            elif step == 'step6':
-                profile.step6_compiled_at = datetime.utcnow()
-                profile.final_result = data
-                profile.status = 'completed'
+            for step, data in steps.items():
+                self._apply_step(profile, step, data)
             
             session.commit()
             session.refresh(profile)
@@ -327,6 +315,80 @@ class Database:
         finally:
             session.close()
     
+    def update_profiles_steps(self, updates: Dict[int, Dict[str, Dict]]):
+        """
+        Update many profiles with step data in one transaction.
+        
+        Args:
+            updates: Step data keyed by profile ID, then by step name (see
+                update_profile_steps); unknown profile IDs are skipped
+        """
+        if not updates:
+            return
+        session = self.get_session()
+        try:
+            profiles = session.query(Profile).filter(Profile.id.in_(list(updates))).all()
+            for profile in profiles:
+                for step, data in updates[profile.id].items():
+                    self._apply_step(profile, step, data)
+            session.commit()
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _apply_step(profile: Profile, step: str, data: Dict):
+        """Set the fields one step's data maps to on a profile."""
+        profile.current_step = step
+        profile.updated_at = datetime.utcnow()
+        
+        # Update step-specific fields
+        if step == 'step1':
+            profile.step1_browser_connected = datetime.utcnow()
+        elif step == 'step2':
+            profile.step2_profile_opened = datetime.utcnow()
+        elif step == 'step3':
+            profile.step3_name = data.get('name')
+            profile.step3_company_name = data.get('company_name')
+            profile.step3_company_linkedin_url = data.get('company_linkedin_url')
+            profile.step3_valid_experience = 'true' if data.get('valid_experience', True) else 'false'
+            profile.step3_experience_reason = data.get('experience_reason')
+            profile.step3_extracted_at = datetime.utcnow()
+        elif step == 'step4':
+            profile.step4_company_page_navigated = datetime.utcnow()
+            profile.step4_website_url = data.get('website')
+            profile.step4_extracted_at = datetime.utcnow()
+        elif step == 'step5':
+            profile.step5_website_scraped = datetime.utcnow()
+            profile.step5_company_description = data.get('company_description')
+        elif step == 'step6':
+            profile.step6_compiled_at = datetime.utcnow()
+            profile.final_result = data
+            profile.status = 'completed'
+            # Clear the error of an earlier failed run
+            profile.error = None
+    
+    def get_known_website(self, company_linkedin_url: str, max_age_days: int = 30) -> Optional[str]:
+        """
+        Get the website step 4 found for this company in an earlier run.
+        
+        Args:
+            company_linkedin_url: Company LinkedIn URL as extracted in step 3
+            max_age_days: Ignore websites found longer ago than this (sites move)
+        
+        Returns:
+            Most recently found website, or None if the company wasn't seen recently
+        """
+        session = self.get_session()
+        try:
+            row = session.query(Profile.step4_website_url).filter(
+                Profile.step3_company_linkedin_url == company_linkedin_url,
+                Profile.step4_website_url.isnot(None),
+                Profile.step4_extracted_at >= datetime.utcnow() - timedelta(days=max_age_days)
+            ).order_by(Profile.step4_extracted_at.desc()).first()
+            return row[0] if row else None
+        finally:
+            session.close()
+    
     def update_profile_status(self, profile_id: int, status: str, error: Optional[str] = None):
         """Update profile status."""
         session = self.get_session()
@@ -464,6 +526,38 @@ class Database:
         finally:
             session.close()
     
+    def update_profiles_messages(self, messages: Dict[int, Dict[str, str]]) -> int:
+        """
+        Update generated messages for many profiles in one transaction.
+        
+        Args:
+            messages: generate_messages-style dictionaries keyed by profile ID;
+                unknown profile IDs are skipped
+        
+        Returns:
+            Number of profiles updated
+        """
+        if not messages:
+            return 0
+        session = self.get_session()
+        try:
+            profiles = session.query(Profile).filter(Profile.id.in_(list(messages))).all()
+            now = datetime.utcnow()
+            for profile in profiles:
+                generated = messages[profile.id]
+                profile.generated_email = generated.get('email')
+                profile.generated_linkedin_connection = generated.get('linkedin_connection')
+                profile.generated_linkedin_followup = generated.get('linkedin_followup')
+                profile.messages_generated_at = now
+            session.commit()
+            return len(profiles)
+        except Exception as e:
+            session.rollback()
+            print(f"Error updating profile messages: {e}")
+            return 0
+        finally:
+            session.close()
+    
     def update_profile_llm_analysis(
         self,
         profile_id: int,
@@ -579,4 +673,36 @@ class Database:
             ).first()
         finally:
             session.close()
-
+    
+    def get_cached_messages(self, key: str) -> Optional[Dict[str, str]]:
+        """Get messages previously generated for this request key, if any."""
+        session = self.get_session()
+        try:
+            cached = session.query(MessageCache).filter_by(key=key).first()
+            if not cached:
+                return None
+            return {
+                'email': cached.email,
+                'linkedin_connection': cached.linkedin_connection,
+                'linkedin_followup': cached.linkedin_followup
+            }
+        finally:
+            session.close()
+    
+    def save_cached_messages(self, key: str, messages: Dict[str, str]):
+        """Store generated messages under their request key (replacing any older entry)."""
+        session = self.get_session()
+        try:
+            session.merge(MessageCache(
+                key=key,
+                email=messages.get('email'),
+                linkedin_connection=messages.get('linkedin_connection'),
+                linkedin_followup=messages.get('linkedin_followup'),
+                created_at=datetime.utcnow()
+            ))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
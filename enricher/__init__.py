@@ -1,5 +1,5 @@
 from .enricher import LinkedInEnricher
+from .async_enricher import AsyncLinkedInEnricher
 from .models import EnrichmentResult
 
-__all__ = ['LinkedInEnricher', 'EnrichmentResult']
-
+__all__ = ['LinkedInEnricher', 'AsyncLinkedInEnricher', 'EnrichmentResult']
@@ -0,0 +1,317 @@
+"""Async LinkedIn Enricher Orchestrator
+Runs the enrichment steps on async Playwright so many profiles can be
+processed concurrently on a single event loop."""
+import os
+import asyncio
+from typing import Dict, List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PWTimeout
+
+from .step2_profile_opener import BLOCKED_URL_PATTERNS, PROFILE_READY_SELECTOR
+from .step3_user_extractor import UserExtractor, AsyncUserExtractor, EXTRACT_JS
+from .step4_company_navigator import AsyncCompanyNavigator
+from .step5_website_scraper import AsyncWebsiteScraper
+from .step6_data_compiler import DataCompiler
+from .models import EnrichmentResult
+
+
+class AsyncLinkedInEnricher:
+    """Async orchestrator for LinkedIn profile enrichment."""
+    
+    # Attempts per profile when Playwright times out (see LinkedInEnricher)
+    MAX_ATTEMPTS = 3
+    
+    def __init__(
+        self,
+        debug_port: int = 9222,
+        max_parallel: int = 10,
+        wait_time: int = 3
+    ):
+        """
+        Initialize async LinkedIn enricher.
+        
+        Args:
+            debug_port: Chrome remote debugging port
+            max_parallel: Maximum profiles processed concurrently
+            wait_time: Wait time between page loads (seconds)
+        """
+        self.debug_port = int(os.getenv('CHROME_DEBUG_PORT', debug_port))
+        self.max_parallel = int(os.getenv('MAX_PARALLEL_PROFILES', max_parallel))
+        self.wait_time = wait_time
+        
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        # Idle pages ready for reuse (see ProfileOpener); filled lazily as
+        # pages are released, at most max_parallel kept
+        self._page_pool: "asyncio.Queue[Page]" = asyncio.Queue()
+    
+    async def _ensure_connected(self):
+        """Ensure browser connection is established."""
+        if self.context:
+            return
+        
+        try:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.connect_over_cdp(
+                f"http://localhost:{self.debug_port}"
+            )
+        except Exception as e:
+            await self.disconnect()
+            raise ConnectionError(
+                f"Failed to connect to Chrome on port {self.debug_port}. "
+                f"Make sure Chrome is running with --remote-debugging-port={self.debug_port}. "
+                f"Error: {e}"
+            )
+        
+        # Use the existing logged-in context if there is one
+        contexts = self.browser.contexts
+        self.context = contexts[0] if contexts else await self.browser.new_context()
+    
+    async def _new_page(self) -> Page:
+        """Open a page that skips images, fonts, media and trackers (see ProfileOpener)."""
+        page = await self.context.new_page()
+        try:
+            cdp = await self.context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception:
+            # Not fatal: the page just loads everything
+            pass
+        return page
+    
+    async def _acquire_page(self) -> Page:
+        """Take an idle page from the pool, opening a new one if none is idle."""
+        try:
+            return self._page_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self._new_page()
+    
+    async def _release_page(self, page: Page):
+        """
+        Return a page to the pool for reuse.
+        
+        The page is navigated to about:blank to drop the previous DOM. Pages
+        beyond max_parallel, or pages that fail to reset, are closed instead.
+        """
+        if self._page_pool.qsize() < self.max_parallel:
+            try:
+                await page.goto("about:blank")
+                self._page_pool.put_nowait(page)
+                return
+            except Exception:
+                pass
+        try:
+            await page.close()
+        except Exception:
+            pass
+    
+    async def _goto(self, page: Page, url: str, ready_selector: Optional[str] = None):
+        """Navigate and wait for the page to become usable."""
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        if ready_selector:
+            try:
+                await page.wait_for_selector(ready_selector, timeout=int(self.wait_time * 1000), state="attached")
+            except PWTimeout:
+                # Continue with whatever has rendered
+                pass
+    
+    async def _extract_user(self, page: Page, linkedin_url: str) -> dict:
+        """Steps 2 & 3: open the profile and extract user data in one evaluate."""
+        await self._goto(page, linkedin_url, PROFILE_READY_SELECTOR)
+        data = await page.evaluate(EXTRACT_JS, UserExtractor.EXTRACT_ARG)
+        user_data = UserExtractor.parse_bundle(data)
+        if user_data:
+            return user_data
+        
+        # Bundle missed: run the fuller name and company lookups concurrently
+        return await AsyncUserExtractor(page).extract_all()
+    
+    async def _extract_website(self, page: Page, company_linkedin_url: str) -> Optional[str]:
+        """Step 4: open the company About page and pick the company website."""
+        return await AsyncCompanyNavigator(page).navigate_and_extract_website(company_linkedin_url, self.wait_time)
+    
+    async def _scrape_website(self, page: Page, website: str) -> Optional[str]:
+        """Step 5: scrape landing page text of the company website."""
+        return await AsyncWebsiteScraper(page).scrape_website_text(website, self.wait_time)
+    
+    async def enrich_profile(self, linkedin_url: str) -> EnrichmentResult:
+        """
+        Enrich a single LinkedIn profile.
+        
+        Args:
+            linkedin_url: LinkedIn profile URL
+        
+        Returns:
+            EnrichmentResult with extracted data
+        """
+        await self._ensure_connected()
+        
+        page = await self._acquire_page()
+        try:
+            user_data = await self._extract_user(page, linkedin_url)
+            
+            valid_experience = user_data.get('valid_experience', True)
+            if not valid_experience:
+                print(f"Profile {linkedin_url}: {user_data.get('experience_reason', 'No valid experience found')}")
+            
+            company_linkedin_url = user_data.get('company_linkedin_url')
+            website = None
+            company_description = None
+            
+            if company_linkedin_url and valid_experience:
+                website = await self._extract_website(page, company_linkedin_url)
+                if website:
+                    company_description = await self._scrape_website(page, website)
+            
+            return DataCompiler.compile_result(
+                linkedin_url=linkedin_url,
+                name=user_data.get('name'),
+                company_name=user_data.get('company_name'),
+                company_linkedin_url=company_linkedin_url,
+                website=website,
+                company_description=company_description,
+                valid_experience=valid_experience,
+                experience_reason=user_data.get('experience_reason')
+            )
+        finally:
+            await self._release_page(page)
+    
+    async def enrich_profiles(self, linkedin_urls: List[str]) -> List[EnrichmentResult]:
+        """
+        Enrich multiple LinkedIn profiles concurrently (up to max_parallel at a time).
+        
+        Args:
+            linkedin_urls: List of LinkedIn profile URLs
+        
+        Returns:
+            List of EnrichmentResult objects, in input order
+        """
+        await self._ensure_connected()
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def enrich_one(url: str) -> EnrichmentResult:
+            async with semaphore:
+                try:
+                    return await self.enrich_profile(url)
+                except Exception as e:
+                    print(f"Error processing {url}: {e}")
+                    # Create error result
+                    return DataCompiler.compile_result(linkedin_url=url)
+        
+        return await asyncio.gather(*[enrich_one(url) for url in linkedin_urls])
+    
+    async def extract_many(self, linkedin_urls: List[str], concurrency: int = 3) -> List[Dict]:
+        """
+        Run steps 2-3 only (name and current company) for many profiles.
+        
+        Profiles share the logged-in context; each gets its own page, and at
+        most `concurrency` are open at once to stay gentle on rate limits.
+        Playwright timeouts are retried with exponential backoff.
+        
+        Args:
+            linkedin_urls: List of LinkedIn profile URLs
+            concurrency: Maximum profiles open at the same time
+        
+        Returns:
+            List of UserExtractor.extract_all()-style dictionaries, in input
+            order (None for profiles that failed every attempt)
+        """
+        await self._ensure_connected()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(url: str) -> Optional[Dict]:
+            async with semaphore:
+                for attempt in range(self.MAX_ATTEMPTS):
+                    page = await self._acquire_page()
+                    try:
+                        return await self._extract_user(page, url)
+                    except PWTimeout as e:
+                        if attempt == self.MAX_ATTEMPTS - 1:
+                            print(f"Error processing {url}: {e}")
+                            return None
+                        delay = 2 ** attempt
+                        print(f"Timeout on {url} (attempt {attempt + 1}/{self.MAX_ATTEMPTS}), retrying in {delay}s: {e}")
+                        await asyncio.sleep(delay)
+                    except Exception as e:
+                        print(f"Error processing {url}: {e}")
+                        return None
+                    finally:
+                        await self._release_page(page)
+        
+        return await asyncio.gather(*[extract_one(url) for url in linkedin_urls])
+    
+    async def extract_websites(self, company_linkedin_urls: List[str], concurrency: int = 5) -> List[Optional[str]]:
+        """
+        Run step 4 only (company website) for many companies concurrently.
+        
+        Each distinct company is visited once, on its own page in the shared
+        context, with at most `concurrency` pages open at a time.
+        
+        Args:
+            company_linkedin_urls: List of company LinkedIn URLs
+            concurrency: Maximum company pages open at the same time
+        
+        Returns:
+            List of website URLs, in input order (None where no website was
+            found or the page failed to load)
+        """
+        await self._ensure_connected()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(url: str) -> Optional[str]:
+            async with semaphore:
+                page = await self._acquire_page()
+                try:
+                    return await self._extract_website(page, url)
+                except Exception as e:
+                    print(f"Error processing {url}: {e}")
+                    return None
+                finally:
+                    await self._release_page(page)
+        
+        # Profiles in a batch often share a company: look each one up once
+        unique_urls = list(dict.fromkeys(url for url in company_linkedin_urls if url))
+        websites = dict(zip(unique_urls, await asyncio.gather(*[extract_one(url) for url in unique_urls])))
+        return [websites.get(url) for url in company_linkedin_urls]
+    
+    async def disconnect(self):
+        """Disconnect from browser."""
+        # Close the idle pages this enricher opened
+        while not self._page_pool.empty():
+            try:
+                await self._page_pool.get_nowait().close()
+            except Exception:
+                pass
+        # Don't close the context or browser - they belong to the existing Chrome instance
+        self.context = None
+        self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self._ensure_connected()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+
+
+def enrich_profiles_async(linkedin_urls: List[str], **kwargs) -> List[EnrichmentResult]:
+    """
+    Synchronous entry point for AsyncLinkedInEnricher.enrich_profiles.
+    
+    Args:
+        linkedin_urls: List of LinkedIn profile URLs
+        **kwargs: Passed through to AsyncLinkedInEnricher
+    
+    Returns:
+        List of EnrichmentResult objects, in input order
+    """
+    async def run() -> List[EnrichmentResult]:
+        async with AsyncLinkedInEnricher(**kwargs) as enricher:
+            return await enricher.enrich_profiles(linkedin_urls)
+    
+    return asyncio.run(run())
@@ -1,10 +1,14 @@
 """Main LinkedIn Enricher Orchestrator
 Coordinates all steps to enrich LinkedIn profiles."""
 import os
+import time
+import queue
+import threading
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from playwright.sync_api import TimeoutError as PWTimeout
 
-from .step1_browser import BrowserConnector
+from .step1_browser import BrowserConnector, shutdown_playwright
 from .step2_profile_opener import ProfileOpener
 from .step3_user_extractor import UserExtractor
 from .step4_company_navigator import CompanyNavigator
@@ -16,6 +20,9 @@ from .models import EnrichmentResult
 class LinkedInEnricher:
     """Main orchestrator for LinkedIn profile enrichment."""
     
+    # Attempts per profile when Playwright times out
+    MAX_ATTEMPTS = 3
+    
     def __init__(
         self,
         debug_port: int = 9222,
@@ -34,35 +41,100 @@ class LinkedInEnricher:
         self.max_parallel = int(os.getenv('MAX_PARALLEL_PROFILES', max_parallel))
         self.wait_time = wait_time
         
-        self.browser_connector: Optional[BrowserConnector] = None
-        self.context = None
+        # Sync Playwright objects are bound to the thread that created them,
+        # so every worker thread keeps its own browser connection
+        self._local = threading.local()
+        
+        # Cookies/localStorage of the logged-in Chrome context, captured once and
+        # used to seed each worker's own context
+        self._storage_state: Optional[dict] = None
+        self._storage_state_lock = threading.Lock()
+    
+    @property
+    def browser_connector(self) -> Optional[BrowserConnector]:
+        """Browser connector owned by the calling thread."""
+        return getattr(self._local, 'browser_connector', None)
+    
+    @browser_connector.setter
+    def browser_connector(self, value: Optional[BrowserConnector]):
+        self._local.browser_connector = value
+    
+    @property
+    def context(self):
+        """Browser context owned by the calling thread."""
+        return getattr(self._local, 'context', None)
+    
+    @context.setter
+    def context(self, value):
+        self._local.context = value
+    
+    @property
+    def profile_opener(self) -> Optional[ProfileOpener]:
+        """Profile opener (and its page pool) owned by the calling thread."""
+        return getattr(self._local, 'profile_opener', None)
+    
+    @profile_opener.setter
+    def profile_opener(self, value: Optional[ProfileOpener]):
+        self._local.profile_opener = value
     
     def _ensure_connected(self):
         """Ensure browser connection is established."""
         if not self.browser_connector or not self.context:
             self.browser_connector = BrowserConnector(self.debug_port)
-            self.context = self.browser_connector.connect()
+            logged_in_context = self.browser_connector.connect()
+            # Work in a private context rather than the shared logged-in one: it is
+            # closed on disconnect, which frees everything its pages accumulated
+            self.context = self.browser_connector.browser.new_context(
+                storage_state=self._get_storage_state(logged_in_context)
+            )
+            # Each thread handles one profile at a time; two warm pages cover the
+            # profile page plus the company/website page used alongside it
+            self.profile_opener = ProfileOpener(self.context, max_parallel=1, pool_size=2)
+    
+    def _get_storage_state(self, logged_in_context) -> dict:
+        """Return the logged-in session state, reading it from Chrome on first use."""
+        with self._storage_state_lock:
+            if self._storage_state is None:
+                self._storage_state = logged_in_context.storage_state()
+            return self._storage_state
     
     def enrich_profile(self, linkedin_url: str) -> EnrichmentResult:
         """
         Enrich a single LinkedIn profile.
         
+        Playwright timeouts are retried up to MAX_ATTEMPTS times with
+        exponential backoff; any other error is raised immediately.
+        
         Args:
             linkedin_url: LinkedIn profile URL
             
         Returns:
             EnrichmentResult with extracted data
         """
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                return self._enrich_profile_once(linkedin_url)
+            except PWTimeout as e:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                delay = 2 ** attempt
+                print(f"Timeout on {linkedin_url} (attempt {attempt + 1}/{self.MAX_ATTEMPTS}), retrying in {delay}s: {e}")
+                time.sleep(delay)
+    
+    def _enrich_profile_once(self, linkedin_url: str) -> EnrichmentResult:
+        """Run steps 1-6 once for a single profile (see enrich_profile)."""
         self._ensure_connected()
         
-        # Step 2: Open profile
-        profile_opener = ProfileOpener(self.context, max_parallel=1)
+        # Step 2: Open profile (on a pooled page)
+        profile_opener = self.profile_opener
         profile_page = profile_opener.open_profile(linkedin_url, wait_time=self.wait_time)
         
         try:
             # Step 3: Extract user information
             user_extractor = UserExtractor(profile_page)
             user_data = user_extractor.extract_all()
+            # Profile data is in hand; stop the page's remaining network activity
+            profile_opener.stop_loading(profile_page)
             
             # Check if experience is valid
             valid_experience = user_data.get('valid_experience', True)
@@ -76,7 +148,7 @@ class LinkedInEnricher:
             
             # Step 4 & 5: Navigate to company and scrape if company found and experience is valid
             if company_linkedin_url and valid_experience:
-                company_navigator = CompanyNavigator(self.context)
+                company_navigator = CompanyNavigator(self.context, page_pool=self.profile_opener)
                 website = company_navigator.navigate_and_extract_website(
                     company_linkedin_url,
                     wait_time=self.wait_time
@@ -84,7 +156,7 @@ class LinkedInEnricher:
                 
                 # Step 5: Scrape website if found (landing page only)
                 if website:
-                    website_scraper = WebsiteScraper(self.context)
+                    website_scraper = WebsiteScraper(self.context, page_pool=self.profile_opener)
                     company_description = website_scraper.scrape_website_text(
                         website,
                         wait_time=self.wait_time
@@ -105,7 +177,7 @@ class LinkedInEnricher:
             return result
             
         finally:
-            profile_opener.close_page(profile_page)
+            profile_opener.release(profile_page)
     
     def enrich_profiles(self, linkedin_urls: List[str]) -> List[EnrichmentResult]:
         """
@@ -117,33 +189,105 @@ class LinkedInEnricher:
         Returns:
             List of EnrichmentResult objects
         """
-        self._ensure_connected()
+        results: List[Optional[EnrichmentResult]] = [None] * len(linkedin_urls)
+        if not linkedin_urls:
+            return results
+        
+        pending = queue.Queue()
+        for index, url in enumerate(linkedin_urls):
+            pending.put((index, url))
         
-        results = []
+        # One long-lived pool: each worker pulls the next URL as soon as it is
+        # free, so a slow profile never stalls the rest of the list
+        workers = min(self.max_parallel, len(linkedin_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._process_queue, pending, results)
+                for _ in range(workers)
+            ]
+            for future in as_completed(futures):
+                future.result()
         
-        # Process in batches to respect max_parallel limit
-        for i in range(0, len(linkedin_urls), self.max_parallel):
-            batch = linkedin_urls[i:i + self.max_parallel]
+        return results
+    
+    def enrich_profiles_mp(self, linkedin_urls: List[str], workers: int = 4) -> List[EnrichmentResult]:
+        """
+        Enrich multiple LinkedIn profiles across worker processes.
+        
+        Each process opens its own Playwright driver and CDP connection to the
+        same Chrome and runs enrich_profiles on its share of the URLs, so
+        throughput is not capped by one interpreter's GIL. max_parallel is
+        split between the processes.
+        
+        Args:
+            linkedin_urls: List of LinkedIn profile URLs
+            workers: Number of worker processes
             
-            # Process batch sequentially (parallel processing can be added later)
-            for url in batch:
+        Returns:
+            List of EnrichmentResult objects, in input order
+        """
+        if not linkedin_urls:
+            return []
+        
+        workers = max(1, min(workers, len(linkedin_urls)))
+        per_worker_parallel = max(1, self.max_parallel // workers)
+        
+        # Stride the URLs so every shard gets a similar mix
+        shards = [linkedin_urls[i::workers] for i in range(workers)]
+        results: List[Optional[EnrichmentResult]] = [None] * len(linkedin_urls)
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_enrich_shard, shard, self.debug_port, per_worker_parallel, self.wait_time): i
+                for i, shard in enumerate(shards)
+            }
+            for future in as_completed(futures):
+                shard_index = futures[future]
+                for j, data in enumerate(future.result()):
+                    results[shard_index + j * workers] = EnrichmentResult.unchecked(**data)
+        
+        return results
+    
+    def _process_queue(self, pending: queue.Queue, results: List[Optional[EnrichmentResult]]):
+        """
+        Worker loop: enrich queued URLs on this thread's own browser connection.
+        
+        Args:
+            pending: Queue of (index, url) tuples still to process
+            results: Result list filled in at each URL's original index
+        """
+        try:
+            while True:
+                try:
+                    index, url = pending.get_nowait()
+                except queue.Empty:
+                    return
+                
                 try:
-                    result = self.enrich_profile(url)
-                    results.append(result)
+                    results[index] = self.enrich_profile(url)
                 except Exception as e:
                     print(f"Error processing {url}: {e}")
                     # Create error result
-                    error_result = DataCompiler.compile_result(linkedin_url=url)
-                    results.append(error_result)
-        
-        return results
+                    results[index] = DataCompiler.compile_result(linkedin_url=url)
+        finally:
+            self.disconnect()
+            # Worker thread is done: stop its Playwright driver too
+            shutdown_playwright()
     
     def disconnect(self):
-        """Disconnect from browser."""
+        """Disconnect the calling thread from the browser."""
+        if self.profile_opener:
+            self.profile_opener.close_all_pages()
+            self.profile_opener = None
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+            self.context = None
         if self.browser_connector:
             self.browser_connector.disconnect()
             self.browser_connector = None
-            self.context = None
     
     def __enter__(self):
         """Context manager entry."""
@@ -154,3 +298,15 @@ class LinkedInEnricher:
         """Context manager exit."""
         self.disconnect()
 
+
+def _enrich_shard(linkedin_urls: List[str], debug_port: int, max_parallel: int, wait_time: int) -> List[dict]:
+    """
+    Process-pool worker for LinkedInEnricher.enrich_profiles_mp.
+    
+    Returns:
+        model_dump() of each result, in shard order
+    """
+    enricher = LinkedInEnricher(debug_port=debug_port, wait_time=wait_time)
+    # Parent already split max_parallel across processes; don't let the env override it
+    enricher.max_parallel = max_parallel
+    return [result.model_dump() for result in enricher.enrich_profiles(linkedin_urls)]
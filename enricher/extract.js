@@ -0,0 +1,46 @@
+// Profile extraction bundle for step 3.
+// Collects everything UserExtractor needs in a single page.evaluate() call,
+// so the profile page costs one browser round-trip instead of one per field.
+// Selectors come from UserExtractor.EXTRACT_ARG (step3_user_extractor.py).
+({nameSelectors, sectionSelectors, itemSelector, linkSelector}) => {
+    const text = (el) => ((el && el.innerText) || '').trim();
+
+    // Name: first header h1 selector (in priority order) whose match has
+    // text, falling back to the og:title meta tag
+    let name = '';
+    for (const selector of nameSelectors) {
+        name = text(document.querySelector(selector));
+        if (name) break;
+    }
+    if (!name) {
+        const meta = document.querySelector('meta[property="og:title"]');
+        const content = meta && meta.getAttribute('content');
+        if (content) {
+            name = content.split(' | ')[0].trim();
+        }
+    }
+
+    // Experience section and its first (most recent) entry. Section selectors
+    // are tried in priority order: the generic ones also match earlier cards
+    let anchor = null;
+    for (const selector of sectionSelectors) {
+        anchor = document.querySelector(selector);
+        if (anchor) break;
+    }
+    const section = anchor ? (anchor.closest('section') || anchor) : null;
+    const firstExperience = section ? section.querySelector(itemSelector) : null;
+
+    // Company link inside the first experience entry
+    const link = firstExperience ? firstExperience.querySelector(linkSelector) : null;
+    const img = link ? link.querySelector('img') : null;
+
+    return {
+        name: name || null,
+        hasExperience: !!section,
+        experienceText: text(firstExperience),
+        companyHref: link ? link.getAttribute('href') : null,
+        companyText: text(link),
+        companyAlt: img ? (img.getAttribute('alt') || img.getAttribute('title') || '') : '',
+        companyAriaLabel: link ? (link.getAttribute('aria-label') || '') : ''
+    };
+}
@@ -0,0 +1,53 @@
+// Company extraction for step 3 (UserExtractor.extract_current_company).
+// Walks the experience section in-page and returns the raw strings needed to
+// name the current company, so Python only does the text cleanup.
+({sectionSelectors, itemSelector, linkSelector, spanSelector, spanParent, textParent}) => {
+    const text = (el) => ((el && el.innerText) || '').trim();
+    const texts = (root, selector) => root ? [...root.querySelectorAll(selector)].map(text) : [];
+    // aria-hidden spans are leaves holding the visible text, so textContent is
+    // enough there and skips the layout flush innerText forces
+    const rawTexts = (root, selector) => root ? [...root.querySelectorAll(selector)].map(el => (el.textContent || '').trim()) : [];
+
+    // Experience section and its first (most recent) entry; the ready wait has
+    // usually found the section already, and it is reused while still attached
+    let section = window.__experienceSection;
+    if (!section || !section.isConnected) {
+        // First selector with a match wins, in priority order
+        let anchor = null;
+        for (const selector of sectionSelectors) {
+            anchor = document.querySelector(selector);
+            if (anchor) break;
+        }
+        section = anchor ? (anchor.closest('section') || anchor) : null;
+    }
+    const firstExperience = section ? section.querySelector(itemSelector) : null;
+
+    // Company link: first one in the first entry, then in the section, then anywhere
+    const links = [...document.querySelectorAll(linkSelector)];
+    const link = (firstExperience && links.find(a => firstExperience.contains(a)))
+        || (section && links.find(a => section.contains(a)))
+        || links[0]
+        || null;
+    const img = link ? link.querySelector('img') : null;
+
+    // Spans that may hold the company name: inside the link, else in its
+    // closest container (closest() takes the whole selector list at once)
+    let nearbyTexts = texts(link, spanSelector);
+    if (!nearbyTexts.length && link) {
+        nearbyTexts = texts(link.closest(spanParent), spanSelector);
+    }
+
+    // All aria-hidden texts in the link's closest text container
+    const contextTexts = link ? rawTexts(link.closest(textParent), 'span[aria-hidden="true"]') : [];
+
+    return {
+        hasFirstExperience: !!firstExperience,
+        experienceText: text(firstExperience),
+        href: link ? link.getAttribute('href') : null,
+        linkText: text(link),
+        linkAlt: img ? (img.getAttribute('alt') || img.getAttribute('title') || '') : '',
+        linkAria: link ? (link.getAttribute('aria-label') || '') : '',
+        nearbyTexts,
+        contextTexts
+    };
+}
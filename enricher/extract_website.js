@@ -0,0 +1,64 @@
+// Website candidates for step 4 (CompanyNavigator.extract_company_website).
+// Collects every link the Python fallbacks look at in a single page.evaluate()
+// call, so scoring and redirect cleanup run locally instead of one CDP
+// round-trip per selector, element and attribute.
+({overviewSelectors, websiteSelectors, infoSelectors, metaSelectors}) => {
+    const href = (el) => el ? el.getAttribute('href') : null;
+    const text = (el) => el ? el.textContent : '';
+    const externalLinks = (root) => [...root.querySelectorAll('a[href^="http"]')];
+
+    // Overview section: the first selector that matches
+    let overview = null;
+    for (const selector of overviewSelectors) {
+        overview = document.querySelector(selector);
+        if (overview) break;
+    }
+
+    // Its external links with the text of their closest dl/div/li (used to spot
+    // a "Website" label) and of their closest dl/div/li/dt/dd (used for scoring)
+    const overviewLinks = overview ? externalLinks(overview).map(a => ({
+        href: href(a),
+        container: text(a.closest('dl, div, li')),
+        context: text(a.closest('dl, div, li, dt, dd'))
+    })) : [];
+
+    // Links tied to a "Website" label, in label order: a dt's own dd first
+    // (LinkedIn's <dl><dt>Website</dt><dd><a>), then the label's closest
+    // dl/div/li. Matching on textContent avoids the layout innerText forces
+    const websiteLabels = overview ? [...overview.querySelectorAll('dt, div, span')]
+        .filter(el => /website/i.test(el.textContent || '')) : [];
+    // Innermost labels only; wrappers match too since they contain the label text
+    const innermostLabels = websiteLabels.filter(el => !websiteLabels.some(other => other !== el && el.contains(other)));
+    const labeledHrefs = [];
+    for (const label of innermostLabels) {
+        const dd = label.tagName === 'DT' ? label.nextElementSibling : null;
+        const containers = [dd && dd.tagName === 'DD' ? dd : null, label.closest('dl, div, li')];
+        for (const container of containers) {
+            const a = container ? container.querySelector('a[href^="http"]') : null;
+            if (a && !labeledHrefs.includes(href(a))) labeledHrefs.push(href(a));
+        }
+    }
+
+    return {
+        hasOverview: !!overview,
+        hasWebsiteLabel: websiteLabels.length > 0,
+        labeledHrefs,
+        overviewLinks,
+        // href of the first match of each website selector (null if none)
+        selectorHrefs: websiteSelectors.map(selector => href(document.querySelector(selector))),
+        // External link hrefs of each info section (null if the section is missing)
+        infoSectionHrefs: infoSelectors.map(selector => {
+            const section = document.querySelector(selector);
+            return section ? externalLinks(section).map(href) : null;
+        }),
+        // URL from each meta/link tag (null if missing)
+        metaUrls: metaSelectors.map(selector => {
+            const el = document.querySelector(selector);
+            if (!el) return null;
+            const tag = el.tagName.toLowerCase();
+            return tag === 'meta' ? el.getAttribute('content') : tag === 'link' ? el.getAttribute('href') : null;
+        }),
+        // [href, text of closest div/section/li] for every external link on the page
+        pageLinks: externalLinks(document).map(a => [href(a), text(a.closest('div, section, li'))])
+    };
+}
@@ -13,4 +13,13 @@ class EnrichmentResult(BaseModel):
     company_linkedin_url: Optional[str] = None
     valid_experience: bool = True
     experience_reason: Optional[str] = None
-
+    
+    @classmethod
+    def unchecked(cls, **kwargs) -> "EnrichmentResult":
+        """
+        Build a result without running Pydantic validation.
+        
+        Only for data produced by our own pipeline, where every field is
+        already of the right type.
+        """
+        return cls.model_construct(**kwargs)
@@ -1,8 +1,47 @@
 """Step 1: Browser Connection Module
 Connects to an existing Chrome browser session."""
 import os
-from playwright.sync_api import sync_playwright, Browser, BrowserContext
-from typing import Optional
+import json
+import atexit
+import socket
+import threading
+import urllib.request
+from playwright.sync_api import Browser, BrowserContext
+from typing import Dict, Optional
+
+
+# webSocketDebuggerUrl per debug port, read once from /json/version
+_WS_ENDPOINTS: Dict[int, str] = {}
+
+# Playwright driver, started on first use and reused across connectors.
+# The sync API is bound to the thread that started it, so each thread gets its own.
+_local = threading.local()
+_atexit_registered = False
+
+
+def _get_playwright():
+    """Return the calling thread's Playwright driver, starting it on first use."""
+    global _atexit_registered
+    playwright = getattr(_local, 'playwright', None)
+    if playwright is None:
+        from playwright.sync_api import sync_playwright
+        playwright = sync_playwright().start()
+        _local.playwright = playwright
+        if threading.current_thread() is threading.main_thread() and not _atexit_registered:
+            atexit.register(shutdown_playwright)
+            _atexit_registered = True
+    return playwright
+
+
+def shutdown_playwright():
+    """Stop the calling thread's Playwright driver, if one was started."""
+    playwright = getattr(_local, 'playwright', None)
+    if playwright is not None:
+        _local.playwright = None
+        try:
+            playwright.stop()
+        except Exception:
+            pass
 
 
 class BrowserConnector:
@@ -33,32 +72,29 @@ class BrowserConnector:
         Raises:
             ConnectionError: If unable to connect to Chrome
         """
-        import requests
-        
-        # First, check if Chrome is running on the debug port
-        try:
-            response = requests.get(f"http://localhost:{self.debug_port}/json/version", timeout=2)
-            if response.status_code != 200:
-                raise ConnectionError(
-                    f"Chrome is not running with remote debugging on port {self.debug_port}. "
-                    f"Please start Chrome with: --remote-debugging-port={self.debug_port}"
-                )
-        except requests.exceptions.RequestException:
-            raise ConnectionError(
-                f"Chrome is not running with remote debugging on port {self.debug_port}. "
-                f"Please start Chrome with: --remote-debugging-port={self.debug_port}. "
-                f"See setup_chrome.sh or SETUP.md for instructions."
-            )
+        ws_endpoint = _WS_ENDPOINTS.get(self.debug_port)
+        if ws_endpoint:
+            # Endpoint already known: just check Chrome is still listening
+            try:
+                sock = socket.create_connection(("localhost", self.debug_port), timeout=0.2)
+                sock.close()
+            except OSError:
+                _WS_ENDPOINTS.pop(self.debug_port, None)
+                raise self._not_running_error()
+        else:
+            ws_endpoint = self._discover_ws_endpoint()
         
         try:
-            # Use sync_playwright in a way that avoids asyncio conflicts
-            # Start playwright in a new thread context to avoid asyncio issues
-            self.playwright = sync_playwright().start()
+            # Reuse this thread's Playwright driver instead of starting a new one per connect
+            self.playwright = _get_playwright()
             
-            # Connect to existing Chrome instance
-            self.browser = self.playwright.chromium.connect_over_cdp(
-                f"http://localhost:{self.debug_port}"
-            )
+            # Connect straight to the browser WebSocket, skipping Playwright's own discovery
+            try:
+                self.browser = self.playwright.chromium.connect_over_cdp(ws_endpoint)
+            except Exception:
+                # Chrome may have restarted since the endpoint was cached
+                _WS_ENDPOINTS.pop(self.debug_port, None)
+                self.browser = self.playwright.chromium.connect_over_cdp(self._discover_ws_endpoint())
             
             # Get the default context (or create one if needed)
             contexts = self.browser.contexts
@@ -83,17 +119,48 @@ class BrowserConnector:
                 f"Error: {error_msg}"
             )
     
+    def _not_running_error(self) -> ConnectionError:
+        """Build the error raised when Chrome isn't reachable on the debug port."""
+        return ConnectionError(
+            f"Chrome is not running with remote debugging on port {self.debug_port}. "
+            f"Please start Chrome with: --remote-debugging-port={self.debug_port}. "
+            f"See setup_chrome.sh or SETUP.md for instructions."
+        )
+    
+    def _discover_ws_endpoint(self) -> str:
+        """
+        Read the browser WebSocket URL from Chrome's /json/version endpoint.
+        
+        Returns:
+            webSocketDebuggerUrl, also cached for later connects on this port
+            
+        Raises:
+            ConnectionError: If Chrome is not reachable on the debug port
+        """
+        try:
+            with urllib.request.urlopen(f"http://localhost:{self.debug_port}/json/version", timeout=2) as response:
+                ws_endpoint = json.load(response)['webSocketDebuggerUrl']
+        except (OSError, ValueError, KeyError):
+            raise self._not_running_error()
+        
+        _WS_ENDPOINTS[self.debug_port] = ws_endpoint
+        return ws_endpoint
+    
     def disconnect(self):
         """Disconnect from browser session."""
         if self.context:
             # Don't close the context as it's managed by the existing browser
             self.context = None
         if self.browser:
-            # Don't close the browser as it's the existing Chrome instance
+            # For a CDP-attached browser close() only drops our WebSocket connection;
+            # the Chrome instance keeps running. Needed because the driver outlives us.
+            try:
+                self.browser.close()
+            except Exception:
+                pass
             self.browser = None
-        if self.playwright:
-            self.playwright.stop()
-            self.playwright = None
+        # The Playwright driver is shared; see shutdown_playwright()
+        self.playwright = None
     
     def __enter__(self):
         """Context manager entry."""
@@ -1,24 +1,122 @@
 """Step 2: LinkedIn Profile Opener Module
 Opens LinkedIn profiles in the browser with parallel processing support."""
-from typing import List, Optional
-from playwright.sync_api import Page, BrowserContext
-import time
+from typing import Dict, List, Optional, Set
+from playwright.sync_api import Page, BrowserContext, CDPSession, TimeoutError as PWTimeout
+import queue
+
+from .step3_user_extractor import UserExtractor
+
+
+# Resources no enrichment step needs (pooled pages also load company
+# websites); Chrome drops these itself via Network.setBlockedURLs, so no
+# request is routed through Python
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    # Ads, analytics and chat widgets
+    "*/ads/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+    "*google-analytics.com/*", "*hotjar.com/*", "*intercom.io/*",
+    "*segment.io/*", "*facebook.net/*",
+]
+
+# Present once the profile has rendered enough to extract from; UserExtractor
+# waits for the experience section itself
+PROFILE_READY_SELECTOR = 'h1, [data-section="experience"], .pvs-list__outer-container, #experience'
 
 
 class ProfileOpener:
     """Handles opening LinkedIn profiles in browser."""
     
-    def __init__(self, context: BrowserContext, max_parallel: int = 10):
+    def __init__(self, context: BrowserContext, max_parallel: int = 10, pool_size: Optional[int] = None):
         """
         Initialize profile opener.
         
         Args:
             context: Browser context to use
             max_parallel: Maximum number of profiles to open in parallel
+            pool_size: Maximum idle pages kept for reuse (default: max_parallel)
         """
         self.context = context
         self.max_parallel = max_parallel
-        self.pages: List[Page] = []
+        self.pool_size = pool_size if pool_size is not None else max_parallel
+        self.pages: Set[Page] = set()
+        # Idle pages ready for reuse; filled lazily as pages are released
+        self._pool: "queue.Queue[Page]" = queue.Queue()
+        # CDP session per page that carries its URL blocklist
+        self._cdp_sessions: Dict[Page, CDPSession] = {}
+    
+    def acquire(self) -> Page:
+        """
+        Get a page from the pool, creating a new one if none is idle.
+        
+        Returns:
+            Page object ready for navigation
+        """
+        try:
+            page = self._pool.get_nowait()
+        except queue.Empty:
+            page = self.context.new_page()
+            self._block_resources(page)
+            UserExtractor.watch_profile_api(page)
+        
+        self.pages.add(page)
+        return page
+    
+    def _block_resources(self, page: Page):
+        """Have Chrome block BLOCKED_URL_PATTERNS for this page."""
+        try:
+            cdp = self.context.new_cdp_session(page)
+            cdp.send("Network.enable")
+            cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception:
+            # Not fatal: the page just loads everything
+            return
+        self._cdp_sessions[page] = cdp
+    
+    def _close(self, page: Page):
+        """Detach the page's CDP session and close it."""
+        cdp = self._cdp_sessions.pop(page, None)
+        if cdp:
+            try:
+                cdp.detach()
+            except Exception:
+                pass
+        page.close()
+    
+    def release(self, page: Page):
+        """
+        Return a page to the pool for reuse.
+        
+        The page is navigated to about:blank to drop the profile DOM. Pages
+        beyond pool_size, or pages that fail to reset, are closed instead.
+        """
+        self.pages.discard(page)
+        
+        if self._pool.qsize() >= self.pool_size:
+            self._close(page)
+            return
+        
+        try:
+            page.goto("about:blank")
+            page.evaluate("() => { performance.clearResourceTimings(); }")
+        except Exception:
+            self._close(page)
+            return
+        
+        self._pool.put(page)
+    
+    def stop_loading(self, page: Page):
+        """
+        Abort the page's outstanding loads (trackers, lazy images, XHRs).
+        
+        Called once extraction is done so the profile page stops using CPU and
+        memory while the company steps run on other pages.
+        """
+        try:
+            page.evaluate("() => window.stop()")
+        except Exception:
+            pass
     
     def open_profile(self, linkedin_url: str, wait_time: int = 3) -> Page:
         """
@@ -31,32 +129,23 @@ class ProfileOpener:
         Returns:
             Page object for the opened profile
         """
-        page = self.context.new_page()
-        page.goto(linkedin_url, wait_until="domcontentloaded", timeout=30000)
-        
-        # Wait for page to be interactive (reduced by 80%)
+        page = self.acquire()
         try:
-            # Wait for network to be mostly idle (but allow some background requests)
-            # Reduced from 10000ms to 2000ms (80% reduction)
-            page.wait_for_load_state("networkidle", timeout=2000)
-        except:
-            # If networkidle times out, just wait the specified time
-            pass
+            page.goto(linkedin_url, wait_until="domcontentloaded", timeout=30000)
+        except Exception:
+            # Hand the page back so a retry doesn't leak it
+            self.release(page)
+            raise
         
-        # Wait for experience section or profile content to appear (reduced by 80%)
+        # Wait for profile content to appear, at most wait_time. LinkedIn never
+        # goes network-idle (long-poll and tracking requests), so waiting for
+        # that, or sleeping on top, only added fixed delay to every profile
         try:
-            # Try to wait for experience section or any profile content
-            # Reduced timeout by 80% (20% of original)
-            page.wait_for_selector('h1, [data-section="experience"], .pvs-list__outer-container, #experience', timeout=int(wait_time * 200))  # 20% of wait_time * 1000
-        except:
-            # If selector not found, just wait the specified time
+            page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=int(wait_time * 1000), state="attached")
+        except PWTimeout:
+            # Continue with whatever has rendered
             pass
         
-        # Additional wait to ensure JavaScript has finished rendering (reduced by 80%)
-        # Reduced from wait_time to 20% of wait_time
-        time.sleep(wait_time * 0.2)
-        
-        self.pages.append(page)
         return page
     
     def open_profiles_parallel(self, linkedin_urls: List[str], wait_time: int = 3) -> List[Page]:
@@ -75,28 +164,48 @@ class ProfileOpener:
             batch = linkedin_urls[i:i + self.max_parallel]
             batch_pages = []
             
-            # Open all pages in current batch
+            # Start every navigation in the batch; "commit" returns as soon as the
+            # response starts, so Chrome loads all pages of the batch concurrently
+            # (sync Playwright objects can't be driven from worker threads)
             for url in batch:
-                page = self.context.new_page()
-                page.goto(url, wait_until="domcontentloaded")
+                page = self.acquire()
+                try:
+                    page.goto(url, wait_until="commit", timeout=30000)
+                except Exception:
+                    # Hand back this page and every one opened so far (the caller
+                    # never gets them) so a retry doesn't leak them
+                    for opened in pages + batch_pages + [page]:
+                        self.release(opened)
+                    raise
                 batch_pages.append(page)
             
-            # Wait for all pages in batch to load (reduced by 80%)
-            time.sleep(wait_time * 0.2)
+            # Then wait for each page; later pages have usually finished by now
+            for page in batch_pages:
+                try:
+                    page.wait_for_load_state("domcontentloaded", timeout=30000)
+                    page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=int(wait_time * 200))
+                except PWTimeout:
+                    # Use whatever has rendered so far
+                    pass
+            
             pages.extend(batch_pages)
-            self.pages.extend(batch_pages)
         
         return pages
     
     def close_page(self, page: Page):
         """Close a specific page."""
-        if page in self.pages:
-            self.pages.remove(page)
-        page.close()
+        self.pages.discard(page)
+        self._close(page)
     
     def close_all_pages(self):
-        """Close all opened pages."""
-        for page in self.pages[:]:
-            page.close()
+        """Close all opened pages and drain the idle pool."""
+        for page in list(self.pages):
+            self._close(page)
         self.pages.clear()
+        
+        while True:
+            try:
+                self._close(self._pool.get_nowait())
+            except queue.Empty:
+                break
 
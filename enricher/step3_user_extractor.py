@@ -1,13 +1,218 @@
 """Step 3: User Information Extractor Module
 Extracts user name and current company from LinkedIn profile."""
-from typing import Optional, Dict
-from playwright.sync_api import Page
+from typing import Optional, Dict, List
+from pathlib import Path
+from playwright.sync_api import Page, Error as PWError, TimeoutError as PWTimeout
+from playwright.async_api import Page as AsyncPage, TimeoutError as AsyncPWTimeout
+from bs4 import BeautifulSoup, Tag
+from urllib.parse import unquote
+from collections import OrderedDict
 import re
+import threading
+import time
+import asyncio
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+# Single-roundtrip extraction bundle (see extract.js)
+EXTRACT_JS = (Path(__file__).parent / 'extract.js').read_text()
+
+# In-page walk behind extract_current_company (see extract_company.js)
+EXTRACT_COMPANY_JS = (Path(__file__).parent / 'extract_company.js').read_text()
+
+# Profile name header selectors, in priority order
+NAME_SELECTORS = [
+    'h1.text-heading-xlarge',
+    'h1[data-anonymize="person-name"]',
+    'h1.break-words',
+    'h1',
+    '.ph5 h1',
+    '.pv-text-details__left-panel h1'
+]
+
+# Profile header text (first selector whose match has text) and og:title
+# content, for extract_name. Takes NAME_SELECTORS.
+EXTRACT_NAME_JS = """(selectors) => {
+    let header = null;
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        const text = el ? (el.innerText || '').trim() : '';
+        if (text) {
+            header = text;
+            break;
+        }
+    }
+    const meta = document.querySelector('meta[property="og:title"]');
+    return {
+        header,
+        metaTitle: meta ? meta.getAttribute('content') : null
+    };
+}"""
+
+# Body HTML for UserExtractor._snapshot, without the parts the offline selectors
+# never read: scripts, styles, LinkedIn's embedded JSON (<code> blocks), SVG
+# icons, and the screen-reader duplicates (.visually-hidden) so that element
+# text matches what innerText would return
+SNAPSHOT_JS = """() => {
+    const body = document.body.cloneNode(true);
+    body.querySelectorAll('script, style, noscript, template, code, svg, .visually-hidden')
+        .forEach(el => el.remove());
+    return body.outerHTML;
+}"""
+
+# Company page links, excluding the company search link
+COMPANY_LINK_SELECTOR = 'a[href*="/company/"]:not([href*="/company/search"])'
+
+# Spans near a company link that usually hold the company name
+NEARBY_SPAN_SELECTOR = 'span.t-14.t-normal span[aria-hidden="true"], span.t-14.t-normal, span[aria-hidden="true"]'
+
+# True once the experience section holds a company link, or its first entry has
+# rendered without one (self-employed etc.), so the wait never runs to timeout
+# just because there is no link to find. Takes UserExtractor.EXTRACT_COMPANY_ARG.
+EXPERIENCE_READY_JS = """({sectionSelectors, itemSelector}) => {
+    // The predicate is polled every frame; keep the section found on an earlier
+    // poll while it is still in the document (extract_company.js reuses it too)
+    let section = window.__experienceSection;
+    if (!section || !section.isConnected) {
+        // First selector with a match wins, in priority order
+        let anchor = null;
+        for (const selector of sectionSelectors) {
+            anchor = document.querySelector(selector);
+            if (anchor) break;
+        }
+        section = anchor && (anchor.closest('section') || anchor);
+        window.__experienceSection = section;
+    }
+    if (!section) return false;
+    if (section.querySelector('a[href*="/company/"]')) return true;
+    const first = section.querySelector(itemSelector);
+    return !!(first && (first.innerText || '').trim());
+}"""
+
+# Experience section anchors, most specific first. Tried one at a time: the
+# generic ones also match earlier cards (About, Featured, Activity), so a
+# grouped query would return whichever comes first in the document
+EXPERIENCE_SECTION_SELECTORS = [
+    '#experience',
+    '[data-section="experience"]',
+    'section[data-section="experience"]',
+    '.pvs-list__outer-container',
+    '.experience-section',
+    'div[id*="experience"]'
+]
+
+# Experience entry selectors, grouped so the lookup is one query
+EXPERIENCE_ITEM_SELECTOR = ', '.join([
+    '.pvs-list__paged-list-item',
+    '.pvs-list__outer-container > ul > li',
+    '.experience-item',
+    'li[data-section="experience"]',
+    'div[data-section="experience"] > ul > li',
+    'section[data-section="experience"] ul > li'
+])
 
 
 class UserExtractor:
     """Extracts user information from LinkedIn profile page."""
     
+    # Container searched for company-name spans when the link has none
+    # (grouped, for a single closest() lookup)
+    SPAN_PARENT_SELECTOR = ', '.join((
+        'div.display-flex.flex-column',
+        'div.display-flex',
+        'div.pvs-entity__sub-components-container',
+        'div.pvs-list__outer-container',
+        'li.pvs-list__paged-list-item',
+        'div'
+    ))
+    
+    # Container searched for any company-name text near the link
+    TEXT_PARENT_SELECTOR = ', '.join((
+        'div.display-flex.flex-column',
+        'div.display-flex',
+        'div.pvs-entity__sub-components-container',
+        'div'
+    ))
+    
+    # Argument for EXTRACT_JS
+    EXTRACT_ARG = {
+        'nameSelectors': NAME_SELECTORS,
+        'sectionSelectors': EXPERIENCE_SECTION_SELECTORS,
+        'itemSelector': EXPERIENCE_ITEM_SELECTOR,
+        'linkSelector': COMPANY_LINK_SELECTOR
+    }
+    
+    # Argument for EXTRACT_COMPANY_JS
+    EXTRACT_COMPANY_ARG = {
+        'sectionSelectors': EXPERIENCE_SECTION_SELECTORS,
+        'itemSelector': EXPERIENCE_ITEM_SELECTOR,
+        'linkSelector': COMPANY_LINK_SELECTOR,
+        'spanSelector': NEARBY_SPAN_SELECTOR,
+        'spanParent': SPAN_PARENT_SELECTOR,
+        'textParent': TEXT_PARENT_SELECTOR
+    }
+    
+    # Text-based company selectors, used when no company link is found
+    COMPANY_SELECTORS = (
+        # Modern LinkedIn selectors (2024+) - based on the HTML structure provided
+        'span.t-14.t-normal span[aria-hidden="true"]',  # Company name in experience
+        'span.t-14 span[aria-hidden="true"]',
+        'div.t-14.t-normal span[aria-hidden="true"]',
+        'a[data-control-name="background_details_company"]',
+        'a[data-field="experience_company_logo"]',
+        # Alternative selectors
+        COMPANY_LINK_SELECTOR,  # Covers the .t-14 and sub-components/list container link variants
+        'span.t-14.t-normal',
+        '.entity-result__title-text a',
+        '.pv-entity__secondary-title',
+        '.pv-entity__secondary-title a',
+        # New selectors for modern LinkedIn
+        'div.pvs-entity__sub-components-container span[aria-hidden="true"]',
+        'div.pvs-entity__sub-components-container .t-normal',
+        # Generic fallbacks
+        'a[href*="company"]',
+        'span[aria-hidden="true"]'
+    )
+    
+    # Employment type keywords removed by _extract_company_name_from_text
+    EMPLOYMENT_TYPES = frozenset({'full-time', 'part-time', 'contract', 'internship', 'self-employed', 'freelance'})
+    EMPLOYMENT_TYPE_RE = re.compile(
+        r'\s*(?:Full-time|Part-time|Contract|Internship|Self-employed|Freelance)\s*',
+        re.IGNORECASE
+    )
+    
+    # Checked by _is_invalid_company_name: exact (lowercased) metadata strings,
+    # month prefixes, and durations like "3 yrs" (the only case needing a regex)
+    INVALID_EXACT_NAMES = frozenset({'present', 'full-time', 'part-time', 'contract', 'internship'})
+    MONTH_PREFIXES = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+    DURATION_RE = re.compile(r'^\d+\s*(?:yr|year|month)', re.IGNORECASE)
+    
+    # LinkedIn API responses that carry the profile's positions, and where the
+    # profile's public id (vanity name) sits in their (unquoted) URL
+    PROFILE_API_RE = re.compile(r'voyager/api/(?:identity/.*profileView|graphql\?.*profilePositionGroups)')
+    API_VANITY_RE = re.compile(r'(?:/profiles/|memberIdentity:)([^/,()&?]+)')
+    # Public id in a profile page URL
+    PROFILE_VANITY_RE = re.compile(r'/in/([^/?#]+)')
+    
+    # Attempts per page.evaluate() when the page navigates mid-call
+    EVALUATE_ATTEMPTS = 2
+    
+    # Bounded LRU of extract_current_company() results by profile URL, shared by
+    # all extractors (one is created per page, possibly on several threads)
+    COMPANY_CACHE_SIZE = 1024
+    _company_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+    _company_cache_lock = threading.Lock()
+    
+    # Current company parsed from captured API responses, keyed by lowercased
+    # public id; filled by watch_profile_api() listeners, consumed on lookup.
+    # Bounded: responses for profiles never looked up would otherwise pile up
+    API_COMPANIES_SIZE = 256
+    _api_companies: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+    _api_companies_lock = threading.Lock()
+    
     def __init__(self, page: Page):
         """
         Initialize user extractor.
@@ -16,6 +221,8 @@ class UserExtractor:
             page: Page object with LinkedIn profile loaded
         """
         self.page = page
+        # select() results on the current snapshot, keyed by (id(root), selector)
+        self._qs_cache: Dict[tuple, List[Tag]] = {}
     
     def extract_name(self) -> Optional[str]:
         """
@@ -25,618 +232,305 @@ class UserExtractor:
             User's name or None if not found
         """
         try:
-            # Try multiple selectors for name
-            selectors = [
-                'h1.text-heading-xlarge',
-                'h1[data-anonymize="person-name"]',
-                'h1.break-words',
-                'h1',
-                '.ph5 h1',
-                '.pv-text-details__left-panel h1'
-            ]
-            
-            for selector in selectors:
-                name_element = self.page.query_selector(selector)
-                if name_element:
-                    name = name_element.inner_text().strip()
-                    if name:
-                        return name
-            
-            # Fallback: try to find in meta tags
-            meta_name = self.page.query_selector('meta[property="og:title"]')
-            if meta_name:
-                name = meta_name.get_attribute('content')
-                if name:
-                    return name.split(' | ')[0].strip()
+            # Header text and og:title read in one evaluate instead of a round-trip per element
+            data = self.page.evaluate(EXTRACT_NAME_JS, NAME_SELECTORS)
+            return self._name_from_page_data(data)
             
+        except Exception as e:
+            log.warning("extract_name failed: %s", e)
             return None
+    
+    @staticmethod
+    def _name_from_page_data(data: Dict) -> Optional[str]:
+        """Name from the output of EXTRACT_NAME_JS: header text, else the og:title prefix."""
+        name = (data.get('header') or '').strip()
+        if name:
+            return name
+        
+        # Fallback: meta tag, "Name | LinkedIn"
+        meta_title = data.get('metaTitle')
+        if meta_title:
+            return meta_title.split(' | ')[0].strip()
+        
+        return None
+    
+    @classmethod
+    def watch_profile_api(cls, page: Page):
+        """
+        Capture the positions LinkedIn's API returns for profiles opened in page.
+        
+        Must be called before navigating; extract_current_company() then reads
+        the company from the captured JSON instead of walking the DOM.
+        """
+        page.on('response', cls._capture_profile_api)
+    
+    @classmethod
+    def _capture_profile_api(cls, response):
+        """Response listener registered by watch_profile_api()."""
+        url = unquote(response.url)
+        if not cls.PROFILE_API_RE.search(url):
+            return
+        match = cls.API_VANITY_RE.search(url)
+        if not match:
+            return
+        try:
+            company_info = cls._company_from_api_json(response.json())
+        except Exception:
+            return
+        if company_info:
+            with cls._api_companies_lock:
+                cls._api_companies[match.group(1).lower()] = company_info
+                cls._api_companies.move_to_end(match.group(1).lower())
+                if len(cls._api_companies) > cls.API_COMPANIES_SIZE:
+                    cls._api_companies.popitem(last=False)
+    
+    @staticmethod
+    def _company_from_api_json(data: Dict) -> Optional[Dict[str, str]]:
+        """
+        Current company from a profileView / profilePositionGroups response.
+        
+        Args:
+            data: Parsed JSON of the API response
             
-        except Exception as e:
-            print(f"Error extracting name: {e}")
+        Returns:
+            Company info dictionary, or None if the response has no current position
+        """
+        # Classic profileView lists positions newest first under positionView
+        positions = (data.get('positionView') or {}).get('elements')
+        if positions:
+            position = positions[0]
+        else:
+            # Normalized (GraphQL) responses put every position, current and
+            # past, in the 'included' entities in no set order: take the
+            # ongoing one (no end date) that started last, else leave it to the DOM
+            current = [
+                item for item in data.get('included', [])
+                if isinstance(item, dict) and item.get('companyName') and UserExtractor._is_current_position(item)
+            ]
+            if not current:
+                return None
+            position = max(current, key=UserExtractor._position_start)
+        if not position.get('companyName'):
+            return None
+        
+        # urn:li:fs_miniCompany:1234 -> https://www.linkedin.com/company/1234/
+        company_urn = position.get('companyUrn') or ''
+        company_id = company_urn.rsplit(':', 1)[-1] if company_urn else None
+        return {
+            'name': position['companyName'].strip(),
+            'linkedin_url': f"https://www.linkedin.com/company/{company_id}/" if company_id else None,
+            'valid': True
+        }
+    
+    @staticmethod
+    def _position_dates(position: Dict) -> Dict:
+        """A position's date range: dateRange {start, end} (GraphQL) or timePeriod {startDate, endDate}."""
+        if isinstance(position.get('dateRange'), dict):
+            return position['dateRange']
+        period = position.get('timePeriod') or {}
+        return {'start': period.get('startDate'), 'end': period.get('endDate')}
+    
+    @staticmethod
+    def _is_current_position(position: Dict) -> bool:
+        """True for a position with a start date and no end date."""
+        dates = UserExtractor._position_dates(position)
+        return bool(dates.get('start')) and not dates.get('end')
+    
+    @staticmethod
+    def _position_start(position: Dict) -> tuple:
+        """Sort key for a position's start date, (year, month)."""
+        start = UserExtractor._position_dates(position).get('start') or {}
+        return (start.get('year') or 0, start.get('month') or 0)
+    
+    def _company_from_api(self) -> Optional[Dict[str, str]]:
+        """Company captured from the API for the current profile, if any."""
+        match = self.PROFILE_VANITY_RE.search(unquote(self.page.url))
+        if not match:
             return None
+        with self._api_companies_lock:
+            return self._api_companies.pop(match.group(1).lower(), None)
     
     def extract_current_company(self) -> Optional[Dict[str, str]]:
         """
         Extract current company information from LinkedIn profile.
         
+        Uses the positions captured from LinkedIn's API when the page is
+        watched (see watch_profile_api()), and walks the DOM otherwise.
+        Results are remembered per profile URL for the rest of the process.
+        
         Returns:
             Dictionary with 'name' and 'linkedin_url' keys, or None if not found.
             Returns {'name': None, 'linkedin_url': None, 'valid': False} if experience section exists
             but no valid company is found in the first experience entry.
         """
+        profile_key = self._profile_key(self.page.url)
+        with self._company_cache_lock:
+            if profile_key in self._company_cache:
+                self._company_cache.move_to_end(profile_key)
+                return dict(self._company_cache[profile_key])
+        
+        company_info = self._extract_current_company_uncached()
+        
+        # Only found companies are cached; a miss may just be a slow render
+        if company_info and company_info.get('valid'):
+            with self._company_cache_lock:
+                self._company_cache[profile_key] = dict(company_info)
+                if len(self._company_cache) > self.COMPANY_CACHE_SIZE:
+                    self._company_cache.popitem(last=False)
+        return company_info
+    
+    @staticmethod
+    def _profile_key(url: str) -> str:
+        """Profile URL without query, fragment, trailing slash or case differences."""
+        return url.split('?', 1)[0].split('#', 1)[0].rstrip('/').lower()
+    
+    def _extract_current_company_uncached(self) -> Optional[Dict[str, str]]:
+        """extract_current_company() without the per-profile cache."""
         try:
-            import traceback
-            import time
+            company_info = self._company_from_api()
+            if company_info:
+                return company_info
             
-            # Wait for experience section to load (with retries)
-            max_retries = 3
-            retry_delay = 2
+            # Wait until the experience section has rendered its company link (or an
+            # entry without one); resolves as soon as it does instead of sleeping
+            try:
+                self.page.wait_for_function(EXPERIENCE_READY_JS, arg=self.EXTRACT_COMPANY_ARG, timeout=5000)
+            except PWTimeout:
+                # Continue with whatever has rendered
+                pass
             
-            # Look for experience section - try multiple selectors
-            experience_selectors = [
-                '#experience',
-                '[data-section="experience"]',
-                'section[data-section="experience"]',
-                '.pvs-list__outer-container',
-                '.experience-section',
-                'div[id*="experience"]'
-            ]
+            # Walk the experience section in one page.evaluate() call
+            data = self._evaluate(EXTRACT_COMPANY_JS, self.EXTRACT_COMPANY_ARG)
             
+            company_info = self._company_from_page_data(data)
+            if company_info:
+                return company_info
+            
+            # No usable link: fall back to the text-based selectors below. They run
+            # offline on one snapshot of the page rather than a CDP call per query
+            soup = self._snapshot()
             company_info = None
             
-            # Retry logic for finding experience section
-            for attempt in range(max_retries):
-                # Wait a bit for dynamic content to load
-                if attempt > 0:
-                    time.sleep(retry_delay)
-                
-                # Try to wait for experience section to appear
-                try:
-                    # Wait for any of these selectors to appear
-                    self.page.wait_for_selector(
-                        '#experience, [data-section="experience"], section[data-section="experience"], .pvs-list__outer-container, .experience-section',
-                        timeout=5000,
-                        state="attached"
-                    )
-                except:
-                    # If wait times out, continue with search
-                    pass
+            # Look for experience section, trying the selectors in priority order
+            experience_section = next(
+                (match for match in (soup.select_one(selector) for selector in EXPERIENCE_SECTION_SELECTORS) if match),
+                None
+            )
+            if experience_section:
+                # An anchor like #experience sits beside the entry list, so search
+                # its enclosing <section> (same as extract.js)
+                if experience_section.name != 'section':
+                    experience_section = experience_section.find_parent('section') or experience_section
                 
-                for section_selector in experience_selectors:
-                    experience_section = self.page.query_selector(section_selector)
-                    if experience_section:
-                        # Look for the first (most recent) experience entry
-                        # Try multiple selectors for experience items
-                        experience_item_selectors = [
-                            '.pvs-list__paged-list-item',
-                            '.pvs-list__outer-container > ul > li',
-                            '.experience-item',
-                            'li[data-section="experience"]',
-                            'div[data-section="experience"] > ul > li',
-                            'section[data-section="experience"] ul > li'
-                        ]
-                        
-                        experience_items = []
-                        for item_selector in experience_item_selectors:
-                            if section_selector.startswith('#'):
-                                # ID selector - use directly
-                                items = self.page.query_selector_all(f'{section_selector} {item_selector}')
-                            else:
-                                # Class or attribute selector
-                                items = experience_section.query_selector_all(item_selector)
-                            
-                            if items:
-                                experience_items = items
-                                break
-                        
-                        if experience_items:
-                            # Get the first experience item (most recent)
-                            first_experience = experience_items[0]
-                            
-                            # Scroll the experience item into view to ensure it's fully loaded (reduced by 80%)
-                            try:
-                                first_experience.scroll_into_view_if_needed()
-                                self.page.wait_for_timeout(200)  # Reduced from 1000ms to 200ms (80% reduction)
-                            except:
-                                pass
-                            
-                            # Wait a moment for the experience item to fully render (reduced by 80%)
-                            try:
-                                # Wait for company link or text to appear in the experience item
-                                # Reduced timeout from 5000ms to 1000ms (80% reduction)
-                                first_experience.wait_for_selector('a[href*="/company/"], span.t-14, .t-normal, span[aria-hidden="true"]', timeout=1000, state="attached")
-                            except:
-                                # If wait times out, continue anyway
-                                pass
-                            
-                            # Try to expand "See more" if it exists (some profiles have collapsed experience)
-                            try:
-                                see_more_button = first_experience.query_selector('button:has-text("see more"), button:has-text("See more"), .inline-show-more-text__button')
-                                if see_more_button:
-                                    see_more_button.click()
-                                    self.page.wait_for_timeout(200)  # Reduced from 1000ms to 200ms (80% reduction)
-                            except:
-                                pass
-                            
-                            # Validate that this is a real experience entry
-                            # Check if it has meaningful content (not just empty or placeholder)
-                            experience_text = first_experience.inner_text().strip()
-                            
-                            # Skip if experience entry is too short or seems invalid
-                            if len(experience_text) < 10:
-                                # Experience section exists but first entry is invalid
-                                return {
-                                    'name': None,
-                                    'linkedin_url': None,
-                                    'valid': False,
-                                    'reason': 'First experience entry is too short or invalid'
-                                }
-                        
-                        # First, try to find company link directly (most reliable)
-                        # Try multiple ways to find company links
-                        company_link = None
-                        company_link_selectors = [
-                            'a[href*="/company/"]',
-                            'a[data-control-name="background_details_company"]',
-                            'a[data-field="experience_company_logo"][href*="/company/"]',
-                            'a[data-field="experience_company_logo"]',
-                            'a[href*="/company/"]:not([href*="/company/search"])',
-                            # Also check for links in image containers
-                            'a.optional-action-target-wrapper[href*="/company/"]',
-                            'a.pvs-entity__image-container[href*="/company/"]',
-                            'a[href*="/company/"] img',  # Parent of image with company link
-                        ]
-                        
-                        # Wait a bit and retry if not found immediately (for dynamic content)
-                        for attempt in range(3):
-                            for link_selector in company_link_selectors:
-                                try:
-                                    # Try to find the link
-                                    if 'img' in link_selector:
-                                        # Special case: find image with company link parent
-                                        images = first_experience.query_selector_all('img')
-                                        for img in images:
-                                            parent = img.evaluate_handle('el => el.closest("a[href*=\'/company/\']")')
-                                            if parent:
-                                                try:
-                                                    href = parent.get_attribute('href')
-                                                    if href and '/company/' in href and '/company/search' not in href:
-                                                        company_link = parent
-                                                        break
-                                                except:
-                                                    pass
-                                    else:
-                                        company_link = first_experience.query_selector(link_selector)
-                                    
-                                    if company_link:
-                                        # Verify it's visible and has a valid href
-                                        href = company_link.get_attribute('href')
-                                        if href and '/company/' in href and '/company/search' not in href:
-                                            # Scroll into view to ensure it's loaded (reduced by 80%)
-                                            try:
-                                                company_link.scroll_into_view_if_needed()
-                                                self.page.wait_for_timeout(100)  # Reduced from 500ms to 100ms (80% reduction)
-                                            except:
-                                                pass
-                                            break
-                                        else:
-                                            company_link = None
-                                except:
-                                    pass
-                            
-                            if company_link:
-                                break
-                            
-                            # Wait a bit before retrying (reduced by 80%)
-                            if attempt < 2:
-                                self.page.wait_for_timeout(200)  # Reduced from 1000ms to 200ms (80% reduction)
-                        
-                        # Also try searching in the entire experience section if not found in first item
-                        if not company_link:
-                            try:
-                                # Get all links in the experience section
-                                all_links = experience_section.query_selector_all('a[href*="/company/"]')
-                                if all_links:
-                                    # Get the first one that's actually in an experience entry
-                                    for link in all_links:
-                                        href = link.get_attribute('href')
-                                        if href and '/company/' in href and '/company/search' not in href:
-                                            # Check if it's in the first experience item or nearby
-                                            try:
-                                                # Check if link is within or near first_experience
-                                                link_in_experience = first_experience.evaluate_handle(
-                                                    'el => { const link = arguments[0]; return el.contains(link) || el.parentElement?.contains(link) || link.closest("li") === el || link.closest(".pvs-list__paged-list-item") === el; }',
-                                                    link
-                                                )
-                                                if link_in_experience:
-                                                    link.scroll_into_view_if_needed()
-                                                    self.page.wait_for_timeout(100)  # Reduced from 500ms to 100ms (80% reduction)
-                                                    company_link = link
-                                                    break
-                                            except:
-                                                # Fallback: just use the first valid company link
-                                                try:
-                                                    link.scroll_into_view_if_needed()
-                                                    self.page.wait_for_timeout(100)  # Reduced from 500ms to 100ms (80% reduction)
-                                                    company_link = link
-                                                    break
-                                                except:
-                                                    pass
-                            except:
-                                pass
-                        
-                        # Last resort: search the entire page for company links in experience context
-                        if not company_link:
-                            try:
-                                # Get all company links on the page
-                                page_company_links = self.page.query_selector_all('a[href*="/company/"]')
-                                for link in page_company_links:
-                                    href = link.get_attribute('href')
-                                    if href and '/company/' in href and '/company/search' not in href:
-                                        # Check if it's near the experience section
-                                        try:
-                                            # Check if link is visible and in the experience area
-                                            link.scroll_into_view_if_needed()
-                                            self.page.wait_for_timeout(60)  # Reduced from 300ms to 60ms (80% reduction)
-                                            # Use the first valid company link as fallback
-                                            company_link = link
-                                            break
-                                        except:
-                                            pass
-                            except:
-                                pass
-                        
-                        if company_link:
-                            href = company_link.get_attribute('href')
-                            company_url = href if href and href.startswith('http') else f"https://www.linkedin.com{href}" if href else None
-                            
-                            # Try to get company name from the link's text or nearby elements
-                            company_name = None
-                            
-                            # Method 1: Get text directly from the link
-                            link_text = company_link.inner_text().strip()
-                            
-                            # If link has no text (common with logo links), try to get alt text or title
-                            if not link_text or len(link_text) < 2:
-                                try:
-                                    # Check for image with alt text
-                                    img = company_link.query_selector('img')
-                                    if img:
-                                        link_text = img.get_attribute('alt') or img.get_attribute('title') or ''
-                                    # Check for aria-label
-                                    if not link_text:
-                                        link_text = company_link.get_attribute('aria-label') or ''
-                                except:
-                                    pass
-                            
-                            if link_text:
-                                # Clean up the text - might contain "· Full-time" or other metadata
-                                company_name = self._extract_company_name_from_text(link_text)
+                # Look for the first (most recent) experience entry; matches come
+                # back in document order, so the first one is the latest
+                first_experience = experience_section.select_one(EXPERIENCE_ITEM_SELECTOR)
+                if first_experience:
+                    # Validate that this is a real experience entry
+                    # Check if it has meaningful content (not just empty or placeholder)
+                    experience_text = self._text(first_experience)
+                    
+                    # Skip if experience entry is too short or seems invalid
+                    if len(experience_text) < 10:
+                        # Experience section exists but first entry is invalid
+                        return {
+                            'name': None,
+                            'linkedin_url': None,
+                            'valid': False,
+                            'reason': 'First experience entry is too short or invalid'
+                        }
+                    
+                    # Company links of the entry, looked up once for the passes below
+                    entry_links = self._company_links(soup, first_experience)
+                    
+                    # If not found via link, try selectors
+                    for company_selector in self.COMPANY_SELECTORS:
+                        company_element = first_experience.select_one(company_selector)
+                        if company_element:
+                            raw_text = self._text(company_element)
+                            # Extract company name from text (handles "Company · Full-time" format)
+                            company_name = self._extract_company_name_from_text(raw_text)
                             
-                            # Method 2: If link text doesn't work, look for company name in nearby spans
+                            # If extraction didn't work, try the raw text
                             if not company_name or len(company_name) < 2:
-                                # Look for span.t-14.t-normal that contains company name
-                                try:
-                                    # Scroll to ensure visibility (reduced by 80%)
-                                    company_link.scroll_into_view_if_needed()
-                                    self.page.wait_for_timeout(100)  # Reduced from 500ms to 100ms (80% reduction)
-                                    
-                                    # Try within the link first
-                                    nearby_spans = company_link.query_selector_all('span.t-14.t-normal span[aria-hidden="true"], span.t-14.t-normal, span[aria-hidden="true"]')
-                                    if not nearby_spans:
-                                        # Try parent/ancestor elements - use multiple parent selectors
-                                        parent_selectors = [
-                                            'div.display-flex.flex-column',
-                                            'div.display-flex',
-                                            'div.pvs-entity__sub-components-container',
-                                            'div.pvs-list__outer-container',
-                                            'li.pvs-list__paged-list-item',
-                                            'div'
-                                        ]
-                                        for parent_selector in parent_selectors:
-                                            try:
-                                                parent = company_link.evaluate_handle(f'el => el.closest("{parent_selector}")')
-                                                if parent:
-                                                    nearby_spans = parent.query_selector_all('span.t-14.t-normal span[aria-hidden="true"], span.t-14.t-normal, span[aria-hidden="true"]')
-                                                    if nearby_spans:
-                                                        break
-                                            except:
-                                                continue
-                                    
-                                    for span in nearby_spans:
-                                        try:
-                                            span.scroll_into_view_if_needed()
-                                            self.page.wait_for_timeout(50)  # Small wait for visibility (reduced)
-                                            span_text = span.inner_text().strip()
-                                            if span_text:
-                                                # Check if this looks like a company name (not a date, duration, etc.)
-                                                if '·' in span_text or (len(span_text) > 3 and not re.match(r'^\d{4}', span_text)):
-                                                    extracted_name = self._extract_company_name_from_text(span_text)
-                                                    if extracted_name and len(extracted_name) > 2:
-                                                        company_name = extracted_name
-                                                        break
-                                        except:
-                                            continue
-                                except:
-                                    pass
+                                company_name = raw_text
                             
-                            # Method 3: Look for any text node near the company link
-                            if not company_name or len(company_name) < 2:
-                                # Get parent container and search for company name text
-                                try:
-                                    # Try multiple parent selectors
-                                    parent_selectors = [
-                                        'div.display-flex.flex-column',
-                                        'div.display-flex',
-                                        'div.pvs-entity__sub-components-container',
-                                        'div'
-                                    ]
-                                    for parent_selector in parent_selectors:
-                                        try:
-                                            parent_container = company_link.evaluate_handle(f'el => el.closest("{parent_selector}")')
-                                            if parent_container:
-                                                all_text_elements = parent_container.query_selector_all('span[aria-hidden="true"]')
-                                                for elem in all_text_elements:
-                                                    try:
-                                                        elem.scroll_into_view_if_needed()
-                                                        text = elem.inner_text().strip()
-                                                        if text and ('·' in text or len(text) > 3):
-                                                            # Text like "Lighty AI · Full-time" or just company name
-                                                            extracted_name = self._extract_company_name_from_text(text)
-                                                            if extracted_name and len(extracted_name) > 2:
-                                                                company_name = extracted_name
-                                                                break
-                                                    except:
-                                                        continue
-                                                if company_name:
-                                                    break
-                                        except:
-                                            continue
-                                except:
-                                    pass
+                            # Filter out common non-company text
+                            if company_name in ('See more', 'See less'):
+                                continue
                             
-                            # Method 4: If still no name, use link text as-is (fallback)
-                            if not company_name or len(company_name) < 2:
-                                if link_text and len(link_text) > 1:
-                                    # Use raw link text as last resort
-                                    company_name = link_text.strip()
+                            # Try to get LinkedIn URL
+                            company_href = None
                             
-                            # Validate company name
-                            if company_name and len(company_name) > 1:
-                                # Check if it's not metadata
-                                invalid_patterns = [
-                                    r'^\d{4}',  # Starts with year
-                                    r'^\d+\s*(yr|year|month)',  # Duration
-                                    r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',  # Month
-                                    r'^Present$',  # Just "Present"
-                                    r'^Full-time$',  # Employment type
-                                    r'^Part-time$',
-                                    r'^Contract$',
-                                    r'^Internship$',
-                                ]
-                                
-                                is_valid = True
-                                for pattern in invalid_patterns:
-                                    if re.match(pattern, company_name, re.IGNORECASE):
-                                        is_valid = False
-                                        break
-                                
-                                # If we have a company URL, we can be more lenient with the name
-                                # Always set company_info if we have a URL, even if name validation fails
-                                if company_url:
-                                    # Use the cleaned name if valid, otherwise try to extract from link text or use a placeholder
-                                    final_name = company_name if is_valid else None
-                                    if not final_name or len(final_name) < 2:
-                                        # Try to extract from link text one more time
-                                        if link_text:
-                                            final_name = self._extract_company_name_from_text(link_text)
-                                        if not final_name or len(final_name) < 2:
-                                            # Last resort: use link text as-is if it's reasonable
-                                            final_name = link_text.strip() if link_text and len(link_text) < 50 else "Company"
-                                    
-                                    company_info = {
-                                        'name': final_name,
-                                        'linkedin_url': company_url,
-                                        'valid': True
-                                    }
-                                elif is_valid and company_name:
-                                    # We have a valid name but no URL - still use it
-                                    company_info = {
-                                        'name': company_name,
-                                        'linkedin_url': None,
-                                        'valid': True
-                                    }
-                        
-                        # If not found via link, try text-based selectors
-                        if not company_info:
-                            # Try to find company name - updated selectors based on current LinkedIn structure
-                            company_selectors = [
-                                # Modern LinkedIn selectors (2024+) - based on the HTML structure provided
-                                'span.t-14.t-normal span[aria-hidden="true"]',  # Company name in experience
-                                'span.t-14 span[aria-hidden="true"]',
-                                'div.t-14.t-normal span[aria-hidden="true"]',
-                                'a[data-control-name="background_details_company"]',
-                                'a[data-field="experience_company_logo"]',
-                                # Alternative selectors
-                                '.t-14.t-normal a[href*="/company/"]',
-                                '.t-14 a[href*="/company/"]',
-                                'span.t-14.t-normal',
-                                '.entity-result__title-text a',
-                                '.pv-entity__secondary-title',
-                                '.pv-entity__secondary-title a',
-                                # New selectors for modern LinkedIn
-                                'div.pvs-entity__sub-components-container a[href*="/company/"]',
-                                'div.pvs-entity__sub-components-container span[aria-hidden="true"]',
-                                'div.pvs-entity__sub-components-container .t-normal',
-                                'div.pvs-list__outer-container a[href*="/company/"]',
-                                # Generic fallbacks
-                                'a[href*="company"]',
-                                'span[aria-hidden="true"]'
-                            ]
-                        
-                        # If not found via link, try selectors
-                        if not company_info:
-                            found_company_name = False
-                            for company_selector in company_selectors:
-                                company_element = first_experience.query_selector(company_selector)
-                                if company_element:
-                                    raw_text = company_element.inner_text().strip()
-                                    # Extract company name from text (handles "Company · Full-time" format)
-                                    company_name = self._extract_company_name_from_text(raw_text)
-                                    
-                                    # If extraction didn't work, try the raw text
-                                    if not company_name or len(company_name) < 2:
-                                        company_name = raw_text
-                                    
-                                    # Filter out common non-company text
-                                    if company_name and len(company_name) > 1 and company_name not in ['Full-time', 'Part-time', 'Contract', 'Internship', 'See more', 'See less']:
-                                        # Additional validation: company name should be reasonable
-                                        invalid_patterns = [
-                                            r'^\d{4}',  # Starts with year
-                                            r'^\d+\s*(yr|year|month)',  # Duration
-                                            r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',  # Month
-                                            r'^Present$',  # Just "Present"
-                                            r'^Full-time$',  # Employment type
-                                            r'^Part-time$',
-                                            r'^Contract$',
-                                            r'^Internship$',
-                                        ]
-                                        
-                                        is_valid = True
-                                        for pattern in invalid_patterns:
-                                            if re.match(pattern, company_name, re.IGNORECASE):
-                                                is_valid = False
-                                                break
-                                        
-                                        if not is_valid:
-                                            continue
-                                        
-                                        found_company_name = True
-                                        
-                                        # Try to get LinkedIn URL
-                                        company_url = None
-                                        
-                                        # Check if the element itself is a link
-                                        if company_element.tag_name().lower() == 'a':
-                                            href = company_element.get_attribute('href')
-                                            if href and '/company/' in href:
-                                                company_url = href if href.startswith('http') else f"https://www.linkedin.com{href}"
-                                        else:
-                                            # Look for a link within the experience item
-                                            company_link = company_element.query_selector('a[href*="/company/"]')
-                                            if not company_link:
-                                                company_link = first_experience.query_selector('a[href*="/company/"]')
-                                            
-                                            if company_link:
-                                                href = company_link.get_attribute('href')
-                                                if href and '/company/' in href:
-                                                    company_url = href if href.startswith('http') else f"https://www.linkedin.com{href}"
-                                        
-                                        # If we found a company name, use it (even without URL)
-                                        if company_name:
-                                            company_info = {
-                                                'name': company_name,
-                                                'linkedin_url': company_url,
-                                                'valid': True
-                                            }
-                                            break
-                        
-                        # Additional fallback: Look for any text that looks like a company name in the experience item
-                        if not company_info:
-                            # Get all text from the experience item and look for patterns
-                            experience_html = first_experience.inner_html()
-                            experience_text = first_experience.inner_text()
+                            # Check if the element itself is a link
+                            if company_element.name == 'a':
+                                company_href = company_element.get('href')
+                            elif entry_links:
+                                # Look for a link within the element, else the experience item
+                                # (skipped when the item has no company links at all)
+                                company_link = company_element.select_one('a[href*="/company/"]') or entry_links[0]
+                                company_href = company_link.get('href')
                             
-                            # Try to find company name by looking for text near company links or in structured format
-                            # Look for text that appears after job title but before dates
-                            try:
-                                # Try to extract from structured data
-                                all_links = first_experience.query_selector_all('a')
-                                for link in all_links:
-                                    href = link.get_attribute('href')
-                                    if href and '/company/' in href:
-                                        link_text = link.inner_text().strip()
-                                        if link_text and len(link_text) > 1:
-                                            # Validate it's not metadata
-                                            invalid = False
-                                            for pattern in [r'^\d{4}', r'^\d+\s*(yr|year|month)', r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', r'^Present$', r'^Full-time$', r'^Part-time$']:
-                                                if re.match(pattern, link_text, re.IGNORECASE):
-                                                    invalid = True
-                                                    break
-                                            if not invalid:
-                                                company_url = href if href.startswith('http') else f"https://www.linkedin.com{href}"
-                                                company_info = {
-                                                    'name': link_text,
-                                                    'linkedin_url': company_url,
-                                                    'valid': True
-                                                }
-                                                break
-                            except:
-                                pass
-                        
-                        # Only mark as invalid if we really couldn't find anything and experience section exists
-                        if not company_info and experience_section and len(experience_text) > 10:
-                            # Experience exists but we couldn't extract company - try one more time with broader search
-                            # Look for company links anywhere in the experience section
-                            all_company_links = experience_section.query_selector_all('a[href*="/company/"]')
-                            if all_company_links:
-                                # Use the first company link found
-                                first_company_link = all_company_links[0]
-                                company_name = first_company_link.inner_text().strip()
-                                href = first_company_link.get_attribute('href')
-                                company_url = href if href and href.startswith('http') else f"https://www.linkedin.com{href}" if href else None
-                                
-                                if company_name and len(company_name) > 1:
-                                    # Final validation
-                                    invalid = False
-                                    for pattern in [r'^\d{4}', r'^\d+\s*(yr|year|month)', r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', r'^Present$', r'^Full-time$', r'^Part-time$']:
-                                        if re.match(pattern, company_name, re.IGNORECASE):
-                                            invalid = True
-                                            break
-                                    if not invalid:
-                                        company_info = {
-                                            'name': company_name,
-                                            'linkedin_url': company_url,
-                                            'valid': True
-                                        }
-                        
-                        # Only mark as invalid if we still couldn't find anything
-                        if not company_info and experience_section:
-                            # Check if experience entry has substantial content
-                            if len(experience_text) < 10:
-                                return {
-                                    'name': None,
-                                    'linkedin_url': None,
-                                    'valid': False,
-                                    'reason': 'First experience entry is too short or invalid'
-                                }
-                            else:
-                                # Experience exists with content but no company found - might be self-employed, consultant, etc.
-                                # Don't mark as invalid, just return None
-                                return None
-                        
-                        if company_info:
-                            break
-                
-                # If we found company info, break out of retry loop
-                if company_info:
-                    break
+                            # If we found a valid company name, use it (even without URL)
+                            company_info = self._validate_and_build(
+                                company_name,
+                                company_href if company_href and '/company/' in company_href else None
+                            )
+                            if company_info:
+                                break
+                    
+                    # Additional fallback: Look for any text that looks like a company name in the experience item
+                    if not company_info:
+                        # Try to find company name by looking for text near company links or in structured format
+                        # Look for text that appears after job title but before dates
+                        for link in entry_links:
+                            href = link.get('href')
+                            if href:
+                                company_info = self._validate_and_build(self._text(link), href)
+                                if company_info:
+                                    break
+                    
+                    # Only mark as invalid if we really couldn't find anything and experience section exists
+                    if not company_info and experience_section and len(experience_text) > 10:
+                        # Experience exists but we couldn't extract company - try one more time with broader search
+                        # Look for company links anywhere in the experience section
+                        all_company_links = self._company_links(soup, experience_section)
+                        if all_company_links:
+                            # Use the first company link found
+                            first_company_link = all_company_links[0]
+                            company_info = self._validate_and_build(
+                                self._text(first_company_link),
+                                first_company_link.get('href')
+                            )
+                    
+                    # Only mark as invalid if we still couldn't find anything
+                    if not company_info and experience_section:
+                        # Check if experience entry has substantial content
+                        if len(experience_text) < 10:
+                            return {
+                                'name': None,
+                                'linkedin_url': None,
+                                'valid': False,
+                                'reason': 'First experience entry is too short or invalid'
+                            }
+                        else:
+                            # Experience exists with content but no company found - might be self-employed, consultant, etc.
+                            # Don't mark as invalid, just return None
+                            return None
             
             # Additional fallback: Look for company in the main profile section
             if not company_info:
                 # Try to find company link anywhere on the page
-                company_links = self.page.query_selector_all('a[href*="/company/"]')
+                company_links = self._company_links(soup, soup)
                 if company_links:
                     # Get the first company link (likely the current one)
                     first_company_link = company_links[0]
-                    company_name = first_company_link.inner_text().strip()
-                    href = first_company_link.get_attribute('href')
-                    company_url = href if href and href.startswith('http') else f"https://www.linkedin.com{href}" if href else None
+                    company_name = self._text(first_company_link)
                     
                     if company_name and len(company_name) > 1:
                         company_info = {
                             'name': company_name,
-                            'linkedin_url': company_url,
+                            'linkedin_url': self._absolute_url(first_company_link.get('href')),
                             'valid': True
                         }
             
@@ -651,12 +545,221 @@ class UserExtractor:
             return company_info
             
         except Exception as e:
-            print(f"Error extracting company: {e}")
-            import traceback
-            traceback.print_exc()
+            log.warning("extract_current_company failed: %s", e, exc_info=True)
+            return None
+    
+    def _evaluate(self, script: str, arg=None):
+        """
+        page.evaluate(), retried when LinkedIn re-renders the page under it.
+        
+        Only a destroyed execution context (client-side navigation mid-call) is
+        retried; a missing company is a real answer and comes back as data.
+        """
+        for attempt in range(self.EVALUATE_ATTEMPTS):
+            try:
+                return self.page.evaluate(script, arg)
+            except PWError as e:
+                if 'Execution context was destroyed' not in str(e) or attempt == self.EVALUATE_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.25 * 2 ** attempt)
+    
+    def _snapshot(self) -> BeautifulSoup:
+        """
+        Parse the current page body once for offline selector queries.
+        
+        Only the visible markup is transferred and parsed (see SNAPSHOT_JS);
+        the fallback selectors never look at scripts or the embedded JSON.
+        """
+        soup = BeautifulSoup(self._evaluate(SNAPSHOT_JS), 'lxml')
+        self._qs_cache = {}
+        return soup
+    
+    def _qsa(self, root: Tag, selector: str) -> List[Tag]:
+        """
+        root.select(selector), memoized for the current snapshot.
+        
+        The fallbacks in extract_current_company look up the same company
+        links on the same roots more than once.
+        """
+        key = (id(root), selector)
+        if key not in self._qs_cache:
+            self._qs_cache[key] = root.select(selector)
+        return self._qs_cache[key]
+    
+    def _company_links(self, soup: BeautifulSoup, root: Tag) -> List[Tag]:
+        """
+        Company links inside root, in document order.
+        
+        The page is scanned for company links once; section and entry lists
+        are filtered from that scan instead of walking each subtree again.
+        """
+        page_links = self._qsa(soup, 'a[href*="/company/"]')
+        if root is soup:
+            return page_links
+        key = (id(root), 'company-links')
+        if key not in self._qs_cache:
+            self._qs_cache[key] = [
+                link for link in page_links
+                if any(parent is root for parent in link.parents)
+            ]
+        return self._qs_cache[key]
+    
+    @staticmethod
+    def _text(element: Tag) -> str:
+        """Whitespace-normalised text of a parsed element."""
+        return element.get_text(' ', strip=True)
+    
+    @classmethod
+    def _company_from_page_data(cls, data: Dict) -> Optional[Dict[str, str]]:
+        """
+        Interpret the output of EXTRACT_COMPANY_JS.
+        
+        Args:
+            data: Dictionary returned by evaluating EXTRACT_COMPANY_JS
+            
+        Returns:
+            Same dictionary as extract_current_company(), or None if the
+            page has no usable company link
+        """
+        # Skip if the first experience entry is too short or seems invalid
+        if data['hasFirstExperience'] and len(data['experienceText']) < 10:
+            return {
+                'name': None,
+                'linkedin_url': None,
+                'valid': False,
+                'reason': 'First experience entry is too short or invalid'
+            }
+        
+        # Company link found: name it from the link and its surroundings
+        if data['href']:
+            return cls._company_from_link_data(data)
+        
+        return None
+    
+    @classmethod
+    def _company_from_link_data(cls, data: Dict) -> Optional[Dict[str, str]]:
+        """
+        Name the company behind the link found by EXTRACT_COMPANY_JS.
+        
+        Args:
+            data: Dictionary returned by evaluating EXTRACT_COMPANY_JS
+            
+        Returns:
+            Company info dictionary, or None if no name could be found
+        """
+        company_url = cls._absolute_url(data['href'])
+        
+        # If link has no text (common with logo links), use the logo's alt text or the aria-label
+        link_text = data['linkText']
+        if not link_text or len(link_text) < 2:
+            link_text = data['linkAlt'] or data['linkAria']
+        
+        # Each method only runs when the ones before it found nothing
+        company_name = (
+            # Method 1: Link text, cleaned of metadata like "· Full-time"
+            cls._name_from_link_text(link_text)
+            # Method 2: Nearby spans that look like a company name (not a date, duration, etc.)
+            or cls._name_from_texts(data['nearbyTexts'], cls._looks_like_company_span)
+            # Method 3: Any text near the company link, e.g. "Lighty AI · Full-time"
+            or cls._name_from_texts(data['contextTexts'], cls._looks_like_company_text)
+            # Method 4: Raw link text as last resort
+            or (link_text.strip() if link_text and len(link_text) > 1 else None)
+        )
+        
+        if not company_name or len(company_name) < 2:
             return None
+        
+        # We have a company URL, so be lenient with the name: use the cleaned name
+        # if it isn't metadata, otherwise fall back to the link text or a placeholder
+        final_name = None if cls._is_invalid_company_name(company_name) else company_name
+        if not final_name or len(final_name) < 2:
+            # Try to extract from link text one more time
+            if link_text:
+                final_name = cls._extract_company_name_from_text(link_text)
+            if not final_name or len(final_name) < 2:
+                # Last resort: use link text as-is if it's reasonable
+                final_name = link_text.strip() if link_text and len(link_text) < 50 else "Company"
+        
+        return {
+            'name': final_name,
+            'linkedin_url': company_url,
+            'valid': True
+        }
     
-    def _extract_company_name_from_text(self, text: str) -> Optional[str]:
+    @classmethod
+    def _is_invalid_company_name(cls, name: str) -> bool:
+        """True if name is a date, duration or employment type rather than a company."""
+        low = name.lower()
+        if low in cls.INVALID_EXACT_NAMES or low.startswith(cls.MONTH_PREFIXES):
+            return True
+        if not low[:1].isdecimal():
+            return False
+        # Starts with a year, or is a duration
+        return cls._starts_with_year(low) or bool(cls.DURATION_RE.match(low))
+    
+    @classmethod
+    def _validate_and_build(cls, name: Optional[str], href: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Company info for a name and company link, unless the name is unusable.
+        
+        Args:
+            name: Candidate company name
+            href: Company link href (relative or absolute), or None
+            
+        Returns:
+            Company info dictionary, or None if the name is too short or is
+            metadata (a date, duration or employment type)
+        """
+        if not name or len(name) < 2 or cls._is_invalid_company_name(name):
+            return None
+        return {
+            'name': name,
+            'linkedin_url': cls._absolute_url(href),
+            'valid': True
+        }
+    
+    @staticmethod
+    def _absolute_url(href: Optional[str]) -> Optional[str]:
+        """LinkedIn href made absolute (None stays None)."""
+        if not href:
+            return None
+        return href if href.startswith('http') else f"https://www.linkedin.com{href}"
+    
+    @staticmethod
+    def _starts_with_year(text: str) -> bool:
+        """True for text like "2021 - Present" (a date range, not a company)."""
+        return len(text) >= 4 and text[:4].isdecimal()
+    
+    @staticmethod
+    def _looks_like_company_text(text: str) -> bool:
+        """Method 3 filter: "Company · Full-time" style text, or anything longer than 3 chars."""
+        return '·' in text or len(text) > 3
+    
+    @classmethod
+    def _looks_like_company_span(cls, text: str) -> bool:
+        """Method 2 filter: like _looks_like_company_text, but not a date range."""
+        return '·' in text or (len(text) > 3 and not cls._starts_with_year(text))
+    
+    @classmethod
+    def _name_from_link_text(cls, link_text: Optional[str]) -> Optional[str]:
+        """Cleaned company name from link text, or None if it is too short."""
+        if not link_text:
+            return None
+        company_name = cls._extract_company_name_from_text(link_text)
+        return company_name if company_name and len(company_name) >= 2 else None
+    
+    @classmethod
+    def _name_from_texts(cls, texts: List[str], looks_like_company) -> Optional[str]:
+        """First cleaned company name among texts accepted by looks_like_company."""
+        for text in texts:
+            if text and looks_like_company(text):
+                extracted_name = cls._extract_company_name_from_text(text)
+                if extracted_name and len(extracted_name) > 2:
+                    return extracted_name
+        return None
+    
+    @staticmethod
+    def _extract_company_name_from_text(text: str) -> Optional[str]:
         """
         Extract company name from text that may contain metadata like "· Full-time".
         
@@ -669,58 +772,128 @@ class UserExtractor:
         if not text:
             return None
         
-        # Remove common metadata patterns
-        # Examples: "Lighty AI · Full-time", "Company Name · Part-time", etc.
         text = text.strip()
+        # Cheap rejects before any splitting: too short, or a bare employment type
+        if len(text) < 2 or text.lower() in UserExtractor.EMPLOYMENT_TYPES:
+            return None
         
-        # Split by "·" and take the first part (usually the company name)
-        if '·' in text:
-            parts = text.split('·')
-            text = parts[0].strip()
+        # Everything from the first "·" or "-" on is metadata
+        # Examples: "Lighty AI · Full-time", "Company Name - Contract"
+        text = text.split('·', 1)[0].split('-', 1)[0]
         
-        # Remove common suffixes
-        text = re.sub(r'\s*·\s*.*$', '', text)  # Remove everything after ·
-        text = re.sub(r'\s*-\s*.*$', '', text)  # Remove everything after -
+        # Remove employment type keywords wherever they appear
+        text = UserExtractor.EMPLOYMENT_TYPE_RE.sub('', text).strip()
         
-        # Remove employment type keywords if they appear
-        employment_types = ['Full-time', 'Part-time', 'Contract', 'Internship', 'Self-employed', 'Freelance']
-        for emp_type in employment_types:
-            if text.endswith(emp_type):
-                text = text[:-len(emp_type)].strip()
-            # Also check if it's in the middle
-            text = re.sub(rf'\s*{re.escape(emp_type)}\s*', '', text, flags=re.IGNORECASE)
+        # Validate it's not just metadata (a date, duration, etc.)
+        if len(text) < 2 or UserExtractor._is_invalid_company_name(text):
+            return None
         
-        # Clean up any remaining separators
-        text = text.strip('·').strip('-').strip()
+        return text
+    
+    def extract_bundled(self) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Extract all user information with a single page.evaluate() call.
         
-        # Validate it's not just metadata
-        if not text or len(text) < 2:
+        Returns:
+            Same dictionary as extract_all(), or None if the bundle could not
+            find the name and company (caller should fall back to the
+            per-field extraction methods)
+        """
+        try:
+            data = self._evaluate(EXTRACT_JS, self.EXTRACT_ARG)
+        except Exception as e:
+            log.warning("extraction bundle failed: %s", e)
             return None
         
-        # Check if it's a valid company name (not a date, duration, etc.)
-        invalid_patterns = [
-            r'^\d{4}',  # Starts with year
-            r'^\d+\s*(yr|year|month)',  # Duration
-            r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',  # Month
-            r'^Present$',  # Just "Present"
-        ]
+        return self.parse_bundle(data)
+    
+    @classmethod
+    def parse_bundle(cls, data: Dict) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Turn the raw output of the extraction bundle into extract_all() format.
         
-        for pattern in invalid_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return None
+        Args:
+            data: Dictionary returned by evaluating EXTRACT_JS on a profile page
+            
+        Returns:
+            Same dictionary as extract_all(), or None if name or company is missing
+        """
+        name = data.get('name')
+        if not name:
+            return None
+        
+        # Experience section exists but first entry is invalid
+        if data.get('hasExperience') and data.get('experienceText') is not None and 0 < len(data['experienceText']) < 10:
+            return {
+                'name': name,
+                'company_name': None,
+                'company_linkedin_url': None,
+                'valid_experience': False,
+                'experience_reason': 'First experience entry is too short or invalid'
+            }
+        
+        href = data.get('companyHref')
+        if not href:
+            return None
+        
+        link_text = data.get('companyText') or data.get('companyAlt') or data.get('companyAriaLabel') or ''
+        company_name = cls._extract_company_name_from_text(link_text)
+        if not company_name:
+            return None
         
-        return text if text else None
+        return {
+            'name': name,
+            'company_name': company_name,
+            'company_linkedin_url': href if href.startswith('http') else f"https://www.linkedin.com{href}",
+            'valid_experience': True,
+            'experience_reason': None
+        }
     
     def extract_all(self) -> Dict[str, Optional[str]]:
         """
         Extract all user information.
         
+        Uses the company captured from LinkedIn's API when there is one, then
+        tries the single-roundtrip extraction bundle; the per-field
+        extract_name()/extract_current_company() path is only used as a
+        fallback when the bundle misses. A page without a name (auth wall,
+        999 block, removed profile) skips the company lookup altogether.
+        
         Returns:
             Dictionary with 'name' and 'company' information, including 'valid_experience' flag
         """
+        company = self._company_from_api()
+        if company:
+            return self.combine(self.extract_name(), company)
+        
+        bundled = self.extract_bundled()
+        if bundled:
+            return bundled
+        
         name = self.extract_name()
-        company = self.extract_current_company()
+        if not name:
+            return {
+                'name': None,
+                'company_name': None,
+                'company_linkedin_url': None,
+                'valid_experience': False,
+                'experience_reason': 'Profile blocked or unavailable'
+            }
+        
+        return self.combine(name, self.extract_current_company())
+    
+    @staticmethod
+    def combine(name: Optional[str], company: Optional[Dict[str, str]]) -> Dict[str, Optional[str]]:
+        """
+        Merge extract_name() and extract_current_company() results into extract_all() format.
         
+        Args:
+            name: User's name
+            company: Company info dictionary, or None
+            
+        Returns:
+            Dictionary with 'name' and 'company' information, including 'valid_experience' flag
+        """
         # Check if experience is valid
         valid_experience = True
         if company and company.get('valid') is False:
@@ -734,3 +907,61 @@ class UserExtractor:
             'experience_reason': company.get('reason') if company and not company.get('valid') else None
         }
 
+
+class AsyncUserExtractor:
+    """Async counterpart of UserExtractor, for async Playwright pages."""
+    
+    def __init__(self, page: AsyncPage):
+        """
+        Initialize async user extractor.
+        
+        Args:
+            page: Async Page object with LinkedIn profile loaded
+        """
+        self.page = page
+    
+    async def extract_name(self) -> Optional[str]:
+        """
+        Extract user's name from LinkedIn profile.
+        
+        Returns:
+            User's name or None if not found
+        """
+        try:
+            data = await self.page.evaluate(EXTRACT_NAME_JS, NAME_SELECTORS)
+            return UserExtractor._name_from_page_data(data)
+            
+        except Exception as e:
+            log.warning("extract_name failed: %s", e)
+            return None
+    
+    async def extract_current_company(self) -> Optional[Dict[str, str]]:
+        """
+        Extract current company information from LinkedIn profile.
+        
+        Returns:
+            Same dictionary as UserExtractor.extract_current_company()
+        """
+        try:
+            try:
+                await self.page.wait_for_function(EXPERIENCE_READY_JS, arg=UserExtractor.EXTRACT_COMPANY_ARG, timeout=5000)
+            except AsyncPWTimeout:
+                # Continue with whatever has rendered
+                pass
+            
+            data = await self.page.evaluate(EXTRACT_COMPANY_JS, UserExtractor.EXTRACT_COMPANY_ARG)
+            return UserExtractor._company_from_page_data(data)
+            
+        except Exception as e:
+            log.warning("extract_current_company failed: %s", e)
+            return None
+    
+    async def extract_all(self) -> Dict[str, Optional[str]]:
+        """
+        Extract all user information, running the name and company lookups concurrently.
+        
+        Returns:
+            Same dictionary as UserExtractor.extract_all()
+        """
+        name, company = await asyncio.gather(self.extract_name(), self.extract_current_company())
+        return UserExtractor.combine(name, company)
@@ -1,38 +1,163 @@
 """Step 4: Company Navigator Module
 Navigates to company LinkedIn page and extracts website URL."""
-from typing import Optional
-from playwright.sync_api import Page, BrowserContext
+from typing import Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from playwright.sync_api import Page, BrowserContext, TimeoutError as PWTimeout
+from playwright.async_api import Page as AsyncPage, TimeoutError as AsyncPWTimeout
 from urllib.parse import urlparse, parse_qs, unquote
-import time
+from pathlib import Path
 import re
+import logging
+import threading
+
+
+log = logging.getLogger(__name__)
+
+
+# Website candidate collection behind extract_company_website (see extract_website.js)
+EXTRACT_WEBSITE_JS = (Path(__file__).parent / 'extract_website.js').read_text()
 
 
 class CompanyNavigator:
     """Handles navigation to company pages and website extraction."""
     
-    def __init__(self, context: BrowserContext):
+    # One navigator per worker thread; no per-instance __dict__
+    __slots__ = ('context', 'page_pool')
+    
+    # URL checks used on every candidate link, each one pattern instead of a
+    # substring scan per entry (same matches as the original substring lists)
+    LINKEDIN_REDIRECT_RE = re.compile(r'linkedin\.com/(?:redir|click|outbound)')
+    REDIRECT_SERVICE_RE = re.compile(r'bing\.com|google\.com/url|t\.co|bit\.ly', re.IGNORECASE)
+    REDIRECT_OR_LINKEDIN_RE = re.compile(r'linkedin\.com|bing\.com|google\.com/url|t\.co|bit\.ly', re.IGNORECASE)
+    VALID_DOMAIN_RE = re.compile(r'\.(?:com|co|io|org|net|ai|dev|edu|gov)')
+    NOT_COMPANY_SITE_RE = re.compile(
+        r'linkedin\.com|facebook\.com|twitter\.com|instagram\.com'
+        r'|bing\.com|google\.com/url|t\.co|bit\.ly|tinyurl',
+        re.IGNORECASE
+    )
+    # Query parameters that carry the destination of a LinkedIn redirect, and of
+    # other redirect services, in the order they are tried
+    LINKEDIN_REDIRECT_PARAMS = ('url', 'redirectUrl', 'target', 'destination', 'redirect')
+    REDIRECT_SERVICE_PARAMS = ('url', 'q', 'u', 'link', 'destination', 'target', 'r')
+    # Link container text hinting at a URL (scoring) or at a company section (last resort)
+    URL_TEXT_KEYWORDS = ('http', 'www')
+    PAGE_LINK_KEYWORDS = ('website', 'web', 'company', 'about', 'visit')
+    # Subdomains that aren't the main website (news., blog., ...)
+    PENALIZED_SUBDOMAINS = tuple(f'{sub}.' for sub in ('news', 'blog', 'careers', 'jobs', 'support', 'help', 'docs', 'api'))
+    
+    # Argument for EXTRACT_WEBSITE_JS: the selector lists each fallback tries, in order
+    EXTRACT_WEBSITE_ARG = {
+        # Overview section under the About tab
+        'overviewSelectors': [
+            'section[data-section="about"]',
+            'div[data-test-id="about-us"]',
+            '.about-us',
+            'div[class*="about"]',
+            'section[class*="about"]'
+        ],
+        # Website link - updated for current LinkedIn structure
+        'websiteSelectors': [
+            # Modern LinkedIn selectors
+            'a[data-control-name="company_details_website"]',
+            'a[data-tracking-control-name="company_details_website"]',
+            'a[href*="website"]',
+            # Company info section selectors (About page)
+            'section[data-section="about"] a[href^="http"]:not([href*="linkedin"])',
+            'div[data-test-id="about-us"] a[href^="http"]:not([href*="linkedin"])',
+            '.org-top-card-summary-info-list__info-item a[href^="http"]',
+            '.org-top-card-summary-info-list a[href^="http"]',
+            '.top-card-layout__entity-info a[href^="http"]:not([href*="linkedin"])',
+            '.company-page__website a',
+            # Alternative selectors
+            '.about-us a[href^="http"]',
+            # Generic external links in company header
+            '.org-top-card a[href^="http"]:not([href*="linkedin"])',
+            '.top-card a[href^="http"]:not([href*="linkedin"])'
+        ],
+        # Company info sections, About/Overview first
+        'infoSelectors': [
+            'section[data-section="about"]',
+            'div[data-test-id="about-us"]',
+            '.about-us',
+            '.org-top-card-summary-info-list',
+            '.top-card-layout__entity-info',
+            '.org-top-card'
+        ],
+        'metaSelectors': [
+            'meta[property="og:url"]',
+            'meta[name="twitter:url"]',
+            'link[rel="canonical"]'
+        ]
+    }
+    
+    # About tab link or button, as one selector list (one query instead of one
+    # per alternative; Playwright resolves :has-text() inside lists too)
+    ABOUT_TAB_SELECTOR = ', '.join([
+        'a[href*="/about/"]',
+        'a[data-control-name="page_member_main_nav_about"]',
+        'button[data-control-name="page_member_main_nav_about"]',
+        # Try to find tab by text
+        'a:has-text("About")',
+    ])
+    
+    # Milliseconds until a company page must start responding; rendering is
+    # bounded separately by the ready waits
+    NAVIGATION_TIMEOUT = 10000
+    
+    # Company page is usable once the About tab link or top card is in the DOM
+    COMPANY_READY_SELECTOR = 'a[href*="/about/"], .org-top-card, .top-card-layout'
+    # About content read by extract_company_website
+    ABOUT_READY_SELECTOR = (
+        'section[data-section="about"], div[data-test-id="about-us"], .about-us, '
+        'dl dt, a[data-control-name="company_details_website"]'
+    )
+    
+    # Bounded LRU of navigate_and_extract_website() results by company URL,
+    # shared by all navigators so a batch visits each company once
+    WEBSITE_CACHE_SIZE = 1024
+    _website_cache: "OrderedDict[str, str]" = OrderedDict()
+    _website_cache_lock = threading.Lock()
+    
+    def __init__(self, context: BrowserContext, page_pool=None):
         """
         Initialize company navigator.
         
         Args:
             context: Browser context to use for navigation
+            page_pool: Optional warm page pool (e.g. a ProfileOpener) to take
+                pages from instead of opening a new one per company
         """
         self.context = context
+        self.page_pool = page_pool
+    
+    def _open_page(self) -> Page:
+        """Take a page from the pool, or open one if there is no pool."""
+        return self.page_pool.acquire() if self.page_pool else self.context.new_page()
     
-    def _clean_redirect_url(self, url: str) -> Optional[str]:
-        """Clean redirect URLs to extract the actual destination."""
+    def _close_page(self, page: Page):
+        """Return a page to the pool, or close it if there is no pool."""
+        if self.page_pool:
+            self.page_pool.release(page)
+        else:
+            page.close()
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_redirect_url(url: str) -> Optional[str]:
+        """Clean redirect URLs to extract the actual destination (memoized, it's pure)."""
         if not url:
             return None
         
         website = url.strip()
         
         # Handle LinkedIn redirects
-        if 'linkedin.com/redir' in website or 'linkedin.com/click' in website or 'linkedin.com/outbound' in website:
+        if CompanyNavigator.LINKEDIN_REDIRECT_RE.search(website):
             try:
                 parsed = urlparse(website)
                 params = parse_qs(parsed.query)
                 # Try multiple parameter names LinkedIn might use
-                for param_name in ['url', 'redirectUrl', 'target', 'destination', 'redirect']:
+                for param_name in CompanyNavigator.LINKEDIN_REDIRECT_PARAMS:
                     if param_name in params:
                         website = params[param_name][0]
                         website = unquote(website)
@@ -44,12 +169,12 @@ class CompanyNavigator:
                 return None
         
         # Handle Bing and other redirect services
-        if any(redirect_service in website.lower() for redirect_service in ['bing.com', 'google.com/url', 't.co', 'bit.ly']):
+        if CompanyNavigator.REDIRECT_SERVICE_RE.search(website):
             try:
                 parsed = urlparse(website)
                 params = parse_qs(parsed.query)
                 # Try common redirect parameters
-                for param_name in ['url', 'q', 'u', 'link', 'destination', 'target', 'r']:
+                for param_name in CompanyNavigator.REDIRECT_SERVICE_PARAMS:
                     if param_name in params:
                         website = params[param_name][0]
                         website = unquote(website)
@@ -62,29 +187,93 @@ class CompanyNavigator:
                 return None
         
         # Skip if still a redirect service or LinkedIn
-        if any(skip in website.lower() for skip in ['linkedin.com', 'bing.com', 'google.com/url', 't.co', 'bit.ly']):
+        if CompanyNavigator.REDIRECT_OR_LINKEDIN_RE.search(website):
             return None
         
         return website if website.startswith('http') else None
     
-    def _is_valid_website(self, url: str) -> bool:
+    @staticmethod
+    def _is_valid_website(url: str) -> bool:
         """Check if URL is a valid website (not a redirect service)."""
         if not url or not url.startswith('http'):
             return False
         
         # Must have a valid domain
-        if not any(domain in url for domain in ['.com', '.co', '.io', '.org', '.net', '.ai', '.dev', '.edu', '.gov']):
+        if not CompanyNavigator.VALID_DOMAIN_RE.search(url):
             return False
         
         # Skip social media and redirect services
-        if any(skip in url.lower() for skip in [
-            'linkedin.com', 'facebook.com', 'twitter.com', 'instagram.com',
-            'bing.com', 'google.com/url', 't.co', 'bit.ly', 'tinyurl'
-        ]):
+        if CompanyNavigator.NOT_COMPANY_SITE_RE.search(url):
             return False
         
         return True
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _url_parts(url: str) -> Tuple[str, str]:
+        """Lowercased host and path of a URL (memoized; the same links recur across pages)."""
+        parsed = urlparse(url)
+        return parsed.netloc.lower(), parsed.path
+    
+    @staticmethod
+    def _score_website(website: str, parent_text: str = '') -> int:
+        """
+        Score a candidate website URL found on a company About page.
+        
+        Args:
+            website: Cleaned website URL
+            parent_text: Lowercased text of the link's surrounding container
+            
+        Returns:
+            Score where higher means more likely to be the main company website
+        """
+        score = 0
+        if 'website' in parent_text:
+            score += 20  # High priority if "Website" label is present
+        if any(keyword in parent_text for keyword in CompanyNavigator.URL_TEXT_KEYWORDS):
+            score += 5
+        
+        # Parse URL to check domain structure
+        domain, url_path = CompanyNavigator._url_parts(website)
+        
+        # Prefer main domain (www or no subdomain) over subdomains
+        if domain.startswith('www.'):
+            domain = domain[4:]
+            score += 10  # www is common for main website
+        
+        # Penalize common subdomains that aren't main website
+        if domain.startswith(CompanyNavigator.PENALIZED_SUBDOMAINS):
+            score -= 15
+        
+        # Prefer shorter, simpler URLs (likely main website)
+        if url_path == '/' or len(url_path) <= 1:
+            score += 10  # Root domain is likely main website
+        elif len(url_path.split('/')) <= 2:  # Just domain or domain/one-path
+            score += 5
+        
+        return score
+    
+    @staticmethod
+    def _target_url(company_linkedin_url: str, navigate_to_about: bool) -> str:
+        """Complete company URL, pointing at its About tab if requested."""
+        # Ensure URL is complete
+        if not company_linkedin_url.startswith('http'):
+            company_linkedin_url = f"https://www.linkedin.com{company_linkedin_url}"
+        
+        # Go straight to the About tab (where website is typically shown)
+        # instead of loading the company home page and clicking through
+        if navigate_to_about and not company_linkedin_url.rstrip('/').endswith('/about'):
+            return company_linkedin_url.rstrip('/') + '/about/'
+        return company_linkedin_url
+    
+    @staticmethod
+    def _wait_for(page: Page, selector: str, wait_time: float):
+        """Wait up to wait_time seconds for selector, continuing with whatever rendered."""
+        try:
+            page.wait_for_selector(selector, timeout=int(wait_time * 1000), state="attached")
+        except PWTimeout:
+            pass
+    
     def navigate_to_company_page(self, company_linkedin_url: str, wait_time: int = 3, navigate_to_about: bool = True) -> Page:
         """
         Navigate to company's LinkedIn page.
@@ -100,46 +289,40 @@ class CompanyNavigator:
         if not company_linkedin_url:
             raise ValueError("Company LinkedIn URL is required")
         
-        # Ensure URL is complete
-        if not company_linkedin_url.startswith('http'):
-            company_linkedin_url = f"https://www.linkedin.com{company_linkedin_url}"
+        target_url = self._target_url(company_linkedin_url, navigate_to_about)
         
-        page = self.context.new_page()
-        page.goto(company_linkedin_url, wait_until="domcontentloaded")
-        time.sleep(wait_time)
+        page = self._open_page()
+        try:
+            # "commit" returns once the response starts arriving; the ready
+            # waits below cover rendering, bounded by wait_time
+            page.goto(target_url, wait_until="commit", timeout=self.NAVIGATION_TIMEOUT)
+        except Exception:
+            # Hand the page back so a retry doesn't leak it
+            self._close_page(page)
+            raise
         
-        # Navigate to About tab if requested (where website is typically shown)
-        if navigate_to_about:
-            try:
-                # Try to click the About tab
-                about_selectors = [
-                    'a[href*="/about/"]',
-                    'a[data-control-name="page_member_main_nav_about"]',
-                    'button[data-control-name="page_member_main_nav_about"]',
-                    'a:has-text("About")',
-                    'nav a:has-text("About")',
-                    # Try to find tab by text
-                    'a:has-text("About")',
-                ]
-                
-                for selector in about_selectors:
+        if not navigate_to_about:
+            self._wait_for(page, self.COMPANY_READY_SELECTOR, wait_time)
+            return page
+        
+        try:
+            # Wait for the About content extract_company_website reads
+            self._wait_for(page, self.ABOUT_READY_SELECTOR, wait_time)
+            
+            # Redirected off the About tab: try clicking it instead
+            if '/about/' not in page.url:
+                about_tab = page.query_selector(self.ABOUT_TAB_SELECTOR)
+                if about_tab:
+                    about_tab.click()
+                    # Wait for the About route instead of a fixed pause
                     try:
-                        about_tab = page.query_selector(selector)
-                        if about_tab:
-                            about_tab.click()
-                            time.sleep(2)  # Wait for About page to load
-                            break
-                    except:
-                        continue
-                
-                # Alternative: navigate directly to about URL
-                if '/about/' not in page.url:
-                    about_url = company_linkedin_url.rstrip('/') + '/about/'
-                    page.goto(about_url, wait_until="domcontentloaded")
-                    time.sleep(wait_time)
-            except Exception as e:
-                print(f"Note: Could not navigate to About tab: {e}")
-                # Continue anyway - might already be on About page
+                        page.wait_for_url("**/about/**", timeout=3000)
+                    except PWTimeout:
+                        pass
+                    self._wait_for(page, self.ABOUT_READY_SELECTOR, wait_time)
+        except Exception as e:
+            log.warning("Could not navigate to About tab: %s", e)
+            # Continue anyway - might already be on About page
         
         return page
     
@@ -154,321 +337,234 @@ class CompanyNavigator:
             Company website URL or None if not found
         """
         try:
-            # First, try to find website in the Overview section under About tab
-            # Look for "Website" label followed by the URL
-            overview_selectors = [
-                'section[data-section="about"]',
-                'div[data-test-id="about-us"]',
-                '.about-us',
-                'div[class*="about"]',
-                'section[class*="about"]'
-            ]
+            # Every candidate link comes from this one page.evaluate() call
+            data = company_page.evaluate(EXTRACT_WEBSITE_JS, self.EXTRACT_WEBSITE_ARG)
+            return self._website_from_page_data(data)
             
-            overview_section = None
-            for selector in overview_selectors:
-                overview_section = company_page.query_selector(selector)
-                if overview_section:
-                    break
+        except Exception as e:
+            log.exception("extract_company_website failed: %s", e)
+            return None
+    
+    @classmethod
+    def _website_from_page_data(cls, data: dict) -> Optional[str]:
+        """
+        Pick the company website from the candidates EXTRACT_WEBSITE_JS collected.
+        
+        Args:
+            data: Result of EXTRACT_WEBSITE_JS on a company About page
             
-            if overview_section:
-                # First, try to find the link specifically labeled as "Website"
-                # Look for "Website" text and find the associated link
-                try:
-                    # Try to find dt/dd structure (common in LinkedIn)
-                    website_labels = overview_section.query_selector_all('dt, div, span')
-                    for label in website_labels:
-                        label_text = label.inner_text().lower()
-                        if 'website' in label_text:
-                            # Find the link near this label
-                            # Try parent element
-                            try:
-                                parent_text = label.evaluate('el => el.parentElement ? el.parentElement.textContent : ""')
-                                # Look for link in the same container
-                                container = label.evaluate('el => el.closest("dl, div, li")')
-                                if container:
-                                    # Find link in the same container
-                                    link = overview_section.query_selector('dd a[href^="http"], a[href^="http"]')
-                                    if link:
-                                        href = link.get_attribute('href')
-                                        if href:
-                                            website = self._clean_redirect_url(href)
-                                            if website and self._is_valid_website(website):
-                                                return website
-                            except:
-                                pass
-                            
-                            # Try to find link in sibling or nearby elements
-                            try:
-                                # Look for link that appears after "Website" text
-                                all_links = overview_section.query_selector_all('a[href^="http"]')
-                                for link in all_links:
-                                    # Check if link is near the website label
-                                    link_text = link.evaluate('el => el.closest("dl, div, li") ? el.closest("dl, div, li").textContent : ""')
-                                    if 'website' in link_text.lower():
-                                        href = link.get_attribute('href')
-                                        if href:
-                                            website = self._clean_redirect_url(href)
-                                            if website and self._is_valid_website(website):
-                                                return website
-                            except:
-                                pass
-                except:
-                    pass
-                
-                # Look for links in the Overview section
-                # The website is typically shown as a link in the Overview section
-                overview_links = overview_section.query_selector_all('a[href^="http"]')
-                
-                # Collect all potential website URLs
-                potential_websites = []
+        Returns:
+            Company website URL or None if not found
+        """
+        # First, try to find website in the Overview section under About tab
+        if data['hasOverview']:
+            overview_links = data['overviewLinks']
+            
+            # First, try to find the link specifically labeled as "Website"
+            if data['hasWebsiteLabel']:
+                # Links in the same dd/container as a "Website" label
+                for href in data['labeledHrefs']:
+                    website = cls._clean_redirect_url(href)
+                    if website and cls._is_valid_website(website):
+                        return website
                 
+                # Look for link that appears after "Website" text
                 for link in overview_links:
-                    href = link.get_attribute('href')
-                    if not href:
-                        continue
-                    
-                    # Clean redirect URLs
-                    website = self._clean_redirect_url(href)
-                    if not website or not self._is_valid_website(website):
-                        continue
-                    
-                    # Get surrounding context to verify it's the website
-                    try:
-                        # Get parent container text
-                        parent_text = link.evaluate('el => { const parent = el.closest("dl, div, li, dt, dd"); return parent ? parent.textContent : ""; }').lower()
-                        
-                        # Score this URL based on context
-                        score = 0
-                        if 'website' in parent_text:
-                            score += 20  # High priority if "Website" label is present
-                        if any(keyword in parent_text for keyword in ['http', 'www']):
-                            score += 5
-                        
-                        # Parse URL to check domain structure
-                        parsed = urlparse(website)
-                        domain = parsed.netloc.lower()
-                        
-                        # Prefer main domain (www or no subdomain) over subdomains
-                        if domain.startswith('www.'):
-                            domain = domain[4:]
-                            score += 10  # www is common for main website
-                        
-                        # Penalize common subdomains that aren't main website
-                        subdomain_penalties = ['news', 'blog', 'careers', 'jobs', 'support', 'help', 'docs', 'api']
-                        for subdomain in subdomain_penalties:
-                            if domain.startswith(subdomain + '.'):
-                                score -= 15
-                        
-                        # Prefer shorter, simpler URLs (likely main website)
-                        url_path = parsed.path
-                        if url_path == '/' or len(url_path) <= 1:
-                            score += 10  # Root domain is likely main website
-                        elif len(url_path.split('/')) <= 2:  # Just domain or domain/one-path
-                            score += 5
-                        
-                        potential_websites.append((score, website))
-                    except:
-                        # If we can't check context, still consider it
-                        try:
-                            parsed = urlparse(website)
-                            domain = parsed.netloc.lower()
-                            url_path = parsed.path
-                            
-                            score = 0
-                            if domain.startswith('www.'):
-                                score += 5
-                            if url_path == '/' or len(url_path) <= 1:
-                                score += 5
-                            
-                            # Penalize subdomains
-                            subdomain_penalties = ['news', 'blog', 'careers', 'jobs']
-                            for subdomain in subdomain_penalties:
-                                if domain.startswith(subdomain + '.'):
-                                    score -= 10
-                            
-                            potential_websites.append((score, website))
-                        except:
-                            potential_websites.append((1, website))
-                
-                # Return the highest scoring website (prefer main website over blog posts)
-                if potential_websites:
-                    potential_websites.sort(key=lambda x: x[0], reverse=True)
-                    return potential_websites[0][1]
+                    # Check if link is near the website label
+                    if link['href'] and 'website' in link['container'].lower():
+                        website = cls._clean_redirect_url(link['href'])
+                        if website and cls._is_valid_website(website):
+                            return website
             
-            # Try multiple selectors for website link - updated for current LinkedIn structure
-            website_selectors = [
-                # Modern LinkedIn selectors
-                'a[data-control-name="company_details_website"]',
-                'a[data-tracking-control-name="company_details_website"]',
-                'a[href*="website"]',
-                # Company info section selectors (About page)
-                'section[data-section="about"] a[href^="http"]:not([href*="linkedin"])',
-                'div[data-test-id="about-us"] a[href^="http"]:not([href*="linkedin"])',
-                '.org-top-card-summary-info-list__info-item a[href^="http"]',
-                '.org-top-card-summary-info-list a[href^="http"]',
-                '.top-card-layout__entity-info a[href^="http"]:not([href*="linkedin"])',
-                '.company-page__website a',
-                # Alternative selectors
-                '.about-us a[href^="http"]',
-                # Generic external links in company header
-                '.org-top-card a[href^="http"]:not([href*="linkedin"])',
-                '.top-card a[href^="http"]:not([href*="linkedin"])'
-            ]
+            # Look for links in the Overview section
+            # The website is typically shown as a link in the Overview section
+            # Collect all potential website URLs
+            potential_websites = []
+            
+            for link in overview_links:
+                if not link['href']:
+                    continue
+                
+                # Clean redirect URLs
+                website = cls._clean_redirect_url(link['href'])
+                if not website or not cls._is_valid_website(website):
+                    continue
+                
+                # Score this URL based on the surrounding context
+                score = cls._score_website(website, link['context'].lower())
+                potential_websites.append((score, website))
             
-            for selector in website_selectors:
-                website_element = company_page.query_selector(selector)
-                if website_element:
-                    href = website_element.get_attribute('href')
-                    if not href or href.startswith('javascript:'):
-                        continue
-                    
+            # Return the highest scoring website (prefer main website over blog posts)
+            if potential_websites:
+                potential_websites.sort(key=lambda x: x[0], reverse=True)
+                return potential_websites[0][1]
+        
+        # Try multiple selectors for website link (first match of each, in order)
+        for href in data['selectorHrefs']:
+            website = cls._clean_redirect_url(href)
+            if website:
+                return website
+        
+        # Fallback: look for any external link in the company info section
+        # Prioritize About/Overview section
+        for hrefs in data['infoSectionHrefs']:
+            for href in hrefs or ():
+                website = cls._clean_redirect_url(href)
+                if website:
+                    return website
+        
+        # Try meta tags
+        for url in data['metaUrls']:
+            if url and 'linkedin.com' not in url:
+                return url
+        
+        # Last resort: look for any external link on the page (be more careful)
+        for href, parent_text in data['pageLinks']:
+            if href and 'linkedin.com' not in href:
+                # Check if it's in a company-related section
+                if any(keyword in parent_text.lower() for keyword in cls.PAGE_LINK_KEYWORDS):
                     website = href.strip()
-                    
-                    # Handle LinkedIn redirects - extract actual URL
-                    if 'linkedin.com/redir' in website or 'linkedin.com/click' in website or 'linkedin.com/outbound' in website:
-                        try:
-                            parsed = urlparse(website)
-                            params = parse_qs(parsed.query)
-                            # Try multiple parameter names LinkedIn might use
-                            for param_name in ['url', 'redirectUrl', 'target', 'destination', 'redirect']:
-                                if param_name in params:
-                                    website = params[param_name][0]
-                                    from urllib.parse import unquote
-                                    website = unquote(website)
-                                    break
-                        except:
-                            continue
-                    
-                    # Handle Bing and other redirect services
-                    if any(redirect_service in website.lower() for redirect_service in ['bing.com', 'google.com/url', 't.co', 'bit.ly']):
-                        try:
-                            parsed = urlparse(website)
-                            params = parse_qs(parsed.query)
-                            # Try common redirect parameters
-                            for param_name in ['url', 'q', 'u', 'link', 'destination', 'target', 'r']:
-                                if param_name in params:
-                                    website = params[param_name][0]
-                                    from urllib.parse import unquote
-                                    website = unquote(website)
-                                    # Might be double-encoded
-                                    if website.startswith('http'):
-                                        break
-                        except:
-                            continue
-                    
-                    # Skip if still a redirect service or LinkedIn
-                    if any(skip in website.lower() for skip in ['linkedin.com', 'bing.com', 'google.com/url', 't.co', 'bit.ly']):
-                        continue
-                    
-                    # Validate it's a real website URL
-                    if website.startswith('http') and not any(redirect in website.lower() for redirect in ['bing.com', 't.co', 'bit.ly']):
+                    if 'linkedin.com' not in website:
                         return website
+        
+        return None
+    
+    def navigate_and_extract_website(self, company_linkedin_url: str, wait_time: int = 3) -> Optional[str]:
+        """
+        Navigate to company page and extract website in one step.
+        
+        Found websites are remembered per company URL for the rest of the
+        process, so companies shared by several profiles are visited once.
+        
+        Args:
+            company_linkedin_url: LinkedIn URL of the company
+            wait_time: Seconds to wait for page to load
             
-            # Fallback: look for any external link in the company info section
-            # Prioritize About/Overview section
-            info_section_selectors = [
-                'section[data-section="about"]',  # About section first
-                'div[data-test-id="about-us"]',
-                '.about-us',
-                '.org-top-card-summary-info-list',
-                '.top-card-layout__entity-info',
-                '.org-top-card'
-            ]
-            
-            for section_selector in info_section_selectors:
-                info_section = company_page.query_selector(section_selector)
-                if info_section:
-                    links = info_section.query_selector_all('a[href^="http"]')
-                    for link in links:
-                        href = link.get_attribute('href')
-                        if not href:
-                            continue
-                        
-                        website = href.strip()
-                        
-                        # Handle LinkedIn redirects
-                        if 'linkedin.com/redir' in website or 'linkedin.com/click' in website or 'linkedin.com/outbound' in website:
-                            try:
-                                parsed = urlparse(website)
-                                params = parse_qs(parsed.query)
-                                for param_name in ['url', 'redirectUrl', 'target', 'destination']:
-                                    if param_name in params:
-                                        website = params[param_name][0]
-                                        from urllib.parse import unquote
-                                        website = unquote(website)
-                                        break
-                            except:
-                                continue
-                        
-                        # Handle Bing and other redirect services
-                        if any(redirect_service in website.lower() for redirect_service in ['bing.com', 'google.com/url', 't.co']):
-                            try:
-                                parsed = urlparse(website)
-                                params = parse_qs(parsed.query)
-                                for param_name in ['url', 'q', 'u', 'link', 'destination']:
-                                    if param_name in params:
-                                        website = params[param_name][0]
-                                        from urllib.parse import unquote
-                                        website = unquote(website)
-                                        break
-                            except:
-                                continue
-                        
-                        # Skip redirect services and LinkedIn
-                        if any(skip in website.lower() for skip in ['linkedin.com', 'bing.com', 'google.com/url', 't.co']):
-                            continue
-                        
-                        # Validate it's a real website URL
-                        if website.startswith('http'):
-                            return website
-            
-            # Try meta tags
-            meta_selectors = [
-                'meta[property="og:url"]',
-                'meta[name="twitter:url"]',
-                'link[rel="canonical"]'
-            ]
-            
-            for meta_selector in meta_selectors:
-                meta_element = company_page.query_selector(meta_selector)
-                if meta_element:
-                    url = None
-                    if meta_element.tag_name() == 'meta':
-                        url = meta_element.get_attribute('content')
-                    elif meta_element.tag_name() == 'link':
-                        url = meta_element.get_attribute('href')
-                    
-                    if url and 'linkedin.com' not in url:
-                        return url
+        Returns:
+            Company website URL or None if not found
+        """
+        if not company_linkedin_url:
+            return None
+        
+        company_key = self._company_key(company_linkedin_url)
+        website = self._cached_website(company_key)
+        if website:
+            return website
+        
+        # Navigate to About page where website is shown
+        page = self.navigate_to_company_page(company_linkedin_url, wait_time, navigate_to_about=True)
+        try:
+            website = self.extract_company_website(page)
+        finally:
+            self._close_page(page)
+        
+        self._remember_website(company_key, website)
+        return website
+    
+    @staticmethod
+    def _company_key(url: str) -> str:
+        """Company URL path without scheme, host, query, trailing slash or case differences."""
+        path = urlparse(url).path if url.startswith('http') else url
+        return path.split('?', 1)[0].split('#', 1)[0].rstrip('/').lower()
+    
+    @classmethod
+    def _cached_website(cls, company_key: str) -> Optional[str]:
+        """Website previously found for a company, or None."""
+        with cls._website_cache_lock:
+            website = cls._website_cache.get(company_key)
+            if website:
+                cls._website_cache.move_to_end(company_key)
+            return website
+    
+    @classmethod
+    def _remember_website(cls, company_key: str, website: Optional[str]):
+        """Cache a found website; a miss may just be a slow render, so None isn't cached."""
+        if not website:
+            return
+        with cls._website_cache_lock:
+            cls._website_cache[company_key] = website
+            if len(cls._website_cache) > cls.WEBSITE_CACHE_SIZE:
+                cls._website_cache.popitem(last=False)
+
+
+class AsyncCompanyNavigator:
+    """Async counterpart of CompanyNavigator, for async Playwright pages."""
+    
+    __slots__ = ('page',)
+    
+    def __init__(self, page: AsyncPage):
+        """
+        Initialize async company navigator.
+        
+        Args:
+            page: Async Page object to navigate (owned by the caller)
+        """
+        self.page = page
+    
+    async def _wait_for(self, selector: str, wait_time: float):
+        """Wait up to wait_time seconds for selector, continuing with whatever rendered."""
+        try:
+            await self.page.wait_for_selector(selector, timeout=int(wait_time * 1000), state="attached")
+        except AsyncPWTimeout:
+            pass
+    
+    async def navigate_to_company_page(self, company_linkedin_url: str, wait_time: int = 3, navigate_to_about: bool = True):
+        """
+        Navigate the page to the company's LinkedIn page.
+        
+        Args:
+            company_linkedin_url: LinkedIn URL of the company
+            wait_time: Seconds to wait for page to load
+            navigate_to_about: Whether to navigate to the About tab (where website is shown)
+        """
+        if not company_linkedin_url:
+            raise ValueError("Company LinkedIn URL is required")
+        
+        target_url = CompanyNavigator._target_url(company_linkedin_url, navigate_to_about)
+        await self.page.goto(target_url, wait_until="commit", timeout=CompanyNavigator.NAVIGATION_TIMEOUT)
+        
+        if not navigate_to_about:
+            await self._wait_for(CompanyNavigator.COMPANY_READY_SELECTOR, wait_time)
+            return
+        
+        try:
+            # Wait for the About content extract_company_website reads
+            await self._wait_for(CompanyNavigator.ABOUT_READY_SELECTOR, wait_time)
             
-            # Last resort: look for any external link on the page (be more careful)
-            all_links = company_page.query_selector_all('a[href^="http"]')
-            for link in all_links:
-                href = link.get_attribute('href')
-                if href and 'linkedin.com' not in href:
-                    # Check if it's in a company-related section
+            # Redirected off the About tab: try clicking it instead
+            if '/about/' not in self.page.url:
+                about_tab = await self.page.query_selector(CompanyNavigator.ABOUT_TAB_SELECTOR)
+                if about_tab:
+                    await about_tab.click()
                     try:
-                        # Get parent elements to check context
-                        parent_text = link.evaluate('el => el.closest("div, section, li")?.textContent || ""')
-                        if any(keyword in parent_text.lower() for keyword in ['website', 'web', 'company', 'about', 'visit']):
-                            website = href.strip()
-                            if 'linkedin.com' not in website:
-                                return website
-                    except:
+                        await self.page.wait_for_url("**/about/**", timeout=3000)
+                    except AsyncPWTimeout:
                         pass
-            
-            return None
+                    await self._wait_for(CompanyNavigator.ABOUT_READY_SELECTOR, wait_time)
+        except Exception as e:
+            log.warning("Could not navigate to About tab: %s", e)
+    
+    async def extract_company_website(self) -> Optional[str]:
+        """
+        Extract company website URL from the loaded LinkedIn company page.
+        
+        Returns:
+            Company website URL or None if not found
+        """
+        try:
+            data = await self.page.evaluate(EXTRACT_WEBSITE_JS, CompanyNavigator.EXTRACT_WEBSITE_ARG)
+            return CompanyNavigator._website_from_page_data(data)
             
         except Exception as e:
-            print(f"Error extracting company website: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("extract_company_website failed: %s", e)
             return None
     
-    def navigate_and_extract_website(self, company_linkedin_url: str, wait_time: int = 3) -> Optional[str]:
+    async def navigate_and_extract_website(self, company_linkedin_url: str, wait_time: int = 3) -> Optional[str]:
         """
         Navigate to company page and extract website in one step.
         
+        Shares CompanyNavigator's cache of found websites.
+        
         Args:
             company_linkedin_url: LinkedIn URL of the company
             wait_time: Seconds to wait for page to load
@@ -479,11 +575,13 @@ class CompanyNavigator:
         if not company_linkedin_url:
             return None
         
-        # Navigate to About page where website is shown
-        page = self.navigate_to_company_page(company_linkedin_url, wait_time, navigate_to_about=True)
-        try:
-            website = self.extract_company_website(page)
+        company_key = CompanyNavigator._company_key(company_linkedin_url)
+        website = CompanyNavigator._cached_website(company_key)
+        if website:
             return website
-        finally:
-            page.close()
-
+        
+        await self.navigate_to_company_page(company_linkedin_url, wait_time, navigate_to_about=True)
+        website = await self.extract_company_website()
+        
+        CompanyNavigator._remember_website(company_key, website)
+        return website
@@ -1,28 +1,169 @@
 """Step 5: Website Scraper Module
 Scrapes text content from company website."""
 from typing import Optional
-from playwright.sync_api import Page, BrowserContext
-from bs4 import BeautifulSoup
-import time
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from playwright.sync_api import Page, BrowserContext, TimeoutError as PWTimeout
+from playwright.async_api import Page as AsyncPage, TimeoutError as AsyncPWTimeout
+from lxml import etree
 import re
+import asyncio
+import logging
+import threading
+import requests
+
+
+log = logging.getLogger(__name__)
+
+# HTTP session for the static fast path, one per thread (sessions pool
+# connections but aren't guaranteed thread-safe)
+_local = threading.local()
+
+# Browser-like request headers; some sites turn away the default python-requests UA
+HTTP_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+}
+
+
+def _http_session() -> requests.Session:
+    """Return the calling thread's HTTP session, creating it on first use."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HTTP_HEADERS)
+        _local.session = session
+    return session
+
+
+# Runs of whitespace collapsed by html_to_text, and how much HTML it feeds
+# the parser between checks for enough text
+WHITESPACE_RE = re.compile(r'\s+')
+HTML_CHUNK_SIZE = 64 * 1024
+
+
+class _TextCollector:
+    """
+    lxml parser target that keeps the visible text of a page as it streams in.
+    
+    Text inside script/style/nav/header/footer is skipped (text after them is
+    kept), and whitespace is collapsed as it arrives so `length` is always the
+    collapsed length, letting html_to_text stop feeding once it has enough.
+    """
+    
+    SKIP_TAGS = frozenset({'script', 'style', 'nav', 'header', 'footer'})
+    
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+        self.skip_depth = 0
+        self.after_space = True
+    
+    def start(self, tag, attrib):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+    
+    def end(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+    
+    def data(self, data):
+        if self.skip_depth:
+            return
+        text = WHITESPACE_RE.sub(' ', data)
+        # A whitespace run split across data() calls collapses to one space
+        if self.after_space and text.startswith(' '):
+            text = text[1:]
+        if text:
+            self.parts.append(text)
+            self.length += len(text)
+            self.after_space = text.endswith(' ')
+    
+    def close(self):
+        return ''.join(self.parts).strip()
+
+
+# True once the page body shows a paragraph's worth of text
+PAGE_HAS_TEXT_JS = "() => !!document.body && document.body.innerText.length > 200"
 
 
 class WebsiteScraper:
     """Scrapes text content from websites."""
     
-    def __init__(self, context: BrowserContext):
+    # One scraper per worker thread; no per-instance __dict__
+    __slots__ = ('context', 'page_pool')
+    
+    # Static fast path: seconds per request, and the HTML/text sizes below which
+    # a page is assumed to be an SPA shell that needs a real browser
+    HTTP_TIMEOUT = 10
+    MIN_STATIC_HTML = 2000
+    MIN_STATIC_TEXT = 500
+    
+    # Resource types a scraped site never needs: only its HTML text is read
+    BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+    
+    # Common About page paths, in the order scrape_about_page prefers them
+    ABOUT_PATHS = ('/about', '/about-us', '/company', '/our-story', '/who-we-are')
+    
+    # Bounded LRU of scrape_website_text() results by (URL, max_length), shared
+    # by all scrapers so a website used by several profiles is fetched once
+    TEXT_CACHE_SIZE = 256
+    _text_cache: "OrderedDict[tuple, str]" = OrderedDict()
+    _text_cache_lock = threading.Lock()
+    
+    # Query parameters that only track where a click came from; LinkedIn adds
+    # them to outbound website links, so they'd split one site across cache keys
+    TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'msclkid', 'ref', 'trk', 'trackingid'})
+    
+    def __init__(self, context: BrowserContext, page_pool=None):
         """
         Initialize website scraper.
         
         Args:
             context: Browser context to use for scraping
+            page_pool: Optional warm page pool (e.g. a ProfileOpener) to take
+                pages from instead of opening a new one per website
         """
         self.context = context
+        self.page_pool = page_pool
+    
+    def _open_page(self) -> Page:
+        """Take a page from the pool, or open one if there is no pool, that skips BLOCKED_RESOURCE_TYPES."""
+        page = self.page_pool.acquire() if self.page_pool else self.context.new_page()
+        # Routed per page, not on the context, so LinkedIn pages sharing the
+        # context load normally; removed again before a pooled page is reused
+        page.route("**/*", self._skip_heavy_resources)
+        return page
+    
+    def _close_page(self, page: Page):
+        """Return a page to the pool, or close it if there is no pool."""
+        if self.page_pool:
+            try:
+                page.unroute("**/*", self._skip_heavy_resources)
+            except Exception:
+                # Page is gone; release() closes it
+                pass
+            self.page_pool.release(page)
+        else:
+            page.close()
+    
+    def _skip_heavy_resources(self, route):
+        """Abort images, media, fonts and stylesheets; let everything else through."""
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
     
     def scrape_website_text(self, website_url: str, wait_time: int = 3, max_length: int = 5000) -> Optional[str]:
         """
         Scrape text content from a website.
         
+        Scraped text is remembered per URL for the rest of the process.
+        
         Args:
             website_url: URL of the website to scrape
             wait_time: Seconds to wait for page to load
@@ -34,41 +175,156 @@ class WebsiteScraper:
         if not website_url:
             return None
         
+        cache_key = (self._url_key(website_url), max_length)
+        text = self._cached_text(cache_key)
+        if text:
+            return text
+        
+        text = self._scrape_website_text_uncached(website_url, wait_time, max_length)
+        
+        self._remember_text(cache_key, text)
+        return text
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _url_key(website_url: str) -> str:
+        """
+        Text cache key for a website URL.
+        
+        Ignores scheme, a leading www., case, a trailing slash, the fragment and
+        utm_*/click-tracking parameters, so the same site reached through
+        differently decorated links is scraped once.
+        """
+        parts = urlsplit(website_url if '://' in website_url else f'http://{website_url}')
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        query = urlencode([
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith('utm_') and name.lower() not in WebsiteScraper.TRACKING_PARAMS
+        ])
+        key = f"{host}{parts.path.rstrip('/')}".lower()
+        return f"{key}?{query}" if query else key
+    
+    @classmethod
+    def _cached_text(cls, cache_key: tuple) -> Optional[str]:
+        """Text previously scraped for (URL, max_length), or None."""
+        with cls._text_cache_lock:
+            text = cls._text_cache.get(cache_key)
+            if text:
+                cls._text_cache.move_to_end(cache_key)
+            return text
+    
+    @classmethod
+    def _remember_text(cls, cache_key: tuple, text: Optional[str]):
+        """Cache scraped text; failures aren't cached, the site may just have been slow."""
+        if not text:
+            return
+        with cls._text_cache_lock:
+            cls._text_cache[cache_key] = text
+            if len(cls._text_cache) > cls.TEXT_CACHE_SIZE:
+                cls._text_cache.popitem(last=False)
+    
+    def _scrape_website_text_uncached(self, website_url: str, wait_time: int, max_length: int) -> Optional[str]:
+        """scrape_website_text() without the cache: static fetch, then the browser."""
+        # Most company sites are server-rendered: a plain GET is enough
+        text = self._fetch_static_text(website_url, max_length)
+        if text:
+            return text
+        
+        page = self._open_page()
         try:
-            page = self.context.new_page()
-            
             # Navigate to website
             page.goto(website_url, wait_until="domcontentloaded", timeout=30000)
-            time.sleep(wait_time)
+            self._wait_for_text(page, wait_time)
             
             # Get page content
             html = page.content()
-            page.close()
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html, 'lxml')
             
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            # Extract text
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit length
-            if len(text) > max_length:
-                text = text[:max_length] + "..."
-            
-            return text if text else None
+            return self.html_to_text(html, max_length)
             
         except Exception as e:
-            print(f"Error scraping website {website_url}: {e}")
+            log.warning("scrape_website_text failed for %s: %s", website_url, e)
+            return None
+        finally:
+            self._close_page(page)
+    
+    @classmethod
+    def _fetch_static_text(cls, website_url: str, max_length: int = 5000) -> Optional[str]:
+        """
+        Fetch a website over plain HTTP and extract its text, without a browser.
+        
+        Args:
+            website_url: URL of the website to fetch
+            max_length: Maximum length of extracted text
+            
+        Returns:
+            Extracted text, or None if the fetch failed or the page looks
+            client-rendered (too little HTML or text), in which case the
+            caller should render it with Playwright
+        """
+        try:
+            response = _http_session().get(website_url, timeout=cls.HTTP_TIMEOUT)
+        except requests.RequestException:
             return None
+        
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+            return None
+        html = response.text
+        if len(html) < cls.MIN_STATIC_HTML:
+            return None
+        
+        text = cls.html_to_text(html, max_length)
+        return text if text and len(text) >= cls.MIN_STATIC_TEXT else None
+    
+    @staticmethod
+    def _wait_for_text(page: Page, wait_time: float):
+        """
+        Wait up to wait_time seconds for the page to render some text.
+        
+        Static sites return at once; client-rendered ones get until their
+        body holds a paragraph's worth of text.
+        """
+        try:
+            page.wait_for_function(PAGE_HAS_TEXT_JS, timeout=int(wait_time * 1000))
+        except PWTimeout:
+            # Continue with whatever has rendered
+            pass
+    
+    @staticmethod
+    def html_to_text(html: str, max_length: int = 5000) -> Optional[str]:
+        """
+        Convert page HTML to cleaned visible text.
+        
+        Args:
+            html: Raw HTML of the page
+            max_length: Maximum length of extracted text
+            
+        Returns:
+            Extracted text content or None if empty
+        """
+        # Stream the HTML through lxml in chunks and stop once there is more
+        # text than max_length; the rest of the page would be cut anyway
+        collector = _TextCollector()
+        parser = etree.HTMLParser(target=collector, encoding='utf-8')
+        data = html.encode('utf-8', 'replace')
+        try:
+            for offset in range(0, len(data), HTML_CHUNK_SIZE):
+                parser.feed(data[offset:offset + HTML_CHUNK_SIZE])
+                if collector.length > max_length + 1:
+                    break
+            else:
+                parser.close()
+        except etree.LxmlError:
+            # Unparseable tail; keep the text collected so far
+            pass
+        text = collector.close()
+        
+        # Limit length
+        if len(text) > max_length:
+            text = text[:max_length] + "..."
+        
+        return text if text else None
     
     def scrape_about_page(self, website_url: str, wait_time: int = 3) -> Optional[str]:
         """
@@ -84,20 +340,116 @@ class WebsiteScraper:
         if not website_url:
             return None
         
-        # Common About page paths
-        about_paths = ['/about', '/about-us', '/company', '/our-story', '/who-we-are']
-        
         base_url = website_url.rstrip('/')
         
-        for path in about_paths:
-            try:
-                about_url = f"{base_url}{path}"
-                text = self.scrape_website_text(about_url, wait_time=wait_time)
+        # Start every candidate navigation first; "commit" returns as soon as the
+        # response starts, so Chrome loads all About pages concurrently (sync
+        # Playwright can't be driven from threads; see ProfileOpener.open_profiles_parallel)
+        pages = []
+        try:
+            for path in self.ABOUT_PATHS:
+                page = self._open_page()
+                pages.append(page)
+                try:
+                    page.goto(f"{base_url}{path}", wait_until="commit", timeout=30000)
+                except Exception:
+                    # Unreachable path; skipped below
+                    pass
+            
+            # Take the first path, in priority order, with substantial content;
+            # later pages have usually rendered by the time they are checked
+            for page in pages:
+                try:
+                    page.wait_for_load_state("domcontentloaded", timeout=30000)
+                    self._wait_for_text(page, wait_time)
+                    text = self.html_to_text(page.content())
+                except Exception:
+                    continue
                 if text and len(text) > 100:  # Only return if substantial content
                     return text
-            except:
-                continue
+        finally:
+            for page in pages:
+                try:
+                    self._close_page(page)
+                except Exception:
+                    pass
         
         # If no About page found, return homepage content
         return self.scrape_website_text(website_url, wait_time=wait_time)
 
+
+class AsyncWebsiteScraper:
+    """Async counterpart of WebsiteScraper, for async Playwright pages."""
+    
+    __slots__ = ('page',)
+    
+    def __init__(self, page: AsyncPage):
+        """
+        Initialize async website scraper.
+        
+        Args:
+            page: Async Page object to scrape with (owned by the caller)
+        """
+        self.page = page
+    
+    @staticmethod
+    async def _skip_heavy_resources(route):
+        """Abort images, media, fonts and stylesheets; let everything else through."""
+        if route.request.resource_type in WebsiteScraper.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def scrape_website_text(self, website_url: str, wait_time: int = 3, max_length: int = 5000) -> Optional[str]:
+        """
+        Scrape text content from a website.
+        
+        Shares WebsiteScraper's cache of scraped text.
+        
+        Args:
+            website_url: URL of the website to scrape
+            wait_time: Seconds to wait for page to load
+            max_length: Maximum length of extracted text
+            
+        Returns:
+            Extracted text content or None if failed
+        """
+        if not website_url:
+            return None
+        
+        cache_key = (WebsiteScraper._url_key(website_url), max_length)
+        text = WebsiteScraper._cached_text(cache_key)
+        if text:
+            return text
+        
+        # Most company sites are server-rendered: a plain GET (off the event
+        # loop, requests is blocking) is enough
+        text = await asyncio.to_thread(WebsiteScraper._fetch_static_text, website_url, max_length)
+        if not text:
+            text = await self._render_text(website_url, wait_time, max_length)
+        
+        WebsiteScraper._remember_text(cache_key, text)
+        return text
+    
+    async def _render_text(self, website_url: str, wait_time: int, max_length: int) -> Optional[str]:
+        """Load the website in the browser and extract its text."""
+        await self.page.route("**/*", self._skip_heavy_resources)
+        try:
+            await self.page.goto(website_url, wait_until="domcontentloaded", timeout=30000)
+            try:
+                await self.page.wait_for_function(PAGE_HAS_TEXT_JS, timeout=int(wait_time * 1000))
+            except AsyncPWTimeout:
+                # Continue with whatever has rendered
+                pass
+            
+            html = await self.page.content()
+            return WebsiteScraper.html_to_text(html, max_length)
+            
+        except Exception as e:
+            log.warning("scrape_website_text failed for %s: %s", website_url, e)
+            return None
+        finally:
+            try:
+                await self.page.unroute("**/*", self._skip_heavy_resources)
+            except Exception:
+                pass
@@ -3,6 +3,14 @@ Compiles extracted data into structured JSON format."""
 from typing import Dict, Optional
 from .models import EnrichmentResult
 
+# Optional import for orjson (faster indented JSON for bulk exports)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 
 class DataCompiler:
     """Compiles extracted data into structured format."""
@@ -32,7 +40,8 @@ class DataCompiler:
         Returns:
             EnrichmentResult object with all data
         """
-        return EnrichmentResult(
+        # Every field comes from our own extraction code, so skip validation
+        return EnrichmentResult.unchecked(
             name=name or "Unknown",
             website=website,
             company_description=company_description,
@@ -67,5 +76,7 @@ class DataCompiler:
         Returns:
             JSON string representation
         """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(result.model_dump(), option=orjson.OPT_INDENT_2).decode()
         return result.model_dump_json(indent=2)
 
@@ -1,19 +1,25 @@
 """LinkedIn Enricher with database logging."""
-from typing import Optional, Callable
-from enricher import LinkedInEnricher
+import queue
+import asyncio
+import threading
+from typing import Optional, Callable, Dict, List, Tuple
+from playwright.async_api import TimeoutError as AsyncPWTimeout
+from enricher import LinkedInEnricher, AsyncLinkedInEnricher
 from enricher.step1_browser import BrowserConnector
-from enricher.step2_profile_opener import ProfileOpener
 from enricher.step3_user_extractor import UserExtractor
 from enricher.step4_company_navigator import CompanyNavigator
 from enricher.step5_website_scraper import WebsiteScraper
 from enricher.step6_data_compiler import DataCompiler
 from enricher.models import EnrichmentResult
-from database import Database, Profile
+from database import Database
 
 
 class LinkedInEnricherWithDB(LinkedInEnricher):
     """LinkedIn Enricher with database logging for real-time tracking."""
     
+    # Seconds the progress dispatcher thread waits for events before exiting
+    PROGRESS_IDLE_TIMEOUT = 5.0
+    
     def __init__(
         self,
         debug_port: int = 9222,
@@ -21,7 +27,9 @@ class LinkedInEnricherWithDB(LinkedInEnricher):
         wait_time: int = 3,
         db: Optional[Database] = None,
         profile_id: Optional[int] = None,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        progress_compact: bool = False,
+        on_description_ready: Optional[Callable] = None
     ):
         """
         Initialize enricher with database support.
@@ -33,42 +41,82 @@ class LinkedInEnricherWithDB(LinkedInEnricher):
             db: Database instance
             profile_id: Profile ID in database
             progress_callback: Callback function for progress updates
+            progress_compact: Leave the scraped text out of step 5 progress
+                updates (they still carry its length)
+            on_description_ready: Called once per profile with the scraped
+                text, for consumers of compact progress that need it
         """
         super().__init__(debug_port, max_parallel, wait_time)
         self.db = db
         self.profile_id = profile_id
         self.progress_callback = progress_callback
+        self.progress_compact = progress_compact
+        self.on_description_ready = on_description_ready
+        # Step data and progress are only reported for a profile in the database;
+        # checked once here instead of before every step
+        self._db_enabled = bool(db and profile_id)
+        # Progress events are handed to a dispatcher thread so a slow callback
+        # (SSE, websocket) never blocks the browser work
+        self._progress_queue: "queue.Queue[Tuple[str, dict]]" = queue.Queue()
+        self._progress_thread: Optional[threading.Thread] = None
+        self._progress_lock = threading.Lock()
+        # Step data not yet written; flushed to the profile in one transaction
+        self._pending_steps = {}
+    
+    def _record_step(self, step: str, data: dict):
+        """Queue step data for the profile (merged with earlier data for the same step)."""
+        if self._db_enabled:
+            self._pending_steps.setdefault(step, {}).update(data)
+    
+    def _flush_steps(self):
+        """Write all queued step data to the profile in one transaction."""
+        if self._pending_steps and self._db_enabled:
+            self.db.update_profile_steps(self.profile_id, self._pending_steps)
+        self._pending_steps = {}
     
     def enrich_profile(self, linkedin_url: str) -> EnrichmentResult:
-        """Enrich profile with database logging."""
+        """
+        Enrich a profile (see LinkedInEnricher.enrich_profile), marking it
+        failed only once every attempt has failed.
+        """
+        try:
+            return super().enrich_profile(linkedin_url)
+        except Exception as e:
+            if self._db_enabled:
+                self.db.update_profile_status(self.profile_id, 'failed', str(e))
+                self._notify_progress('error', {'error': str(e)})
+                self._wait_for_progress()
+            raise
+    
+    def _enrich_profile_once(self, linkedin_url: str) -> EnrichmentResult:
+        """Enrich profile with database logging (retried by enrich_profile)."""
         # Step 1: Browser connection (already done in _ensure_connected)
         self._ensure_connected()
-        if self.db and self.profile_id:
-            self.db.update_profile_step(self.profile_id, 'step1', {})
-            self._notify_progress('step1', {'status': 'Browser connected'})
+        self._record_step('step1', {})
+        self._notify_progress('step1', {'status': 'Browser connected'})
         
-        # Step 2: Open profile
-        profile_opener = ProfileOpener(self.context, max_parallel=1)
+        # Step 2: Open profile (on a pooled page)
+        profile_opener = self.profile_opener
         profile_page = profile_opener.open_profile(linkedin_url, wait_time=self.wait_time)
         
-        if self.db and self.profile_id:
-            self.db.update_profile_step(self.profile_id, 'step2', {})
-            self._notify_progress('step2', {'status': 'Profile opened', 'url': linkedin_url})
+        self._record_step('step2', {})
+        self._notify_progress('step2', {'status': 'Profile opened', 'url': linkedin_url})
         
         try:
             # Step 3: Extract user information
             user_extractor = UserExtractor(profile_page)
             user_data = user_extractor.extract_all()
+            # Profile data is in hand; stop the page's remaining network activity
+            profile_opener.stop_loading(profile_page)
             
-            if self.db and self.profile_id:
-                self.db.update_profile_step(self.profile_id, 'step3', user_data)
-                self._notify_progress('step3', {
-                    'status': 'User data extracted',
-                    'name': user_data.get('name'),
-                    'company': user_data.get('company_name'),
-                    'valid_experience': user_data.get('valid_experience', True),
-                    'experience_reason': user_data.get('experience_reason')
-                })
+            self._record_step('step3', user_data)
+            self._notify_progress('step3', {
+                'status': 'User data extracted',
+                'name': user_data.get('name'),
+                'company': user_data.get('company_name'),
+                'valid_experience': user_data.get('valid_experience', True),
+                'experience_reason': user_data.get('experience_reason')
+            })
             
             # Check if experience is valid
             valid_experience = user_data.get('valid_experience', True)
@@ -88,51 +136,46 @@ class LinkedInEnricherWithDB(LinkedInEnricher):
             
             # Step 4 & 5: Navigate to company and scrape if company found and experience is valid
             if company_linkedin_url and valid_experience:
-                if self.db and self.profile_id:
-                    self.db.update_profile_step(self.profile_id, 'step4', {'company_linkedin_url': company_linkedin_url})
-                    self._notify_progress('step4', {
-                        'status': 'Navigating to company page',
-                        'company_url': company_linkedin_url
-                    })
+                self._record_step('step4', {'company_linkedin_url': company_linkedin_url})
+                self._notify_progress('step4', {
+                    'status': 'Navigating to company page',
+                    'company_url': company_linkedin_url
+                })
                 
-                company_navigator = CompanyNavigator(self.context)
-                website = company_navigator.navigate_and_extract_website(
-                    company_linkedin_url,
-                    wait_time=self.wait_time
-                )
+                # Reuse the website found for this company in an earlier run
+                website = self.db.get_known_website(company_linkedin_url) if self.db else None
+                if not website:
+                    company_navigator = CompanyNavigator(self.context, page_pool=self.profile_opener)
+                    website = company_navigator.navigate_and_extract_website(
+                        company_linkedin_url,
+                        wait_time=self.wait_time
+                    )
                 
-                if self.db and self.profile_id:
-                    self.db.update_profile_step(self.profile_id, 'step4', {'website': website})
-                    self._notify_progress('step4', {
-                        'status': 'Company website extracted',
-                        'website': website
-                    })
+                self._record_step('step4', {'website': website})
+                self._notify_progress('step4', {
+                    'status': 'Company website extracted',
+                    'website': website
+                })
                 
                 # Step 5: Scrape website if found
                 if website:
-                    if self.db and self.profile_id:
-                        self.db.update_profile_step(self.profile_id, 'step5', {'website': website})
-                        self._notify_progress('step5', {
-                            'status': 'Scraping company website',
-                            'website': website
-                        })
+                    self._record_step('step5', {'website': website})
+                    self._notify_progress('step5', {
+                        'status': 'Scraping company website',
+                        'website': website
+                    })
                     
-                    website_scraper = WebsiteScraper(self.context)
+                    website_scraper = WebsiteScraper(self.context, page_pool=self.profile_opener)
                     company_description = website_scraper.scrape_website_text(
                         website,
                         wait_time=self.wait_time
                     )
                     
-                    if self.db and self.profile_id:
-                        # Store full description (not truncated)
-                        self.db.update_profile_step(self.profile_id, 'step5', {
-                            'company_description': company_description  # Store full text
-                        })
-                        self._notify_progress('step5', {
-                            'status': 'Website scraped',
-                            'description_length': len(company_description) if company_description else 0,
-                            'company_description': company_description  # Send full text for real-time display
-                        })
+                    # Store full description (not truncated)
+                    self._record_step('step5', {
+                        'company_description': company_description  # Store full text
+                    })
+                    self._notify_scraped(company_description)
             
             # Step 6: Compile result
             result = DataCompiler.compile_result(
@@ -146,22 +189,20 @@ class LinkedInEnricherWithDB(LinkedInEnricher):
                 experience_reason=user_data.get('experience_reason')
             )
             
-            if self.db and self.profile_id:
-                self.db.update_profile_step(self.profile_id, 'step6', result.model_dump())
-                self._notify_progress('step6', {
-                    'status': 'Data compiled',
-                    'result': result.model_dump()
-                })
+            # Dumped once: the stored step data and the progress event share it
+            result_data = result.model_dump()
+            self._record_step('step6', result_data)
+            self._notify_progress('step6', {
+                'status': 'Data compiled',
+                'result': result_data
+            })
             
             return result
             
-        except Exception as e:
-            if self.db and self.profile_id:
-                self.db.update_profile_status(self.profile_id, 'failed', str(e))
-                self._notify_progress('error', {'error': str(e)})
-            raise
         finally:
-            profile_opener.close_page(profile_page)
+            profile_opener.release(profile_page)
+            self._flush_steps()
+            self._wait_for_progress()
     
     def enrich_profile_skip_to_step5(self, linkedin_url: str, firstname: Optional[str] = None, lastname: Optional[str] = None, website: str = None) -> EnrichmentResult:
         """
@@ -191,101 +232,333 @@ class LinkedInEnricherWithDB(LinkedInEnricher):
         
         # Step 1: Browser connection (still needed for step 5)
         self._ensure_connected()
-        if self.db and self.profile_id:
-            self.db.update_profile_step(self.profile_id, 'step1', {})
-            self._notify_progress('step1', {'status': 'Browser connected (skipping steps 2-4)'})
+        self._record_step('step1', {})
+        self._notify_progress('step1', {'status': 'Browser connected (skipping steps 2-4)'})
         
         # Mark steps 2-4 as skipped
-        if self.db and self.profile_id:
-            self.db.update_profile_step(self.profile_id, 'step2', {'status': 'skipped', 'reason': 'Website provided in CSV'})
-            self.db.update_profile_step(self.profile_id, 'step3', {
-                'status': 'skipped',
-                'reason': 'Website provided in CSV',
-                'name': name,
-                'csv_firstname': firstname,
-                'csv_lastname': lastname
-            })
-            self.db.update_profile_step(self.profile_id, 'step4', {
-                'status': 'skipped',
-                'reason': 'Website provided in CSV',
-                'website': website
-            })
-            self._notify_progress('step2', {'status': 'Skipped - using CSV data'})
-            self._notify_progress('step3', {'status': 'Skipped - using CSV data', 'name': name})
-            self._notify_progress('step4', {'status': 'Skipped - using CSV data', 'website': website})
+        self._record_step('step2', {'status': 'skipped', 'reason': 'Website provided in CSV'})
+        self._record_step('step3', {
+            'status': 'skipped',
+            'reason': 'Website provided in CSV',
+            'name': name,
+            'csv_firstname': firstname,
+            'csv_lastname': lastname
+        })
+        self._record_step('step4', {
+            'status': 'skipped',
+            'reason': 'Website provided in CSV',
+            'website': website
+        })
+        self._notify_progress('step2', {'status': 'Skipped - using CSV data'})
+        self._notify_progress('step3', {'status': 'Skipped - using CSV data', 'name': name})
+        self._notify_progress('step4', {'status': 'Skipped - using CSV data', 'website': website})
         
-        # Set name in database if provided
-        if self.db and self.profile_id and name:
-            session = self.db.get_session()
-            try:
-                profile = session.query(Profile).filter_by(id=self.profile_id).first()
-                if profile:
-                    profile.step3_name = name
-                    session.commit()
-            finally:
-                session.close()
+        # The step3/step4 data above already carries the name and website,
+        # so they are written with the rest of the steps
         
-        # Set website in database
-        if self.db and self.profile_id:
-            session = self.db.get_session()
-            try:
-                profile = session.query(Profile).filter_by(id=self.profile_id).first()
-                if profile:
-                    profile.step4_website_url = website
-                    session.commit()
-            finally:
-                session.close()
-        
-        # Step 5: Scrape website directly
-        company_description = None
-        if website:
-            if self.db and self.profile_id:
-                self.db.update_profile_step(self.profile_id, 'step5', {'website': website})
+        try:
+            # Step 5: Scrape website directly
+            company_description = None
+            if website:
+                self._record_step('step5', {'website': website})
                 self._notify_progress('step5', {
                     'status': 'Scraping company website (from CSV)',
                     'website': website
                 })
-            
-            website_scraper = WebsiteScraper(self.context)
-            company_description = website_scraper.scrape_website_text(
-                website,
-                wait_time=self.wait_time
-            )
-            
-            if self.db and self.profile_id:
+                
+                website_scraper = WebsiteScraper(self.context, page_pool=self.profile_opener)
+                company_description = website_scraper.scrape_website_text(
+                    website,
+                    wait_time=self.wait_time
+                )
+                
                 # Store full description
-                self.db.update_profile_step(self.profile_id, 'step5', {
+                self._record_step('step5', {
                     'company_description': company_description
                 })
-                self._notify_progress('step5', {
-                    'status': 'Website scraped',
-                    'description_length': len(company_description) if company_description else 0,
-                    'company_description': company_description
-                })
-        
-        # Step 6: Compile result
-        result = DataCompiler.compile_result(
-            linkedin_url=linkedin_url,
-            name=name,
-            company_name=None,  # Not extracted when skipping steps
-            company_linkedin_url=None,
-            website=website,
-            company_description=company_description,
-            valid_experience=True,  # Assume valid when website is provided
-            experience_reason=None
-        )
-        
-        if self.db and self.profile_id:
-            self.db.update_profile_step(self.profile_id, 'step6', result.model_dump())
+                self._notify_scraped(company_description)
+            
+            # Step 6: Compile result
+            result = DataCompiler.compile_result(
+                linkedin_url=linkedin_url,
+                name=name,
+                company_name=None,  # Not extracted when skipping steps
+                company_linkedin_url=None,
+                website=website,
+                company_description=company_description,
+                valid_experience=True,  # Assume valid when website is provided
+                experience_reason=None
+            )
+            
+            # Dumped once: the stored step data and the progress event share it
+            result_data = result.model_dump()
+            self._record_step('step6', result_data)
             self._notify_progress('step6', {
                 'status': 'Data compiled',
-                'result': result.model_dump()
+                'result': result_data
             })
-        
-        return result
+            
+            return result
+        finally:
+            self._flush_steps()
+            self._wait_for_progress()
     
     def _notify_progress(self, step: str, data: dict):
-        """Notify progress callback if available."""
-        if self.progress_callback:
-            self.progress_callback(step, data)
+        """Queue a progress event for the callback, if there is one."""
+        if not self.progress_callback or not self._db_enabled:
+            return
+        with self._progress_lock:
+            self._progress_queue.put((step, data))
+            if self._progress_thread is None:
+                self._progress_thread = threading.Thread(target=self._dispatch_progress, daemon=True)
+                self._progress_thread.start()
+    
+    def _dispatch_progress(self):
+        """Dispatcher thread: deliver queued events in order, exit once idle."""
+        while True:
+            try:
+                step, data = self._progress_queue.get(timeout=self.PROGRESS_IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._progress_lock:
+                    # An event queued while we waited for the lock is still ours
+                    if self._progress_queue.empty():
+                        self._progress_thread = None
+                        return
+                continue
+            try:
+                self.progress_callback(step, data)
+            except Exception as e:
+                print(f"Progress callback failed for {step}: {e}")
+            finally:
+                self._progress_queue.task_done()
+    
+    def _wait_for_progress(self):
+        """Block until every queued progress event has been delivered."""
+        self._progress_queue.join()
+    
+    def _notify_scraped(self, company_description: Optional[str]):
+        """Report the step 5 result; the full text only when progress isn't compact."""
+        progress = {
+            'status': 'Website scraped',
+            'description_length': len(company_description) if company_description else 0
+        }
+        if not self.progress_compact:
+            # Full text for real-time display
+            progress['company_description'] = company_description
+        self._notify_progress('step5', progress)
+        if self.on_description_ready:
+            self.on_description_ready(company_description)
+
 
+class AsyncLinkedInEnricherWithDB(AsyncLinkedInEnricher):
+    """
+    Async LinkedIn Enricher with database logging, for many profiles at once.
+    
+    Unlike LinkedInEnricherWithDB (one instance per profile), one instance
+    enriches a whole list of database profiles, up to max_parallel of them
+    concurrently on one event loop.
+    """
+    
+    # Queued step data is written every FLUSH_INTERVAL seconds, or as soon as
+    # FLUSH_PROFILES profiles have some
+    FLUSH_INTERVAL = 0.5
+    FLUSH_PROFILES = 50
+    
+    def __init__(
+        self,
+        debug_port: int = 9222,
+        max_parallel: int = 10,
+        wait_time: int = 3,
+        db: Optional[Database] = None,
+        progress_callback: Optional[Callable] = None
+    ):
+        """
+        Initialize async enricher with database support.
+        
+        Args:
+            debug_port: Chrome remote debugging port
+            max_parallel: Maximum profiles processed concurrently
+            wait_time: Wait time between page loads (seconds)
+            db: Database instance
+            progress_callback: Callback function for progress updates,
+                called as progress_callback(profile_id, step, data)
+        """
+        super().__init__(debug_port, max_parallel, wait_time)
+        self.db = db
+        self.progress_callback = progress_callback
+        # Step data of all profiles in flight, keyed by profile ID then step;
+        # written in one transaction per flush instead of one per step
+        self._pending_steps: Dict[int, Dict[str, dict]] = {}
+    
+    def _log_step(self, profile_id: Optional[int], step: str, data: dict, progress: dict):
+        """Queue step data for the profile and notify the progress callback."""
+        if self.db and profile_id:
+            self._pending_steps.setdefault(profile_id, {}).setdefault(step, {}).update(data)
+            if len(self._pending_steps) >= self.FLUSH_PROFILES:
+                # Other profiles' data goes out too: a failed write must not
+                # fail this profile's step
+                self._try_flush_steps()
+        if self.progress_callback:
+            self.progress_callback(profile_id, step, progress)
+    
+    def _flush_steps(self, profile_id: Optional[int] = None):
+        """Write queued step data in one transaction: every profile's, or only profile_id's."""
+        if profile_id is None:
+            pending, self._pending_steps = self._pending_steps, {}
+        else:
+            pending = {profile_id: self._pending_steps.pop(profile_id)} if profile_id in self._pending_steps else {}
+        if pending and self.db:
+            try:
+                self.db.update_profiles_steps(pending)
+            except Exception:
+                # Keep the data for the next flush; the write doesn't yield to
+                # the event loop, so nothing was queued in the meantime
+                self._pending_steps.update(pending)
+                raise
+    
+    def _try_flush_steps(self, profile_id: Optional[int] = None):
+        """_flush_steps, logging a failed write instead of raising (the data stays queued)."""
+        try:
+            self._flush_steps(profile_id)
+        except Exception as e:
+            print(f"Error saving step data (retrying on next flush): {e}")
+    
+    async def _flush_periodically(self):
+        """Flush queued step data every FLUSH_INTERVAL seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            self._try_flush_steps()
+    
+    async def _enrich_db_profile(self, linkedin_url: str, profile_id: Optional[int] = None) -> EnrichmentResult:
+        """
+        Enrich a single profile, queueing every step for profile_id (flushed by enrich_db_profiles).
+        
+        Args:
+            linkedin_url: LinkedIn profile URL
+            profile_id: Profile ID in database
+            
+        Returns:
+            EnrichmentResult with extracted data
+        """
+        await self._ensure_connected()
+        self._log_step(profile_id, 'step1', {}, {'status': 'Browser connected'})
+        
+        page = await self._acquire_page()
+        try:
+            # Steps 2 & 3: open the profile and extract user data
+            user_data = await self._extract_user(page, linkedin_url)
+            self._log_step(profile_id, 'step2', {}, {'status': 'Profile opened', 'url': linkedin_url})
+            self._log_step(profile_id, 'step3', user_data, {
+                'status': 'User data extracted',
+                'name': user_data.get('name'),
+                'company': user_data.get('company_name'),
+                'valid_experience': user_data.get('valid_experience', True),
+                'experience_reason': user_data.get('experience_reason')
+            })
+            
+            valid_experience = user_data.get('valid_experience', True)
+            if not valid_experience:
+                print(f"Profile {linkedin_url}: {user_data.get('experience_reason', 'No valid experience found')}")
+            
+            company_linkedin_url = user_data.get('company_linkedin_url')
+            website = None
+            company_description = None
+            
+            # Step 4 & 5: Navigate to company and scrape if company found and experience is valid
+            if company_linkedin_url and valid_experience:
+                # Reuse the website found for this company in an earlier run
+                website = self.db.get_known_website(company_linkedin_url) if self.db else None
+                if not website:
+                    website = await self._extract_website(page, company_linkedin_url)
+                self._log_step(profile_id, 'step4', {'website': website}, {
+                    'status': 'Company website extracted',
+                    'website': website
+                })
+                
+                if website:
+                    company_description = await self._scrape_website(page, website)
+                    self._log_step(profile_id, 'step5', {'company_description': company_description}, {
+                        'status': 'Website scraped',
+                        'description_length': len(company_description) if company_description else 0,
+                        'company_description': company_description
+                    })
+            
+            # Step 6: Compile result
+            result = DataCompiler.compile_result(
+                linkedin_url=linkedin_url,
+                name=user_data.get('name'),
+                company_name=user_data.get('company_name'),
+                company_linkedin_url=company_linkedin_url,
+                website=website,
+                company_description=company_description,
+                valid_experience=valid_experience,
+                experience_reason=user_data.get('experience_reason')
+            )
+            result_data = result.model_dump()
+            self._log_step(profile_id, 'step6', result_data, {'status': 'Data compiled', 'result': result_data})
+            return result
+        finally:
+            await self._release_page(page)
+    
+    async def enrich_db_profiles(
+        self,
+        profiles: List[Tuple[int, str]],
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> List[Optional[EnrichmentResult]]:
+        """
+        Enrich many database profiles concurrently (up to max_parallel at a time).
+        
+        Each profile is marked processing, then completed or failed.
+        Playwright timeouts are retried with exponential backoff.
+        
+        Args:
+            profiles: (profile_id, linkedin_url) pairs
+            should_stop: Optional check run before each profile starts; once
+                it returns True, remaining profiles are marked cancelled
+        
+        Returns:
+            List of EnrichmentResult objects, in input order (None for
+            profiles that failed or were cancelled)
+        """
+        await self._ensure_connected()
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def enrich_one(profile_id: int, linkedin_url: str) -> Optional[EnrichmentResult]:
+            async with semaphore:
+                if should_stop and should_stop():
+                    if self.db:
+                        self.db.update_profile_status(profile_id, 'cancelled', 'Job was cancelled by user')
+                    return None
+                
+                if self.db:
+                    self.db.update_profile_status(profile_id, 'processing')
+                for attempt in range(self.MAX_ATTEMPTS):
+                    try:
+                        result = await self._enrich_db_profile(linkedin_url, profile_id)
+                    except AsyncPWTimeout as e:
+                        if attempt < self.MAX_ATTEMPTS - 1:
+                            delay = 2 ** attempt
+                            print(f"Timeout on {linkedin_url} (attempt {attempt + 1}/{self.MAX_ATTEMPTS}), retrying in {delay}s: {e}")
+                            await asyncio.sleep(delay)
+                            continue
+                        error = e
+                    except Exception as e:
+                        error = e
+                    else:
+                        # Step 6 marks the profile completed along with its
+                        # result: write it now rather than at the next flush.
+                        # If that write fails, the periodic flush retries it
+                        self._try_flush_steps(profile_id)
+                        return result
+                    
+                    print(f"Error processing {linkedin_url}: {error}")
+                    if self.db:
+                        self.db.update_profile_status(profile_id, 'failed', str(error))
+                    return None
+        
+        flusher = asyncio.create_task(self._flush_periodically())
+        try:
+            return await asyncio.gather(*[enrich_one(profile_id, url) for profile_id, url in profiles])
+        finally:
+            flusher.cancel()
+            self._flush_steps()
@@ -1,6 +1,6 @@
 """Example usage of the LinkedIn Enricher"""
 from enricher import LinkedInEnricher
-import json
+from enricher.step6_data_compiler import DataCompiler
 
 
 def example_single_profile():
@@ -16,7 +16,7 @@ def example_single_profile():
     result = enricher.enrich_profile(linkedin_url)
     
     # Print result
-    print(json.dumps(result.model_dump(), indent=2))
+    print(DataCompiler.to_json(result))
     
     # Disconnect
     enricher.disconnect()
@@ -43,7 +43,7 @@ def example_batch_profiles():
     # Print results
     for i, result in enumerate(results, 1):
         print(f"\nProfile {i}:")
-        print(json.dumps(result.model_dump(), indent=2))
+        print(DataCompiler.to_json(result))
     
     # Disconnect
     enricher.disconnect()
@@ -56,7 +56,7 @@ def example_context_manager():
     
     with LinkedInEnricher(debug_port=9222) as enricher:
         result = enricher.enrich_profile("https://www.linkedin.com/in/username/")
-        print(json.dumps(result.model_dump(), indent=2))
+        print(DataCompiler.to_json(result))
     # Automatically disconnects
 
 
@@ -1,8 +1,15 @@
 """Unified LLM Service
 Supports both OpenAI and Google Gemini for generating responses."""
-import os
-from typing import Optional, Dict, Any
-from openai import OpenAI
+import re
+import json
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+import httpx
+from openai import OpenAI, AsyncOpenAI
 
 # Optional import for Gemini (using new google-genai package)
 try:
@@ -12,10 +19,71 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai = None
 
+# Optional import for orjson (faster parsing of JSON responses)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+
+# Header lines of a plain-text reached response: group 1 is set for a
+# LinkedIn header, unset for an email/subject one (which takes precedence)
+REACHED_HEADER_RE = re.compile(r'^(?:(?=.*?(?:email|subject)).*|(.*?linkedin.*))$', re.IGNORECASE | re.MULTILINE)
+
+# One keep-alive connection pool shared by every OpenAI client (httpx ships
+# with the openai package), so repeated calls skip the TCP/TLS handshake
+OPENAI_HTTP_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0),
+    follow_redirects=True
+)
+
+
+@lru_cache(maxsize=256)
+def _placeholder_pattern(keys: Tuple[str, ...]) -> "re.Pattern":
+    """Compiled regex matching any of the {key} placeholders, cached per key set."""
+    return re.compile(r"\{(" + "|".join(map(re.escape, keys)) + r")\}")
+
+
+@lru_cache(maxsize=64)
+def _system_message(system_prompt: str) -> Dict[str, str]:
+    """OpenAI system message, built once per prompt (the SDK only reads it)."""
+    return {"role": "system", "content": system_prompt}
+
 
 class LLMService:
     """Unified service for LLM calls supporting OpenAI and Gemini."""
     
+    # System prompts used when settings don't provide one. Kept as constants so
+    # every request starts with the exact same bytes, which is what provider
+    # side prompt caching matches on
+    DEFAULT_PENDING_SYSTEM_PROMPT = """You are a sales research assistant. Analyze the lead information and answer the provided questions.
+
+IMPORTANT: You must respond with valid JSON only. The JSON should have the following structure:
+{
+  "What they do": "A brief description of what the company does based on the provided information",
+  "Can we pitch Spheron?": {
+    "Verdict": "YES" or "NO",
+    "Reasoning": "Detailed explanation for the verdict"
+  }
+}
+
+Return ONLY the JSON object, no additional text or markdown formatting."""
+    
+    DEFAULT_REACHED_SYSTEM_PROMPT = """You are a professional sales outreach specialist. Generate personalized outreach messages.
+Generate both:
+1. A professional sales email (2-3 paragraphs)
+2. A LinkedIn message (under 300 characters)
+
+Format your response as JSON with keys: "email" and "linkedin_message"."""
+    
+    # Responses kept per prompt content, shared by every instance: re-running
+    # leads (or leads sharing a company) skips the API call entirely
+    RESPONSE_CACHE_SIZE = 2048
+    _response_cache: "OrderedDict[str, str]" = OrderedDict()
+    _response_cache_lock = threading.Lock()
+    
     def __init__(
         self,
         provider: str,
@@ -40,7 +108,7 @@ class LLMService:
         self.max_tokens = max_tokens
         
         if self.provider == 'openai':
-            self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(api_key=api_key, http_client=OPENAI_HTTP_CLIENT)
             self.model = model or 'gpt-4o-mini'
         elif self.provider == 'gemini':
             if not GEMINI_AVAILABLE:
@@ -48,14 +116,9 @@ class LLMService:
                     "Google GenAI package not installed. "
                     "Install it with: pip install google-genai"
                 )
-            # The new API uses Client() which gets API key from GEMINI_API_KEY env var
-            # Temporarily set it in environment
-            original_key = os.environ.get('GEMINI_API_KEY')
-            os.environ['GEMINI_API_KEY'] = api_key
-            self.gemini_client = genai.Client()
-            # Restore original if it existed, otherwise clean up
-            if original_key is not None:
-                os.environ['GEMINI_API_KEY'] = original_key
+            # Key passed directly: no process-wide GEMINI_API_KEY swap, so
+            # services created from several threads can't pick up each other's key
+            self.gemini_client = genai.Client(api_key=api_key)
             self.model = model or 'gemini-2.5-flash'  # Updated to new default model
         else:
             raise ValueError(f"Unsupported provider: {provider}. Use 'openai' or 'gemini'")
@@ -64,7 +127,8 @@ class LLMService:
         self,
         system_prompt: str,
         user_prompt: str,
-        variables: Optional[Dict[str, Any]] = None
+        variables: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Generate a response using the configured LLM.
@@ -73,32 +137,79 @@ class LLMService:
             system_prompt: System prompt/instructions
             user_prompt: User prompt/question
             variables: Optional variables to inject into prompts
+            use_cache: Return a cached response for the same request if there
+                is one; pass False to always call the provider (e.g. to test
+                a key, or to regenerate)
             
         Returns:
             Generated response text
         """
-        # Replace variables in prompts if provided
-        if variables:
-            for key, value in variables.items():
-                system_prompt = system_prompt.replace(f"{{{key}}}", str(value))
-                user_prompt = user_prompt.replace(f"{{{key}}}", str(value))
+        system_prompt, user_prompt = self._fill_prompts(system_prompt, user_prompt, variables)
+        
+        key = self._response_key(system_prompt, user_prompt)
+        if use_cache:
+            response = self._cached_response(key)
+            if response is not None:
+                return response
         
         if self.provider == 'openai':
-            return self._generate_openai(system_prompt, user_prompt)
+            response = self._generate_openai(system_prompt, user_prompt)
         elif self.provider == 'gemini':
-            return self._generate_gemini(system_prompt, user_prompt)
+            response = self._generate_gemini(system_prompt, user_prompt)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
+        
+        self._remember_response(key, response)
+        return response
+    
+    def _response_key(self, system_prompt: str, user_prompt: str) -> str:
+        """Cache key for a response: hash of everything that determines it."""
+        # The API key is part of the request too: another key must not be
+        # answered from this one's responses
+        content = f"{self.provider}|{self.api_key}|{self.model}|{self.temperature}|{self.max_tokens}|{system_prompt}|{user_prompt}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    @classmethod
+    def _cached_response(cls, key: str) -> Optional[str]:
+        """Return a previously generated response, if any."""
+        with cls._response_cache_lock:
+            response = cls._response_cache.get(key)
+            if response is not None:
+                cls._response_cache.move_to_end(key)
+            return response
+    
+    @classmethod
+    def _remember_response(cls, key: str, response: str):
+        """Store a generated response, evicting the least recently used one when full."""
+        with cls._response_cache_lock:
+            cls._response_cache[key] = response
+            cls._response_cache.move_to_end(key)
+            if len(cls._response_cache) > cls.RESPONSE_CACHE_SIZE:
+                cls._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _fill_prompts(system_prompt: str, user_prompt: str, variables: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        """Replace {key} placeholders in both prompts with the variables' values."""
+        if variables:
+            # One pass per prompt instead of one str.replace scan per variable
+            values = {key: str(value) for key, value in variables.items()}
+            pattern = _placeholder_pattern(tuple(values))
+            fill = lambda match: values[match.group(1)]
+            system_prompt = pattern.sub(fill, system_prompt)
+            user_prompt = pattern.sub(fill, user_prompt)
+        return system_prompt, user_prompt
+    
+    @staticmethod
+    def _openai_messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for a request; the system message is shared across requests."""
+        return [_system_message(system_prompt), {"role": "user", "content": user_prompt}]
     
     def _generate_openai(self, system_prompt: str, user_prompt: str) -> str:
         """Generate response using OpenAI."""
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._openai_messages(system_prompt, user_prompt),
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
@@ -127,34 +238,76 @@ class LLMService:
         except Exception as e:
             raise Exception(f"Gemini API error: {str(e)}")
     
-    def generate_for_pending(
-        self,
-        full_name: str,
-        about_section: Optional[str] = None,
-        company_name: Optional[str] = None,
-        system_prompt: str = "",
-        variables: Optional[Dict[str, Any]] = None
-    ) -> str:
+    async def _agenerate_many(self, prompts: List[Tuple[str, str]], concurrency: int) -> List[Any]:
         """
-        Generate response for pending leads section.
+        Generate responses for many (system, user) prompt pairs concurrently.
         
         Args:
-            full_name: Full name of the lead
-            about_section: About/bio section from LinkedIn
-            company_name: Company name (optional)
-            system_prompt: System prompt from settings
-            variables: Additional variables (e.g., questions)
-            
+            prompts: Prompt pairs, variables already filled in
+            concurrency: Maximum requests in flight at once
+        
         Returns:
-            Generated response
+            Response texts in input order; the exception for prompts that failed
         """
+        keys = [self._response_key(*pair) for pair in prompts]
+        results = {key: self._cached_response(key) for key in keys}
+        
+        # Identical prompts in a batch (leads at the same company) are sent once
+        missing = {key: pair for key, pair in zip(keys, prompts) if results[key] is None}
+        if missing:
+            responses = await self._agenerate_uncached(list(missing.values()), concurrency)
+            for key, response in zip(missing, responses):
+                if not isinstance(response, Exception):
+                    self._remember_response(key, response)
+                results[key] = response
+        
+        return [results[key] for key in keys]
+    
+    async def _agenerate_uncached(self, prompts: List[Tuple[str, str]], concurrency: int) -> List[Any]:
+        """Send every prompt pair to the provider, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        if self.provider == 'openai':
+            # Async clients are bound to the running event loop, so one is made per batch
+            async with AsyncOpenAI(api_key=self.api_key) as client:
+                async def generate_one(system_prompt: str, user_prompt: str) -> str:
+                    async with semaphore:
+                        response = await client.chat.completions.create(
+                            model=self.model,
+                            messages=self._openai_messages(system_prompt, user_prompt),
+                            temperature=self.temperature,
+                            max_tokens=self.max_tokens
+                        )
+                        return response.choices[0].message.content.strip()
+                
+                return await asyncio.gather(*[generate_one(*pair) for pair in prompts], return_exceptions=True)
+        
+        async def generate_one(system_prompt: str, user_prompt: str) -> str:
+            async with semaphore:
+                response = await self.gemini_client.aio.models.generate_content(
+                    model=self.model,
+                    contents=f"{system_prompt}\n\n{user_prompt}"
+                )
+                return response.text.strip()
+        
+        return await asyncio.gather(*[generate_one(*pair) for pair in prompts], return_exceptions=True)
+    
+    @staticmethod
+    def _pending_prompts(
+        full_name: str,
+        about_section: Optional[str] = None,
+        company_name: Optional[str] = None,
+        system_prompt: str = "",
+        variables: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str]:
+        """Build the (system, user) prompts for generate_for_pending."""
         # Build user prompt for pending section
         prompt_parts = [f"Lead Name: {full_name}"]
         if company_name:
             prompt_parts.append(f"Company: {company_name}")
         if about_section:
             # Truncate if too long to avoid token limits
-            about_text = about_section[:2000] if len(about_section) > 2000 else about_section
+            about_text = about_section[:2000]
             prompt_parts.append(f"About/Company Description: {about_text}")
         
         # Add questions from variables if provided
@@ -171,44 +324,19 @@ class LLMService:
         
         # Use default system prompt if none provided
         if not system_prompt:
-            system_prompt = """You are a sales research assistant. Analyze the lead information and answer the provided questions.
-
-IMPORTANT: You must respond with valid JSON only. The JSON should have the following structure:
-{
-  "What they do": "A brief description of what the company does based on the provided information",
-  "Can we pitch Spheron?": {
-    "Verdict": "YES" or "NO",
-    "Reasoning": "Detailed explanation for the verdict"
-  }
-}
-
-Return ONLY the JSON object, no additional text or markdown formatting."""
+            system_prompt = LLMService.DEFAULT_PENDING_SYSTEM_PROMPT
         
-        return self.generate(system_prompt, user_prompt, variables)
+        return system_prompt, user_prompt
     
-    def generate_for_reached(
-        self,
+    @staticmethod
+    def _reached_prompts(
         full_name: str,
         about_section: Optional[str] = None,
         company_name: Optional[str] = None,
         company_description: Optional[str] = None,
-        system_prompt: str = "",
-        variables: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, str]:
-        """
-        Generate email and LinkedIn messages for reached leads section.
-        
-        Args:
-            full_name: Full name of the lead
-            about_section: About/bio section from LinkedIn
-            company_name: Company name
-            company_description: Company description
-            system_prompt: System prompt from settings
-            variables: Additional variables
-            
-        Returns:
-            Dictionary with 'email' and 'linkedin_message' keys
-        """
+        system_prompt: str = ""
+    ) -> Tuple[str, str]:
+        """Build the (system, user) prompts for generate_for_reached."""
         # Build context for the prompt
         context_parts = [f"Lead Name: {full_name}"]
         if company_name:
@@ -217,19 +345,14 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             context_parts.append(f"About: {about_section}")
         if company_description:
             # Truncate if too long
-            desc = company_description[:2000] if len(company_description) > 2000 else company_description
+            desc = company_description[:2000]
             context_parts.append(f"Company Description: {desc}")
         
         context = "\n".join(context_parts)
         
         # Use default system prompt if none provided
         if not system_prompt:
-            system_prompt = """You are a professional sales outreach specialist. Generate personalized outreach messages.
-Generate both:
-1. A professional sales email (2-3 paragraphs)
-2. A LinkedIn message (under 300 characters)
-
-Format your response as JSON with keys: "email" and "linkedin_message"."""
+            system_prompt = LLMService.DEFAULT_REACHED_SYSTEM_PROMPT
         
         user_prompt = f"""Generate personalized outreach messages for this lead:
 
@@ -240,47 +363,201 @@ Provide both an email and LinkedIn message that are:
 - Professional and warm
 - Not pushy
 - Include clear value proposition"""
-        
+        return system_prompt, user_prompt
+    
+    @staticmethod
+    def _parse_reached_response(response: str) -> Dict[str, str]:
+        """Split a generate_for_reached response into 'email' and 'linkedin_message'."""
+        # Try to parse as JSON if possible
         try:
-            response = self.generate(system_prompt, user_prompt, variables)
-            
-            # Try to parse as JSON if possible
-            import json
-            try:
-                parsed = json.loads(response)
-                return {
-                    'email': parsed.get('email', response),
-                    'linkedin_message': parsed.get('linkedin_message', response)
-                }
-            except:
-                # If not JSON, split response or return as-is
-                # Try to detect email vs LinkedIn message
-                lines = response.split('\n')
-                email_lines = []
-                linkedin_lines = []
-                in_email = False
-                in_linkedin = False
-                
-                for line in lines:
-                    if 'email' in line.lower() or 'subject' in line.lower():
-                        in_email = True
-                        in_linkedin = False
-                    elif 'linkedin' in line.lower():
-                        in_email = False
-                        in_linkedin = True
-                    elif in_email:
-                        email_lines.append(line)
-                    elif in_linkedin:
-                        linkedin_lines.append(line)
-                
-                return {
-                    'email': '\n'.join(email_lines) if email_lines else response,
-                    'linkedin_message': '\n'.join(linkedin_lines) if linkedin_lines else response[:300]
-                }
-        except Exception as e:
-            # Fallback response
+            parsed = orjson.loads(response) if ORJSON_AVAILABLE else json.loads(response)
             return {
-                'email': f"Hi {full_name},\n\nI came across {company_name or 'your company'} and was impressed. I'd love to discuss how we might be able to help.\n\nBest regards",
-                'linkedin_message': f"Hi {full_name}, I noticed your work at {company_name or 'your company'}. Would love to connect!"
+                'email': parsed.get('email', response),
+                'linkedin_message': parsed.get('linkedin_message', response)
             }
+        except (ValueError, AttributeError):
+            pass
+        
+        # If not JSON, collect the lines under each "email"/"subject" and
+        # "linkedin" header line (the headers themselves are dropped)
+        email_sections = []
+        linkedin_sections = []
+        headers = list(REACHED_HEADER_RE.finditer(response))
+        for i, header in enumerate(headers):
+            body_start = header.end() + 1
+            body_end = headers[i + 1].start() - 1 if i + 1 < len(headers) else len(response)
+            if body_start <= body_end:
+                sections = linkedin_sections if header.group(1) is not None else email_sections
+                sections.append(response[body_start:body_end])
+        
+        return {
+            'email': '\n'.join(email_sections) if email_sections else response,
+            'linkedin_message': '\n'.join(linkedin_sections) if linkedin_sections else response[:300]
+        }
+    
+    @staticmethod
+    def _fallback_reached(full_name: str, company_name: Optional[str]) -> Dict[str, str]:
+        """Generic messages used when generation fails."""
+        return {
+            'email': f"Hi {full_name},\n\nI came across {company_name or 'your company'} and was impressed. I'd love to discuss how we might be able to help.\n\nBest regards",
+            'linkedin_message': f"Hi {full_name}, I noticed your work at {company_name or 'your company'}. Would love to connect!"
+        }
+    
+    def generate_for_pending(
+        self,
+        full_name: str,
+        about_section: Optional[str] = None,
+        company_name: Optional[str] = None,
+        system_prompt: str = "",
+        variables: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        Generate response for pending leads section.
+        
+        Args:
+            full_name: Full name of the lead
+            about_section: About/bio section from LinkedIn
+            company_name: Company name (optional)
+            system_prompt: System prompt from settings
+            variables: Additional variables (e.g., questions)
+            use_cache: See generate
+            
+        Returns:
+            Generated response
+        """
+        system_prompt, user_prompt = self._pending_prompts(full_name, about_section, company_name, system_prompt, variables)
+        return self.generate(system_prompt, user_prompt, variables, use_cache=use_cache)
+    
+    def generate_for_reached(
+        self,
+        full_name: str,
+        about_section: Optional[str] = None,
+        company_name: Optional[str] = None,
+        company_description: Optional[str] = None,
+        system_prompt: str = "",
+        variables: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> Dict[str, str]:
+        """
+        Generate email and LinkedIn messages for reached leads section.
+        
+        Args:
+            full_name: Full name of the lead
+            about_section: About/bio section from LinkedIn
+            company_name: Company name
+            company_description: Company description
+            system_prompt: System prompt from settings
+            variables: Additional variables
+            use_cache: See generate
+            
+        Returns:
+            Dictionary with 'email' and 'linkedin_message' keys
+        """
+        system_prompt, user_prompt = self._reached_prompts(
+            full_name, about_section, company_name, company_description, system_prompt
+        )
+        
+        try:
+            response = self.generate(system_prompt, user_prompt, variables, use_cache=use_cache)
+            return self._parse_reached_response(response)
+        except Exception as e:
+            return self._fallback_reached(full_name, company_name)
 
+    
+    def generate_for_pending_many(
+        self,
+        leads: List[Dict[str, Any]],
+        system_prompt: str = "",
+        variables: Optional[Dict[str, Any]] = None,
+        concurrency: int = 20
+    ) -> List[Optional[str]]:
+        """
+        Generate pending-lead responses for many leads concurrently.
+        
+        Args:
+            leads: Dicts with generate_for_pending's full_name, about_section
+                and company_name
+            system_prompt: System prompt from settings
+            variables: Additional variables (e.g., questions)
+            concurrency: Maximum requests in flight at once
+        
+        Returns:
+            Responses in lead order (None where generation failed)
+        """
+        prompts = [
+            self._fill_prompts(*self._pending_prompts(
+                lead['full_name'], lead.get('about_section'), lead.get('company_name'), system_prompt, variables
+            ), variables)
+            for lead in leads
+        ]
+        responses = asyncio.run(self._agenerate_many(prompts, concurrency))
+        
+        results = []
+        for lead, response in zip(leads, responses):
+            if isinstance(response, Exception):
+                print(f"Error generating response for {lead['full_name']}: {response}")
+                response = None
+            results.append(response)
+        return results
+    
+    def generate_for_reached_many(
+        self,
+        leads: List[Dict[str, Any]],
+        system_prompt: str = "",
+        variables: Optional[Dict[str, Any]] = None,
+        concurrency: int = 20
+    ) -> List[Dict[str, str]]:
+        """
+        Generate reached-lead messages for many leads concurrently.
+        
+        Args:
+            leads: Dicts with generate_for_reached's full_name, about_section,
+                company_name and company_description
+            system_prompt: System prompt from settings
+            variables: Additional variables
+            concurrency: Maximum requests in flight at once
+        
+        Returns:
+            Dictionaries with 'email' and 'linkedin_message' keys, in lead
+            order (generic messages where generation failed)
+        """
+        prompts = [
+            self._fill_prompts(*self._reached_prompts(
+                lead['full_name'], lead.get('about_section'), lead.get('company_name'),
+                lead.get('company_description'), system_prompt
+            ), variables)
+            for lead in leads
+        ]
+        responses = asyncio.run(self._agenerate_many(prompts, concurrency))
+        
+        results = []
+        for lead, response in zip(leads, responses):
+            if isinstance(response, Exception):
+                results.append(self._fallback_reached(lead['full_name'], lead.get('company_name')))
+            else:
+                results.append(self._parse_reached_response(response))
+        return results
+
+
+@lru_cache(maxsize=32)
+def get_llm_service(
+    provider: str,
+    api_key: str,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 1000
+) -> LLMService:
+    """
+    Get the shared LLMService for these settings, creating it on first use.
+    
+    Reusing the service keeps its provider client (and its open connections)
+    across requests instead of building a new one per lead.
+    
+    Args:
+        Same as LLMService
+    
+    Returns:
+        LLMService instance
+    """
+    return LLMService(provider, api_key, model, temperature, max_tokens)
@@ -1,35 +1,123 @@
 """Message Generator Module
 Generates sales emails and LinkedIn messages using OpenAI API."""
 import os
-from typing import Optional, Dict
-from openai import OpenAI
+import re
+import html
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Tuple, Iterator
+import httpx
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APITimeoutError, APIConnectionError
 from dotenv import load_dotenv
 
+from database import Database
+from llm_service import OPENAI_HTTP_CLIENT
+
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str) -> OpenAI:
+    """
+    OpenAI client for an API key, shared by every MessageGenerator.
+    
+    Routes create a generator per request; reusing the client (and the
+    keep-alive pool it shares with LLMService) skips client setup and the
+    TLS handshake each time. The SDK's own retries are off: MessageGenerator
+    retries transient errors itself (see MAX_ATTEMPTS).
+    """
+    return OpenAI(
+        api_key=api_key,
+        http_client=OPENAI_HTTP_CLIENT,
+        max_retries=0,
+        timeout=MessageGenerator.REQUEST_TIMEOUT
+    )
+
 
 class MessageGenerator:
     """Generates personalized sales messages using OpenAI."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Cost-effective model used for all messages
+    MODEL = "gpt-4o-mini"
+    
+    # Transient OpenAI errors are retried with jittered exponential backoff
+    # (capped at MAX_RETRY_DELAY seconds) before falling back to generic messages.
+    # This is the only retry layer (clients are built with max_retries=0), and
+    # REQUEST_TIMEOUT bounds each attempt, so a Flask request waits at most
+    # a couple of minutes rather than the SDK's 600s per attempt
+    MAX_ATTEMPTS = 3
+    MAX_RETRY_DELAY = 30
+    REQUEST_TIMEOUT = 30.0
+    RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+    
+    # Everything that doesn't depend on the lead. It is sent as the system
+    # message, byte-identical on every request, so OpenAI's automatic prompt
+    # caching serves this prefix from cache; only the short user message varies
+    SYSTEM_PROMPT = """You are a professional sales outreach specialist. Always respond with valid JSON only.
+
+You will be given a prospect and context about their company. Generate three types of messages:
+
+1. **Sales Email**: A professional, personalized sales email (2-3 paragraphs) that:
+   - Opens with a personalized connection to their company
+   - Highlights value proposition
+   - Includes a clear call-to-action
+   - Is warm, professional, and not pushy
+
+2. **LinkedIn Connection Request**: A brief, personalized connection request message (under 300 characters) that:
+   - Mentions something specific about their company or role
+   - Is friendly and professional
+   - Invites them to connect
+
+3. **LinkedIn Follow-up Message**: A follow-up message (2-3 sentences) to send after they accept the connection that:
+   - Thanks them for connecting
+   - Provides value or insight
+   - Suggests next steps without being pushy
+
+Format your response as JSON with these exact keys:
+{
+    "email": "the email message here",
+    "linkedin_connection": "the connection request message here",
+    "linkedin_followup": "the follow-up message here"
+}"""
+    
+    # Generic messages used when generation fails (see _fallback_messages)
+    FALLBACK_EMAIL = "Hi {client},\n\nI came across {company} and was impressed by your work. I'd love to discuss how we might be able to help.\n\nBest regards"
+    FALLBACK_LINKEDIN_CONNECTION = "Hi {client}, I noticed your work at {company}. Would love to connect!"
+    FALLBACK_LINKEDIN_FOLLOWUP = "Thanks for connecting, {client}! I'd love to learn more about {company} and see if there's a way we can help."
+    
+    def __init__(self, api_key: Optional[str] = None, db: Optional[Database] = None):
         """
         Initialize message generator.
         
         Args:
             api_key: OpenAI API key (if None, reads from OPENAI_API_KEY env var)
+            db: Database to cache generated messages in (optional); identical
+                requests are then answered from it without calling OpenAI
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key not provided. Set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _openai_client(self.api_key)
+        self.db = db
     
     def generate_messages(
         self,
         client_name: str,
         company_name: Optional[str] = None,
         company_description: Optional[str] = None,
-        website: Optional[str] = None
+        website: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, str]:
         """
         Generate sales email and LinkedIn messages.
@@ -39,10 +127,259 @@ class MessageGenerator:
             company_name: Name of the company
             company_description: Scraped company description
             website: Company website URL
+            use_cache: Return the messages cached for the same prompt if there
+                are any; pass False to regenerate (the new messages replace
+                the cached ones)
             
         Returns:
             Dictionary with 'email', 'linkedin_connection', and 'linkedin_followup' messages
         """
+        prompt = self._build_prompt(client_name, company_name, company_description, website)
+        key = self._cache_key(prompt)
+        cached = self.db.get_cached_messages(key) if self.db and use_cache else None
+        if cached:
+            return cached
+        
+        try:
+            response = self._create(prompt)
+            self._log_usage(response)
+            messages = self._parse_messages(response.choices[0].message.content)
+            
+        except Exception as e:
+            print(f"Error generating messages: {e}")
+            return self._fallback_messages(client_name, company_name)
+        
+        if self.db:
+            self.db.save_cached_messages(key, messages)
+        return messages
+    
+    def generate_messages_stream(
+        self,
+        client_name: str,
+        company_name: Optional[str] = None,
+        company_description: Optional[str] = None,
+        website: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming generate_messages: yields the response text as it arrives.
+        
+        Yields {'delta': text} for each chunk of the model's JSON, then a
+        final {'messages': {...}} with the parsed (or fallback) messages.
+        A cache hit yields only the final event.
+        
+        Args:
+            Same as generate_messages
+        """
+        prompt = self._build_prompt(client_name, company_name, company_description, website)
+        key = self._cache_key(prompt)
+        cached = self.db.get_cached_messages(key) if self.db and use_cache else None
+        if cached:
+            yield {'messages': cached}
+            return
+        
+        parts = []
+        try:
+            # Only opening the stream is retried; a failure mid-stream falls back
+            stream = self._create(prompt, stream=True, stream_options={"include_usage": True})
+            for chunk in stream:
+                if chunk.usage:
+                    self._log_usage(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield {'delta': parts[-1]}
+            messages = self._parse_messages(''.join(parts))
+            
+        except Exception as e:
+            print(f"Error generating messages: {e}")
+            yield {'messages': self._fallback_messages(client_name, company_name)}
+            return
+        
+        if self.db:
+            self.db.save_cached_messages(key, messages)
+        yield {'messages': messages}
+    
+    def generate_messages_batch(self, leads: List[Dict[str, Any]], concurrency: int = 20) -> List[Dict[str, str]]:
+        """
+        Generate messages for many leads concurrently.
+        
+        Args:
+            leads: Dicts with generate_messages' arguments (client_name and
+                optionally company_name, company_description, website)
+            concurrency: Maximum requests in flight at once
+            
+        Returns:
+            generate_messages-style dictionaries, in lead order (fallback
+            messages where generation failed)
+        """
+        prompts = [
+            self._build_prompt(lead['client_name'], lead.get('company_name'), lead.get('company_description'), lead.get('website'))
+            for lead in leads
+        ]
+        keys = [self._cache_key(prompt) for prompt in prompts]
+        results = [self.db.get_cached_messages(key) if self.db else None for key in keys]
+        
+        # Only leads without a cached answer go to OpenAI
+        missing = [i for i, result in enumerate(results) if not result]
+        if missing:
+            generated = asyncio.run(self._agenerate_messages_batch(
+                [(leads[i]['client_name'], prompts[i]) for i in missing], concurrency
+            ))
+            for i, messages in zip(missing, generated):
+                if messages is None:
+                    results[i] = self._fallback_messages(leads[i]['client_name'], leads[i].get('company_name'))
+                else:
+                    if self.db:
+                        self.db.save_cached_messages(keys[i], messages)
+                    results[i] = messages
+        
+        return results
+    
+    def submit_batch(self, leads: List[Dict[str, Any]]) -> str:
+        """
+        Queue message generation for many leads on the OpenAI Batch API.
+        
+        Batch requests are billed at half price and complete within 24 hours,
+        which suits bulk runs nobody is waiting on. Collect the results with
+        poll_and_apply().
+        
+        Args:
+            leads: Dicts with a 'profile_id' plus generate_messages' arguments
+                (client_name and optionally company_name, company_description,
+                website)
+            
+        Returns:
+            OpenAI batch ID
+        """
+        lines = [
+            json.dumps({
+                'custom_id': str(lead['profile_id']),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._request(self._build_prompt(
+                    lead['client_name'], lead.get('company_name'), lead.get('company_description'), lead.get('website')
+                ))
+            })
+            for lead in leads
+        ]
+        batch_file = self.client.files.create(
+            file=('messages_batch.jsonl', '\n'.join(lines).encode('utf-8')),
+            purpose='batch'
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        print(f"Submitted message batch {batch.id} ({len(lines)} leads)")
+        return batch.id
+    
+    def poll_and_apply(self, batch_id: str) -> Optional[int]:
+        """
+        Save the results of a finished submit_batch() batch to the database.
+        
+        Profiles whose request failed keep their current messages.
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            
+        Returns:
+            Number of profiles updated, or None if the batch is still running
+        """
+        if not self.db:
+            raise ValueError("poll_and_apply needs a database to save messages to")
+        
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ('validating', 'in_progress', 'finalizing'):
+            return None
+        if not batch.output_file_id:
+            print(f"Message batch {batch_id} ended with status {batch.status} and no output")
+            return 0
+        
+        messages = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            result = json.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                print(f"Error generating messages for profile {result['custom_id']}: {result.get('error')}")
+                continue
+            try:
+                messages[int(result['custom_id'])] = self._parse_messages(
+                    response['body']['choices'][0]['message']['content']
+                )
+            except Exception as e:
+                print(f"Error parsing messages for profile {result['custom_id']}: {e}")
+        
+        return self.db.update_profiles_messages(messages)
+    
+    async def _agenerate_messages_batch(self, requests: List[Tuple[str, str]], concurrency: int) -> List[Optional[Dict[str, str]]]:
+        """Generate messages for (client_name, prompt) pairs concurrently; None where a request failed."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Async clients are bound to the event loop they run on, so one is made
+        # per batch; its pool is sized so `concurrency` requests share connections
+        http_client = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ))
+        async with AsyncOpenAI(
+            api_key=self.api_key, http_client=http_client, max_retries=0, timeout=self.REQUEST_TIMEOUT
+        ) as client:
+            async def generate_one(client_name: str, prompt: str) -> Optional[Dict[str, str]]:
+                async with semaphore:
+                    try:
+                        response = await self._acreate(client, prompt)
+                        self._log_usage(response)
+                        return self._parse_messages(response.choices[0].message.content)
+                    except Exception as e:
+                        print(f"Error generating messages for {client_name}: {e}")
+                        return None
+            
+            return await asyncio.gather(*[generate_one(*request) for request in requests])
+    
+    def _create(self, prompt: str, **kwargs):
+        """Chat completion for a prompt, retrying transient errors (see MAX_ATTEMPTS)."""
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                return self.client.chat.completions.create(**self._request(prompt), **kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"OpenAI request failed (attempt {attempt + 1}/{self.MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+    
+    async def _acreate(self, client: AsyncOpenAI, prompt: str):
+        """Async _create on the batch's client."""
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                return await client.chat.completions.create(**self._request(prompt))
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"OpenAI request failed (attempt {attempt + 1}/{self.MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+    
+    @classmethod
+    def _retry_delay(cls, attempt: int) -> float:
+        """Exponential backoff plus up to a second of jitter, so a batch hit by a 429 doesn't retry in lockstep."""
+        return min(cls.MAX_RETRY_DELAY, 2 ** attempt) + random.uniform(0, 1)
+    
+    @classmethod
+    def _cache_key(cls, prompt: str) -> str:
+        """Message cache key: hash of everything that determines the response."""
+        return hashlib.sha256(f"{cls.MODEL}|{cls.SYSTEM_PROMPT}|{prompt}".encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _build_prompt(
+        client_name: str,
+        company_name: Optional[str] = None,
+        company_description: Optional[str] = None,
+        website: Optional[str] = None
+    ) -> str:
+        """Build the per-lead user prompt for generate_messages (see SYSTEM_PROMPT)."""
         # Build context for the prompt
         context_parts = []
         if company_name:
@@ -50,71 +387,95 @@ class MessageGenerator:
         if website:
             context_parts.append(f"Website: {website}")
         if company_description:
-            # Truncate description if too long (OpenAI has token limits)
-            desc = company_description[:2000] if len(company_description) > 2000 else company_description
-            context_parts.append(f"Company Description: {desc}")
+            desc = MessageGenerator._compress_description(company_description, company_name)
+            if desc:
+                context_parts.append(f"Company Description: {desc}")
         
         context = "\n".join(context_parts) if context_parts else "No additional company information available."
         
-        prompt = f"""You are a professional sales outreach specialist. Generate personalized outreach messages for {client_name}.
+        return f"""Generate personalized outreach messages for {client_name}.
 
 Context about the prospect:
 {context}
 
-Generate three types of messages:
-
-1. **Sales Email**: A professional, personalized sales email (2-3 paragraphs) that:
-   - Opens with a personalized connection to their company
-   - Highlights value proposition
-   - Includes a clear call-to-action
-   - Is warm, professional, and not pushy
-
-2. **LinkedIn Connection Request**: A brief, personalized connection request message (under 300 characters) that:
-   - Mentions something specific about their company or role
-   - Is friendly and professional
-   - Invites them to connect
-
-3. **LinkedIn Follow-up Message**: A follow-up message (2-3 sentences) to send after they accept the connection that:
-   - Thanks them for connecting
-   - Provides value or insight
-   - Suggests next steps without being pushy
-
-Format your response as JSON with these exact keys:
-{{
-    "email": "the email message here",
-    "linkedin_connection": "the connection request message here",
-    "linkedin_followup": "the follow-up message here"
-}}
-
 Make sure all messages are personalized, professional, and relevant to {client_name} and their company."""
+    
+    @staticmethod
+    def _compress_description(text: str, company_name: Optional[str] = None, max_chars: int = 1200) -> str:
+        """
+        Shrink a scraped company description to its most informative sentences.
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Using cost-effective model
-                messages=[
-                    {"role": "system", "content": "You are a professional sales outreach specialist. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            import json
-            messages = json.loads(response.choices[0].message.content)
-            
-            # Validate and return messages
-            return {
-                'email': messages.get('email', ''),
-                'linkedin_connection': messages.get('linkedin_connection', ''),
-                'linkedin_followup': messages.get('linkedin_followup', '')
-            }
-            
-        except Exception as e:
-            print(f"Error generating messages: {e}")
-            # Return fallback messages
-            return {
-                'email': f"Hi {client_name},\n\nI came across {company_name or 'your company'} and was impressed by your work. I'd love to discuss how we might be able to help.\n\nBest regards",
-                'linkedin_connection': f"Hi {client_name}, I noticed your work at {company_name or 'your company'}. Would love to connect!",
-                'linkedin_followup': f"Thanks for connecting, {client_name}! I'd love to learn more about {company_name or 'your company'} and see if there's a way we can help."
-            }
-
+        Scraped text is padded with menus, cookie banners and repeated
+        whitespace. Sentences are ranked by length and by how often they name
+        the company. The best ones are kept, in their original order, until
+        max_chars is reached.
+        """
+        text = WHITESPACE_RE.sub(" ", html.unescape(text)).strip()
+        if len(text) <= max_chars:
+            return text
+        
+        sentences = list(dict.fromkeys(SENTENCE_END_RE.split(text)))
+        name = (company_name or '').lower()
+        
+        def score(sentence: str) -> float:
+            # Short fragments are mostly navigation; past ~200 chars length stops helping
+            words = len(sentence.split())
+            mentions = sentence.lower().count(name) if name else 0
+            return min(words, 40) + 15 * mentions if words >= 5 else 0
+        
+        keep = set()
+        used = 0
+        for i in sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True):
+            if score(sentences[i]) == 0:
+                break
+            if used + len(sentences[i]) + 1 <= max_chars:
+                keep.add(i)
+                used += len(sentences[i]) + 1
+        
+        if not keep:
+            # One run-on "sentence": fall back to cutting at a word boundary
+            return text[:max_chars].rsplit(' ', 1)[0]
+        return " ".join(sentences[i] for i in sorted(keep))
+    
+    @staticmethod
+    def _request(prompt: str) -> Dict[str, Any]:
+        """Chat completion arguments for a prompt (same for sync and async calls)."""
+        return {
+            'model': MessageGenerator.MODEL,
+            'messages': [
+                {"role": "system", "content": MessageGenerator.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'response_format': {"type": "json_object"}
+        }
+    
+    @staticmethod
+    def _log_usage(response):
+        """Log how much of the prompt OpenAI served from its prompt cache."""
+        usage = getattr(response, 'usage', None)
+        details = getattr(usage, 'prompt_tokens_details', None) if usage else None
+        if details is not None:
+            log.debug("Prompt tokens: %s (cached: %s)", usage.prompt_tokens, details.cached_tokens)
+    
+    @staticmethod
+    def _parse_messages(content: str) -> Dict[str, str]:
+        """Pick the three messages out of a JSON response."""
+        messages = json.loads(content)
+        
+        # Validate and return messages
+        return {
+            'email': messages.get('email', ''),
+            'linkedin_connection': messages.get('linkedin_connection', ''),
+            'linkedin_followup': messages.get('linkedin_followup', '')
+        }
+    
+    @staticmethod
+    def _fallback_messages(client_name: str, company_name: Optional[str]) -> Dict[str, str]:
+        """Generic messages used when generation fails."""
+        company = company_name or 'your company'
+        return {
+            'email': MessageGenerator.FALLBACK_EMAIL.format(client=client_name, company=company),
+            'linkedin_connection': MessageGenerator.FALLBACK_LINKEDIN_CONNECTION.format(client=client_name, company=company),
+            'linkedin_followup': MessageGenerator.FALLBACK_LINKEDIN_FOLLOWUP.format(client=client_name, company=company)
+        }
@@ -1,36 +1,52 @@
 """Reset database script - Drops and recreates the database from scratch."""
 import os
 import sys
+import sqlite3
+
+from database import Database
 
 def reset_database():
     """Drop and recreate the database."""
     db_path = "enricher.db"
+    # Status lines are written in one go at the end rather than line by line
+    log = []
     
-    if os.path.exists(db_path):
-        print("🗑️  Removing existing database...")
-        os.remove(db_path)
-        print("✓ Database removed")
-    else:
-        print("ℹ️  Database doesn't exist, nothing to remove")
-    
-    print("\n🔄 Creating fresh database...")
-    # Import Database to trigger creation
-    from database import Database
-    db = Database()
-    
-    print("✓ Fresh database created successfully!")
-    print("\n✅ Database reset complete!")
-    print("   All tables have been recreated with the latest schema.")
-    print("\n📋 Verified Schema:")
-    print("   ✓ step3_company_name: Stores company name from LinkedIn profile")
-    print("   ✓ step3_name: Stores user's name")
-    print("   ✓ step4_website_url: Stores company website")
-    print("   ✓ step5_company_description: Stores scraped website text")
-    print("   ✓ custom_columns_data: Stores custom message columns (JSON)")
-    print("   ✓ csv_columns_data: Stores all CSV columns (JSON)")
-    print("   ✓ lead_status: raw_lead, qualified, contacted")
-    print("   ✓ contacted_date: Date when lead was marked as contacted")
-    print("   ✓ All message generation fields included")
+    try:
+        if os.path.exists(db_path):
+            log.append("🗑️  Removing existing database...")
+            os.remove(db_path)
+            log.append("✓ Database removed")
+        else:
+            log.append("ℹ️  Database doesn't exist, nothing to remove")
+        # A leftover rollback journal would be replayed into the new file
+        if os.path.exists(db_path + "-journal"):
+            os.remove(db_path + "-journal")
+        
+        log.append("\n🔄 Creating fresh database...")
+        conn = sqlite3.connect(db_path)
+        try:
+            Database.create_schema(conn)
+        finally:
+            conn.close()
+        
+        log.extend([
+            "✓ Fresh database created successfully!",
+            "\n✅ Database reset complete!",
+            "   All tables have been recreated with the latest schema.",
+            "\n📋 Verified Schema:",
+            "   ✓ step3_company_name: Stores company name from LinkedIn profile",
+            "   ✓ step3_name: Stores user's name",
+            "   ✓ step4_website_url: Stores company website",
+            "   ✓ step5_company_description: Stores scraped website text",
+            "   ✓ custom_columns_data: Stores custom message columns (JSON)",
+            "   ✓ csv_columns_data: Stores all CSV columns (JSON)",
+            "   ✓ lead_status: raw_lead, qualified, contacted",
+            "   ✓ contacted_date: Date when lead was marked as contacted",
+            "   ✓ All message generation fields included",
+        ])
+    finally:
+        sys.stdout.write("\n".join(log) + "\n")
+        sys.stdout.flush()
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -1,6 +1,7 @@
-"""Run all tests sequentially"""
+"""Run all tests (independent groups in parallel)"""
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
@@ -12,6 +13,30 @@ from tests.test_step4_company_navigator import test_company_navigator
 from tests.test_step5_website_scraper import test_website_scraper
 from tests.test_step6_data_compiler import test_data_compiler
 from tests.test_full_flow import test_full_flow
+from tests.test_async_enricher import test_async_enricher
+from enricher.step1_browser import shutdown_playwright
+
+
+def run_group(tests):
+    """
+    Run a group of tests one after another on the calling thread.
+    
+    Returns:
+        (test_name, result) tuples, in group order
+    """
+    results = []
+    try:
+        for test_name, test_func in tests:
+            try:
+                result = test_func()
+                results.append((test_name, result))
+            except Exception as e:
+                print(f"\n✗ {test_name} crashed: {e}")
+                results.append((test_name, False))
+    finally:
+        # Each thread drives its own Playwright instance; stop it with the group
+        shutdown_playwright()
+    return results
 
 
 def main():
@@ -28,17 +53,21 @@ def main():
         ("Step 5: Website Scraper", test_website_scraper),
         ("Step 6: Data Compiler", test_data_compiler),
         ("Full Flow", test_full_flow),
+        ("Async Enricher", test_async_enricher),
     ]
     
-    results = []
+    # Tests that open LinkedIn run one after another so the logged-in account
+    # isn't hit by several flows at once; the ones that don't touch LinkedIn
+    # run alongside them, each on its own thread
+    independent = {"Step 5: Website Scraper", "Step 6: Data Compiler"}
+    groups = [[test for test in tests if test[0] not in independent]]
+    groups += [[test] for test in tests if test[0] in independent]
+    
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        group_results = dict(result for group in executor.map(run_group, groups) for result in group)
     
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"\n✗ {test_name} crashed: {e}")
-            results.append((test_name, False))
+    # Report in the usual step order
+    results = [(test_name, group_results[test_name]) for test_name, _ in tests]
     
     # Summary
     print("\n" + "=" * 60)
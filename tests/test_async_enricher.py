@@ -0,0 +1,48 @@
+"""Test Async Enricher: Concurrent enrichment on async Playwright"""
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from enricher import AsyncLinkedInEnricher
+
+
+def test_async_enricher():
+    """Test enriching several profiles concurrently."""
+    print("\n=== Testing Async Enricher ===")
+    
+    # Test LinkedIn URLs (replace with real profiles you have access to)
+    test_urls = [
+        "https://www.linkedin.com/in/reidhoffman/",
+        "https://www.linkedin.com/in/satyanadella/"
+    ]
+    
+    async def run():
+        async with AsyncLinkedInEnricher(debug_port=9222, max_parallel=2, wait_time=5) as enricher:
+            print("✓ Connected to browser")
+            return await enricher.enrich_profiles(test_urls)
+    
+    try:
+        results = asyncio.run(run())
+        print(f"✓ Enriched {len(results)} profiles concurrently")
+        
+        for result in results:
+            print(result.model_dump_json(indent=2))
+        
+        # Results keep input order
+        assert [r.linkedin_url for r in results] == test_urls, "Results should be in input order"
+        print("\n✓ Result validation passed")
+        
+        print("\n✅ Async Enricher Test PASSED\n")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        print("\n❌ Async Enricher Test FAILED\n")
+        return False
+
+
+if __name__ == "__main__":
+    test_async_enricher()
